@@ -4,23 +4,103 @@ Centraliza a criação dos repositórios e serviços.
 Seguindo o princípio D do SOLID (Dependency Inversion).
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
-from app.repositories.memory_repository import MemoryTrainerRepository, MemoryPokemonRepository
-from app.repositories.dynamodb_repository import DynamoDBTrainerRepository, DynamoDBPokemonRepository
-from app.services.trainer_service import TrainerService
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon, IDatabaseJob
+from app.interfaces.async_database_interface import IAsyncDatabaseTrainer, IAsyncDatabasePokemon, IAsyncDatabaseJob
+from app.repositories.cached_repository import CachedTrainerRepository, CachedPokemonRepository
+from app.repositories.instrumented_repository import InstrumentedTrainerRepository, InstrumentedPokemonRepository
+from app.repositories.async_repository import AsyncTrainerRepository, AsyncPokemonRepository, AsyncJobRepository
+from app.services.trainer_service import TrainerService, DELETE_JOB
 from app.services.pokemon_service import PokemonService
-from app.services.battle_service import BattleService
+from app.services.battle_service import BattleService, DecisionMemo
+from app.services.tournament_service import TournamentService
+from app.services.job_service import JobService, LambdaJobDispatcher
+from app.services.type_chart import TypeChart, DEFAULT_TYPE_CHART
+from app import metrics
+
+# Backends são importados só quando selecionados (boto3 sozinho custa ~150 ms no cold start)
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from app.repositories.sqlite_repository import SQLiteDatabase
 
 
 # Configuração: usar DynamoDB ou memória
 USE_DYNAMODB = os.environ.get("USE_DYNAMODB", "false").lower() == "true"
 
+# Arquivo SQLite (quando definido e USE_DYNAMODB=false, substitui a memória)
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "")
+
+# Armazenamento dos pokémon em memória: "dict" (padrão) ou "columnar" (compacto)
+MEMORY_BACKEND = os.environ.get("MEMORY_BACKEND", "dict").lower()
+
+# Persistência local do backend em memória (log + snapshot); vazio desativa
+MEMORY_DATA_DIR = os.environ.get("MEMORY_DATA_DIR", "")
+MEMORY_COMPACT_EVERY = int(os.environ.get("MEMORY_COMPACT_EVERY", "100000"))
+
+# Cache de leitura por ID na frente dos repositórios (0 desativa)
+CACHE_SIZE = int(os.environ.get("CACHE_SIZE", "0"))
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", "30"))
+
+# Processos da simulação de batalhas (0 usa threads; ex.: Lambda sem /dev/shm)
+SIMULATION_WORKERS = int(os.environ.get("SIMULATION_WORKERS", str(os.cpu_count() or 1)))
+
+# Decisões de batalha (battle() e lotes) memoizadas por par de tipos; os pares
+# reais são poucos, então 1024 cobre a liga inteira (0 desativa)
+BATTLE_MEMO_SIZE = int(os.environ.get("BATTLE_MEMO_SIZE", "1024"))
+
+# Tabela de tipos em JSON ({"tipo": ["tipos que ele vence"]}); vazio usa Fogo > Planta > Água
+TYPE_CHART_FILE = os.environ.get("TYPE_CHART_FILE", "")
+
+# Threads para as chamadas bloqueantes ao DynamoDB/SQLite e às escritas do backend
+# em memória persistente, que esperam o fsync (endpoints são async)
+REPOSITORY_WORKERS = int(os.environ.get("REPOSITORY_WORKERS", "50"))
+
+# Pré-aquecimento na importação (fase de init da Lambda/Vercel): cria os
+# repositórios e abre PREWARM_CONNECTIONS conexões com o DynamoDB
+PREWARM = os.environ.get("PREWARM", "false").lower() == "true"
+PREWARM_CONNECTIONS = int(os.environ.get("PREWARM_CONNECTIONS", "4"))
+
+# Função Lambda que executa os jobs (só com DynamoDB, onde o job é visível a ela);
+# vazio roda o job no próprio processo, depois da resposta
+JOBS_FUNCTION = os.environ.get("JOBS_FUNCTION", "")
+
 
 # Instâncias singleton dos repositórios
 _trainer_repo: IDatabaseTrainer = None
 _pokemon_repo: IDatabasePokemon = None
+_async_trainer_repo: IAsyncDatabaseTrainer = None
+_async_pokemon_repo: IAsyncDatabasePokemon = None
+_job_repo: IAsyncDatabaseJob = None
+_executor: ThreadPoolExecutor = None
+_sqlite_db: "SQLiteDatabase" = None
+_job_service: JobService = None
+_type_chart: TypeChart = None
+_process_pool: "ProcessPoolExecutor" = None
+_process_pool_failed = False
+_battle_memo: DecisionMemo = None
+# Caches expostos em /metrics (nome → objeto com stats())
+_caches: dict = {}
+
+
+def _backend_name() -> str:
+    """Rótulo do backend nas métricas de repositório"""
+    if USE_DYNAMODB:
+        return "dynamodb"
+    if SQLITE_PATH:
+        return "sqlite"
+    return "memory_durable" if MEMORY_DATA_DIR else "memory"
+
+
+def _get_sqlite_database() -> "SQLiteDatabase":
+    """Banco SQLite compartilhado pelos dois repositórios (singleton)"""
+    global _sqlite_db
+    if _sqlite_db is None:
+        from app.repositories.sqlite_repository import SQLiteDatabase
+        _sqlite_db = SQLiteDatabase(SQLITE_PATH)
+    return _sqlite_db
 
 
 def get_trainer_repository() -> IDatabaseTrainer:
@@ -28,9 +108,23 @@ def get_trainer_repository() -> IDatabaseTrainer:
     global _trainer_repo
     if _trainer_repo is None:
         if USE_DYNAMODB:
+            from app.repositories.dynamodb_repository import DynamoDBTrainerRepository
             _trainer_repo = DynamoDBTrainerRepository()
+        elif SQLITE_PATH:
+            from app.repositories.sqlite_repository import SQLiteTrainerRepository
+            _trainer_repo = SQLiteTrainerRepository(_get_sqlite_database())
         else:
+            from app.repositories.memory_repository import MemoryTrainerRepository
             _trainer_repo = MemoryTrainerRepository()
+            if MEMORY_DATA_DIR:
+                from app.repositories.durable_repository import DurableTrainerRepository
+                _trainer_repo = DurableTrainerRepository(
+                    _trainer_repo, MEMORY_DATA_DIR, MEMORY_COMPACT_EVERY
+                )
+        if CACHE_SIZE > 0:
+            _trainer_repo = _caches["treinadores"] = CachedTrainerRepository(_trainer_repo, CACHE_SIZE, CACHE_TTL_SECONDS)
+        if metrics.enabled():
+            _trainer_repo = InstrumentedTrainerRepository(_trainer_repo, _backend_name())
     return _trainer_repo
 
 
@@ -39,30 +133,166 @@ def get_pokemon_repository() -> IDatabasePokemon:
     global _pokemon_repo
     if _pokemon_repo is None:
         if USE_DYNAMODB:
+            from app.repositories.dynamodb_repository import DynamoDBPokemonRepository
             _pokemon_repo = DynamoDBPokemonRepository()
+        elif SQLITE_PATH:
+            from app.repositories.sqlite_repository import SQLitePokemonRepository
+            _pokemon_repo = SQLitePokemonRepository(_get_sqlite_database())
         else:
-            _pokemon_repo = MemoryPokemonRepository()
+            if MEMORY_BACKEND == "columnar":
+                from app.repositories.columnar_repository import ColumnarPokemonRepository
+                _pokemon_repo = ColumnarPokemonRepository()
+            else:
+                from app.repositories.memory_repository import MemoryPokemonRepository
+                _pokemon_repo = MemoryPokemonRepository()
+            if MEMORY_DATA_DIR:
+                from app.repositories.durable_repository import DurablePokemonRepository
+                _pokemon_repo = DurablePokemonRepository(
+                    _pokemon_repo, MEMORY_DATA_DIR, MEMORY_COMPACT_EVERY
+                )
+        if CACHE_SIZE > 0:
+            _pokemon_repo = _caches["pokemons"] = CachedPokemonRepository(_pokemon_repo, CACHE_SIZE, CACHE_TTL_SECONDS)
+        if metrics.enabled():
+            _pokemon_repo = InstrumentedPokemonRepository(_pokemon_repo, _backend_name())
     return _pokemon_repo
 
 
-def get_trainer_service() -> TrainerService:
+def _get_executor() -> ThreadPoolExecutor | None:
+    """
+    Executor das chamadas ao DynamoDB/SQLite e ao backend em memória persistente
+    (as escritas esperam o fsync do log; em threads, as concorrentes dividem o mesmo).
+    A memória sem persistência roda direto no event loop.
+    """
+    global _executor
+    if (USE_DYNAMODB or SQLITE_PATH or MEMORY_DATA_DIR) and _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=REPOSITORY_WORKERS, thread_name_prefix="repository")
+    return _executor
+
+
+def get_async_trainer_repository() -> IAsyncDatabaseTrainer:
+    """Retorna repositório assíncrono de treinadores (singleton)"""
+    global _async_trainer_repo
+    if _async_trainer_repo is None:
+        _async_trainer_repo = AsyncTrainerRepository(get_trainer_repository(), _get_executor())
+    return _async_trainer_repo
+
+
+def get_async_pokemon_repository() -> IAsyncDatabasePokemon:
+    """Retorna repositório assíncrono de pokémon (singleton)"""
+    global _async_pokemon_repo
+    if _async_pokemon_repo is None:
+        _async_pokemon_repo = AsyncPokemonRepository(get_pokemon_repository(), _get_executor())
+    return _async_pokemon_repo
+
+
+def _get_process_pool() -> "ProcessPoolExecutor | None":
+    """Pool de processos da simulação (criado na primeira simulação que o usa)"""
+    global _process_pool, _process_pool_failed
+    if SIMULATION_WORKERS > 0 and _process_pool is None and not _process_pool_failed:
+        # Importar ProcessPoolExecutor carrega multiprocessing: só quando a simulação é usada
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            _process_pool = ProcessPoolExecutor(max_workers=SIMULATION_WORKERS)
+        except (OSError, NotImplementedError):
+            # Ambiente sem suporte a multiprocessing: a simulação usa threads (e não tenta de novo)
+            _process_pool_failed = True
+    return _process_pool
+
+
+def get_type_chart() -> TypeChart:
+    """Retorna a tabela de tipos (singleton; guarda o cache de códigos)"""
+    global _type_chart
+    if _type_chart is None:
+        _type_chart = TypeChart.from_file(TYPE_CHART_FILE) if TYPE_CHART_FILE else DEFAULT_TYPE_CHART
+    return _type_chart
+
+
+def get_battle_memo() -> DecisionMemo | None:
+    """Memo de decisões compartilhado entre requisições (singleton)"""
+    global _battle_memo
+    if BATTLE_MEMO_SIZE > 0 and _battle_memo is None:
+        _battle_memo = _caches["batalhas_memo"] = DecisionMemo(get_type_chart(), BATTLE_MEMO_SIZE)
+    return _battle_memo
+
+
+def warm_up() -> None:
+    """Cria antecipadamente o que a primeira requisição criaria (repositórios, conexões, tabela de tipos)"""
+    get_async_trainer_repository()
+    get_async_pokemon_repository()
+    get_battle_memo()
+    if USE_DYNAMODB and PREWARM_CONNECTIONS > 0:
+        from app.repositories import dynamodb_repository
+        dynamodb_repository.warm_up(PREWARM_CONNECTIONS)
+
+
+def get_cache_stats() -> dict[str, dict]:
+    """Contadores dos caches já criados (para /metrics)"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+# Os providers são async para o FastAPI não despachá-los ao threadpool
+
+async def get_trainer_service() -> TrainerService:
     """Retorna serviço de treinadores"""
     return TrainerService(
-        trainer_repo=get_trainer_repository(),
-        pokemon_repo=get_pokemon_repository()
+        trainer_repo=get_async_trainer_repository(),
+        pokemon_repo=get_async_pokemon_repository()
     )
 
 
-def get_pokemon_service() -> PokemonService:
+async def get_pokemon_service() -> PokemonService:
     """Retorna serviço de pokémon"""
     return PokemonService(
-        pokemon_repo=get_pokemon_repository(),
-        trainer_repo=get_trainer_repository()
+        pokemon_repo=get_async_pokemon_repository(),
+        trainer_repo=get_async_trainer_repository()
     )
 
 
-def get_battle_service() -> BattleService:
+async def get_battle_service() -> BattleService:
     """Retorna serviço de batalhas"""
     return BattleService(
-        pokemon_repo=get_pokemon_repository()
+        pokemon_repo=get_async_pokemon_repository(),
+        type_chart=get_type_chart(),
+        memo=get_battle_memo(),
+        simulation_executor_factory=_get_process_pool
     )
+
+
+async def get_tournament_service() -> TournamentService:
+    """Retorna serviço de torneios"""
+    return TournamentService(
+        pokemon_repo=get_async_pokemon_repository(),
+        trainer_repo=get_async_trainer_repository(),
+        type_chart=get_type_chart()
+    )
+
+
+def get_async_job_repository() -> IAsyncDatabaseJob:
+    """Retorna repositório assíncrono de jobs (singleton; no DynamoDB, compartilhado entre instâncias)"""
+    global _job_repo
+    if _job_repo is None:
+        repo: IDatabaseJob
+        if USE_DYNAMODB:
+            from app.repositories.dynamodb_repository import DynamoDBJobRepository
+            repo = DynamoDBJobRepository()
+        else:
+            from app.repositories.memory_repository import MemoryJobRepository
+            repo = MemoryJobRepository()
+        _job_repo = AsyncJobRepository(repo, _get_executor())
+    return _job_repo
+
+
+async def _run_delete_trainer_job(parametros: dict) -> int:
+    """Job de exclusão em cascata de um treinador"""
+    service = await get_trainer_service()
+    return await service.delete_cascade(int(parametros["treinador_id"]))
+
+
+async def get_job_service() -> JobService:
+    """Retorna serviço de jobs (singleton, guarda os tipos de job registrados)"""
+    global _job_service
+    if _job_service is None:
+        dispatcher = LambdaJobDispatcher(JOBS_FUNCTION) if USE_DYNAMODB and JOBS_FUNCTION else None
+        _job_service = JobService(get_async_job_repository(), dispatcher)
+        _job_service.register(DELETE_JOB, _run_delete_trainer_job)
+    return _job_service
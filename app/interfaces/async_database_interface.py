@@ -0,0 +1,138 @@
+"""
+Interface abstrata assíncrona para operações de banco de dados.
+Mesmos contratos de database_interface.py, mas com métodos `async`,
+usados pelos serviços e pelos endpoints `async def`.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class IAsyncDatabaseTrainer(ABC):
+    """Interface assíncrona para operações de Treinador"""
+    
+    @abstractmethod
+    async def create(self, nome: str) -> dict:
+        """Cria um novo treinador"""
+        pass
+    
+    @abstractmethod
+    async def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores de uma vez (mesma ordem da entrada)"""
+        pass
+    
+    @abstractmethod
+    async def get(self, trainer_id: int) -> Optional[dict]:
+        """Busca treinador por ID"""
+        pass
+    
+    @abstractmethod
+    async def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores em uma leitura (IDs ausentes ficam fora do resultado)"""
+        pass
+    
+    @abstractmethod
+    async def list_all(self) -> list[dict]:
+        """Lista todos os treinadores"""
+        pass
+    
+    @abstractmethod
+    async def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores e o cursor da próxima (None no fim)"""
+        pass
+    
+    @abstractmethod
+    async def update(self, trainer_id: int, nome: str) -> Optional[dict]:
+        """Atualiza um treinador"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, trainer_id: int) -> bool:
+        """Deleta um treinador"""
+        pass
+
+
+class IAsyncDatabasePokemon(ABC):
+    """Interface assíncrona para operações de Pokémon"""
+    
+    @abstractmethod
+    async def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon"""
+        pass
+    
+    @abstractmethod
+    async def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon (dicts com nome, tipo, nivel, treinador_id) na mesma ordem"""
+        pass
+    
+    @abstractmethod
+    async def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID"""
+        pass
+    
+    @abstractmethod
+    async def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon em uma leitura (IDs ausentes ficam fora do resultado)"""
+        pass
+    
+    @abstractmethod
+    async def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        pass
+    
+    @abstractmethod
+    async def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon e o cursor da próxima (None no fim)"""
+        pass
+    
+    @abstractmethod
+    async def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador"""
+        pass
+    
+    @abstractmethod
+    async def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pokémon filtrados e ordenados (ver IDatabasePokemon.find)"""
+        pass
+    
+    @abstractmethod
+    async def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido"""
+        pass
+    
+    @abstractmethod
+    async def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        pass
+    
+    @abstractmethod
+    async def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador"""
+        pass
+
+
+class IAsyncDatabaseJob(ABC):
+    """Interface assíncrona para o registro de jobs em segundo plano"""
+    
+    @abstractmethod
+    async def save(self, job: dict) -> None:
+        """Grava o job (cria ou substitui pelo ID)"""
+        pass
+    
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Busca job por ID"""
+        pass
@@ -14,16 +14,31 @@ class IDatabaseTrainer(ABC):
         """Cria um novo treinador"""
         pass
     
+    @abstractmethod
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores de uma vez (mesma ordem da entrada)"""
+        pass
+    
     @abstractmethod
     def get(self, trainer_id: int) -> Optional[dict]:
         """Busca treinador por ID"""
         pass
     
+    @abstractmethod
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores em uma leitura (IDs ausentes ficam fora do resultado)"""
+        pass
+    
     @abstractmethod
     def list_all(self) -> list[dict]:
         """Lista todos os treinadores"""
         pass
     
+    @abstractmethod
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores e o cursor da próxima (None no fim)"""
+        pass
+    
     @abstractmethod
     def update(self, trainer_id: int, nome: str) -> Optional[dict]:
         """Atualiza um treinador"""
@@ -43,21 +58,67 @@ class IDatabasePokemon(ABC):
         """Cria um novo pokémon"""
         pass
     
+    @abstractmethod
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon (dicts com nome, tipo, nivel, treinador_id) na mesma ordem"""
+        pass
+    
     @abstractmethod
     def get(self, pokemon_id: int) -> Optional[dict]:
         """Busca pokémon por ID"""
         pass
     
+    @abstractmethod
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon em uma leitura (IDs ausentes ficam fora do resultado)"""
+        pass
+    
     @abstractmethod
     def list_all(self) -> list[dict]:
         """Lista todos os pokémon"""
         pass
     
+    @abstractmethod
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon e o cursor da próxima (None no fim)"""
+        pass
+    
     @abstractmethod
     def get_by_trainer(self, treinador_id: int) -> list[dict]:
         """Lista pokémon de um treinador"""
         pass
     
+    @abstractmethod
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """
+        Busca pokémon por tipo (valor exato), faixa de nível e/ou treinador.
+        sort: "nivel", "-nivel", "nome" ou "-nome" (padrão: ID); empates por ID.
+        Por nome só com tipo ou treinador_id (ValueError, senão): não há índice
+        de nome, e sem esses filtros a ordenação leria a base inteira.
+        limit: máximo de itens, aplicado depois da ordenação.
+        after: posição (query.position) do último item da página anterior; a
+        busca continua depois dela (paginação keyset).
+        """
+        pass
+    
+    @abstractmethod
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """
+        Resumo de cada treinador pedido (quantidade, nivel_medio, nivel_maximo,
+        tipos), lido de contadores mantidos a cada escrita; treinadores sem
+        pokémon aparecem com quantidade 0
+        """
+        pass
+    
     @abstractmethod
     def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
         """Atualiza um pokémon"""
@@ -72,3 +133,17 @@ class IDatabasePokemon(ABC):
     def delete_by_trainer(self, treinador_id: int) -> int:
         """Deleta todos os pokémon de um treinador"""
         pass
+
+
+class IDatabaseJob(ABC):
+    """Interface para o registro de jobs em segundo plano"""
+    
+    @abstractmethod
+    def save(self, job: dict) -> None:
+        """Grava o job (cria ou substitui pelo ID)"""
+        pass
+    
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[dict]:
+        """Busca job por ID"""
+        pass
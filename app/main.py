@@ -6,21 +6,48 @@ Deploy:
 - Vercel: usa o app FastAPI diretamente via api/index.py
 - AWS Lambda: usa o handler Mangum (comentado abaixo)
 """
-from fastapi import FastAPI, Depends
+import logging
+from typing import Literal, Optional
+from fastapi import FastAPI, Depends, Query, Response, BackgroundTasks
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # ============ IMPORT AWS LAMBDA (comentado para Vercel) ============
 # from mangum import Mangum
 
 from app.models import (
-    TrainerCreate, TrainerUpdate, Trainer,
-    PokemonCreate, PokemonUpdate, Pokemon, PokemonSimple,
-    BattleRequest, BattleResultVictory, BattleResultDraw
+    TrainerCreate, TrainerBatchCreate, TrainerUpdate, Trainer, TrainerSummary,
+    PokemonCreate, PokemonBatchCreate, PokemonUpdate, Pokemon, PokemonSimple,
+    BattleRequest, BattleBatchRequest, BattleResultVictory, BattleResultDraw,
+    BattleSimulationRequest, BattleSimulationResult, CacheStats,
+    TournamentRequest, TournamentResult, Job, MAX_LEVEL
 )
 from app.services.trainer_service import TrainerService
 from app.services.pokemon_service import PokemonService
 from app.services.battle_service import BattleService
-from app.dependencies import get_trainer_service, get_pokemon_service, get_battle_service
+from app.services.tournament_service import TournamentService
+from app.services.job_service import JobService
+from app.dependencies import (
+    get_trainer_service, get_pokemon_service, get_battle_service, get_tournament_service,
+    get_job_service, get_cache_stats, warm_up, PREWARM
+)
+from app import metrics
+
+
+# Paginação: o cursor da próxima página vai no header (o corpo continua sendo uma lista)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+# Listagens sem limit também são paginadas (a tabela nunca é lida inteira numa requisição)
+DEFAULT_PAGE_SIZE = 100
+
+
+def _json(body: bytes, next_cursor: Optional[str] = None) -> Response:
+    """
+    Resposta com JSON já serializado (app/serializers.py).
+    O response_model do endpoint continua documentando o formato no OpenAPI.
+    """
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # Configuração do FastAPI
@@ -38,89 +65,233 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Latência por rota (METRICS_SAMPLE_RATE=0 desliga toda a instrumentação)
+if metrics.enabled():
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
+# Cold start: com PREWARM=true o custo de criação sai da primeira requisição
+# e vai para a importação (fase de init, antes da primeira invocação)
+# Uma falha aqui (repositório, conexão, recuperação do disco) não derruba o init:
+# o que não foi criado fica para a primeira requisição, que reporta o erro
+if PREWARM:
+    try:
+        warm_up()
+    except Exception:
+        logging.getLogger(__name__).exception("Pré-aquecimento falhou; seguindo sem ele")
+
 
 # ============ ENDPOINTS DE TREINADORES ============
 
 @app.get("/treinadores", response_model=list[Trainer])
-def list_trainers(service: TrainerService = Depends(get_trainer_service)):
-    """Lista todos os treinadores"""
-    return service.list_all()
+async def list_trainers(
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: TrainerService = Depends(get_trainer_service)
+):
+    """Lista treinadores, paginado com limit (padrão 100) e cursor"""
+    body, next_cursor = await service.list_page_json(limit or DEFAULT_PAGE_SIZE, cursor)
+    return _json(body, next_cursor)
+
+
+@app.get("/treinadores/resumo", response_model=list[TrainerSummary])
+async def list_trainer_summaries(
+    ids: Optional[list[int]] = Query(default=None, max_length=MAX_PAGE_SIZE),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: TrainerService = Depends(get_trainer_service)
+):
+    """Resumo de vários treinadores (`?ids=1&ids=2`, ou todos, paginado com limit e cursor)"""
+    body, next_cursor = await service.list_summaries_json(ids, limit or DEFAULT_PAGE_SIZE, cursor)
+    return _json(body, next_cursor)
 
 
 @app.get("/treinadores/{trainer_id}", response_model=Trainer)
-def get_trainer(trainer_id: int, service: TrainerService = Depends(get_trainer_service)):
+async def get_trainer(trainer_id: int, service: TrainerService = Depends(get_trainer_service)):
     """Busca um treinador por ID"""
-    return service.get_by_id(trainer_id)
+    return await service.get_by_id(trainer_id)
 
 
 @app.post("/treinadores", response_model=Trainer, status_code=201)
-def create_trainer(data: TrainerCreate, service: TrainerService = Depends(get_trainer_service)):
+async def create_trainer(data: TrainerCreate, service: TrainerService = Depends(get_trainer_service)):
     """Cria um novo treinador"""
-    return service.create(data)
+    return await service.create(data)
 
 
-@app.put("/treinadores/{trainer_id}", response_model=Trainer)
-def update_trainer(trainer_id: int, data: TrainerUpdate, service: TrainerService = Depends(get_trainer_service)):
-    """Atualiza um treinador"""
-    return service.update(trainer_id, data)
+@app.post("/treinadores/lote", response_model=list[Trainer], status_code=201)
+async def create_trainers_batch(data: TrainerBatchCreate, service: TrainerService = Depends(get_trainer_service)):
+    """Cria vários treinadores de uma vez"""
+    return await service.create_many(data)
 
 
-@app.delete("/treinadores/{trainer_id}", status_code=204)
-def delete_trainer(trainer_id: int, service: TrainerService = Depends(get_trainer_service)):
-    """Deleta um treinador e seus pokémon"""
-    service.delete(trainer_id)
+@app.put("/treinadores/{trainer_id}", response_model=Trainer)
+async def update_trainer(trainer_id: int, data: TrainerUpdate, service: TrainerService = Depends(get_trainer_service)):
+    """Atualiza um treinador"""
+    return await service.update(trainer_id, data)
+
+
+@app.delete("/treinadores/{trainer_id}", status_code=204, responses={202: {"model": Job}})
+async def delete_trainer(
+    trainer_id: int,
+    background_tasks: BackgroundTasks,
+    assincrono: bool = False,
+    service: TrainerService = Depends(get_trainer_service),
+    jobs: JobService = Depends(get_job_service)
+):
+    """
+    Deleta um treinador e seus pokémon.
+    Com ?assincrono=true responde 202 com o job e conclui a exclusão fora da
+    requisição: na função de jobs (JOBS_FUNCTION) ou, sem ela, em segundo plano
+    neste processo (acompanhe em GET /jobs/{job_id}).
+    """
+    if assincrono:
+        job = await service.start_delete(trainer_id, jobs)
+        task = await jobs.submit(job.id)
+        if task is not None:
+            background_tasks.add_task(task)
+        return JSONResponse(status_code=202, content=job.model_dump())
+    await service.delete(trainer_id)
     return None
 
 
 # ============ ENDPOINTS DE POKÉMON ============
 
 @app.get("/pokemons", response_model=list[Pokemon])
-def list_pokemons(service: PokemonService = Depends(get_pokemon_service)):
-    """Lista todos os pokémon"""
-    return service.list_all()
+async def list_pokemons(
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    tipo: Optional[str] = None,
+    nivel_min: Optional[int] = Query(default=None, ge=1, le=MAX_LEVEL),
+    nivel_max: Optional[int] = Query(default=None, ge=1, le=MAX_LEVEL),
+    treinador_id: Optional[int] = None,
+    sort: Optional[Literal["nivel", "-nivel", "nome", "-nome"]] = None,
+    service: PokemonService = Depends(get_pokemon_service)
+):
+    """
+    Lista pokémon, paginado com limit (padrão 100) e cursor.
+    Com filtros (tipo exato, faixa de nível, treinador) ou sort, a busca é feita
+    nos índices do backend e o cursor retoma da posição (campo de sort, ID) do
+    último item; sort por nome exige tipo ou treinador_id.
+    """
+    if any(value is not None for value in (tipo, nivel_min, nivel_max, treinador_id, sort)):
+        body, next_cursor = await service.find_json(
+            tipo, nivel_min, nivel_max, treinador_id, sort, limit or DEFAULT_PAGE_SIZE, cursor
+        )
+    else:
+        body, next_cursor = await service.list_page_json(limit or DEFAULT_PAGE_SIZE, cursor)
+    return _json(body, next_cursor)
+
+
+@app.get("/pokemons/ranking", response_model=list[Pokemon])
+async def pokemon_ranking(
+    top: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    tipo: Optional[str] = None,
+    treinador_id: Optional[int] = None,
+    service: PokemonService = Depends(get_pokemon_service)
+):
+    """
+    Ranking dos pokémon de maior nível (geral, por tipo e/ou por treinador).
+    Lido em ordem dos índices de nível do backend, sem ordenar a base.
+    """
+    return _json(await service.ranking_json(top, tipo, treinador_id))
 
 
 @app.get("/pokemons/{pokemon_id}", response_model=Pokemon)
-def get_pokemon(pokemon_id: int, service: PokemonService = Depends(get_pokemon_service)):
+async def get_pokemon(pokemon_id: int, service: PokemonService = Depends(get_pokemon_service)):
     """Busca um pokémon por ID"""
-    return service.get_by_id(pokemon_id)
+    return await service.get_by_id(pokemon_id)
 
 
 @app.post("/pokemons", response_model=Pokemon, status_code=201)
-def create_pokemon(data: PokemonCreate, service: PokemonService = Depends(get_pokemon_service)):
+async def create_pokemon(data: PokemonCreate, service: PokemonService = Depends(get_pokemon_service)):
     """Cria um novo pokémon"""
-    return service.create(data)
+    return await service.create(data)
+
+
+@app.post("/pokemons/lote", response_model=list[Pokemon], status_code=201)
+async def create_pokemons_batch(data: PokemonBatchCreate, service: PokemonService = Depends(get_pokemon_service)):
+    """Cria vários pokémon de uma vez"""
+    return await service.create_many(data)
 
 
 @app.put("/pokemons/{pokemon_id}", response_model=Pokemon)
-def update_pokemon(pokemon_id: int, data: PokemonUpdate, service: PokemonService = Depends(get_pokemon_service)):
+async def update_pokemon(pokemon_id: int, data: PokemonUpdate, service: PokemonService = Depends(get_pokemon_service)):
     """Atualiza um pokémon"""
-    return service.update(pokemon_id, data)
+    return await service.update(pokemon_id, data)
 
 
 @app.delete("/pokemons/{pokemon_id}", status_code=204)
-def delete_pokemon(pokemon_id: int, service: PokemonService = Depends(get_pokemon_service)):
+async def delete_pokemon(pokemon_id: int, service: PokemonService = Depends(get_pokemon_service)):
     """Deleta um pokémon"""
-    service.delete(pokemon_id)
+    await service.delete(pokemon_id)
     return None
 
 
 # ============ RELACIONAMENTO TREINADOR → POKÉMON ============
 
+@app.get("/treinadores/{trainer_id}/resumo", response_model=TrainerSummary)
+async def get_trainer_summary(trainer_id: int, service: TrainerService = Depends(get_trainer_service)):
+    """Quantidade, nível médio e máximo e distribuição de tipos dos pokémon do treinador"""
+    return await service.get_summary(trainer_id)
+
+
 @app.get("/treinadores/{trainer_id}/pokemons", response_model=list[PokemonSimple])
-def get_trainer_pokemons(trainer_id: int, service: PokemonService = Depends(get_pokemon_service)):
+async def get_trainer_pokemons(trainer_id: int, service: PokemonService = Depends(get_pokemon_service)):
     """Lista todos os pokémon de um treinador"""
-    return service.get_by_trainer(trainer_id)
+    return _json(await service.get_by_trainer_json(trainer_id))
 
 
 # ============ ENDPOINT DE BATALHA ============
 
 @app.post("/batalhas", response_model=BattleResultVictory | BattleResultDraw)
-def battle(data: BattleRequest, service: BattleService = Depends(get_battle_service)):
+async def battle(data: BattleRequest, service: BattleService = Depends(get_battle_service)):
     """Simula uma batalha entre dois pokémon"""
-    return service.battle(data)
+    return await service.battle(data)
+
+
+@app.post("/batalhas/lote", response_model=list[BattleResultVictory | BattleResultDraw])
+async def battle_batch(data: BattleBatchRequest, service: BattleService = Depends(get_battle_service)):
+    """Resolve um lote de batalhas (resultados na ordem de entrada)"""
+    return await service.battle_batch(data)
+
+
+@app.post("/batalhas/simulacao", response_model=list[BattleSimulationResult])
+async def battle_simulation(data: BattleSimulationRequest, service: BattleService = Depends(get_battle_service)):
+    """Simula rodadas aleatórias de cada confronto (taxas de vitória com intervalo de confiança)"""
+    return await service.simulate(data)
+
+
+@app.get("/batalhas/memo", response_model=CacheStats)
+async def battle_memo_stats(service: BattleService = Depends(get_battle_service)):
+    """Taxa de acerto do memo de decisões de batalha"""
+    return service.memo_stats()
+
+
+# ============ ENDPOINT DE TORNEIO ============
+
+@app.post("/torneios", response_model=TournamentResult)
+async def tournament(data: TournamentRequest, service: TournamentService = Depends(get_tournament_service)):
+    """Torneio todos-contra-todos entre pokémon de treinadores e/ou IDs avulsos"""
+    return await service.run(data)
+
+
+# ============ ENDPOINT DE JOBS ============
+
+@app.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str, jobs: JobService = Depends(get_job_service)):
+    """Consulta o andamento de um job em segundo plano"""
+    return await jobs.get(job_id)
+
+
+# ============ ENDPOINT DE MÉTRICAS ============
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas no formato texto do Prometheus"""
+    return Response(content=metrics.render(get_cache_stats()), media_type=metrics.CONTENT_TYPE)
 
 
 # ============ HANDLER AWS LAMBDA (comentado para Vercel) ============
@@ -0,0 +1,226 @@
+"""
+Métricas da aplicação no formato texto do Prometheus.
+Histogramas de latência por rota, por método de repositório e por etapa
+(serialização), contadores de chamadas e capacidade consumida do DynamoDB.
+
+Amostragem: METRICS_SAMPLE_RATE (0 a 1) define a fração de requisições e de
+chamadas de repositório cronometradas; com 0 nada é instrumentado. Contadores
+de histogramas refletem só as observações amostradas.
+"""
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+
+SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", "1"))
+
+# Limites dos buckets em segundos (de 0,1 ms a 10 s)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def enabled() -> bool:
+    """Instrumentação ligada (alguma amostragem)"""
+    return SAMPLE_RATE > 0
+
+
+def sampled() -> bool:
+    """Sorteia se a observação atual deve ser registrada"""
+    return SAMPLE_RATE >= 1 or (SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Histograma com rótulos (buckets cumulativos só na exportação)"""
+    
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...], buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        # rótulos → [contagem por bucket (+Inf no fim), soma]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {total!r}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class Counter:
+    """Contador com rótulos"""
+    
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = list(self._values.items())
+        for labels, value in snapshot:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+# ============ MÉTRICAS ============
+
+REQUEST_LATENCY = Histogram(
+    "pokedex_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ("metodo", "rota", "status")
+)
+REPOSITORY_LATENCY = Histogram(
+    "pokedex_repository_call_duration_seconds",
+    "Latência das chamadas aos repositórios",
+    ("backend", "repositorio", "operacao")
+)
+STAGE_LATENCY = Histogram(
+    "pokedex_stage_duration_seconds",
+    "Latência de etapas internas (serialização, montagem de modelos)",
+    ("etapa",)
+)
+DYNAMODB_CALLS = Counter(
+    "pokedex_dynamodb_calls_total",
+    "Chamadas à API do DynamoDB",
+    ("operacao",)
+)
+DYNAMODB_CAPACITY = Counter(
+    "pokedex_dynamodb_consumed_capacity_units_total",
+    "Unidades de capacidade consumidas no DynamoDB",
+    ("operacao", "tabela")
+)
+
+_METRICS = (REQUEST_LATENCY, REPOSITORY_LATENCY, STAGE_LATENCY, DYNAMODB_CALLS, DYNAMODB_CAPACITY)
+
+
+@contextmanager
+def timed_stage(stage: str):
+    """Cronometra uma etapa interna (respeita a amostragem)"""
+    if not sampled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.observe((stage,), time.perf_counter() - start)
+
+
+def record_dynamodb_call(operation: str, consumed: Optional[list[dict] | dict]) -> None:
+    """Conta uma chamada ao DynamoDB e soma a capacidade consumida informada na resposta"""
+    DYNAMODB_CALLS.inc((operation,))
+    if not consumed:
+        return
+    for entry in consumed if isinstance(consumed, list) else [consumed]:
+        DYNAMODB_CAPACITY.inc((operation, entry.get("TableName", "")), float(entry.get("CapacityUnits", 0)))
+
+
+def _render_cache_stats(cache_stats: dict[str, dict]) -> Iterable[str]:
+    """Contadores dos caches/memos como métricas (um rótulo por cache)"""
+    families = (
+        ("pokedex_cache_hits_total", "counter", "Acertos do cache", "hits"),
+        ("pokedex_cache_misses_total", "counter", "Erros do cache", "misses"),
+        ("pokedex_cache_hit_ratio", "gauge", "Taxa de acerto do cache", "hit_rate"),
+        ("pokedex_cache_size", "gauge", "Itens no cache", "size"),
+        ("pokedex_cache_max_size", "gauge", "Capacidade do cache", "max_size")
+    )
+    for name, kind, documentation, key in families:
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} {kind}"
+        for cache, stats in cache_stats.items():
+            yield f"{name}{_labels(('cache',), (cache,))} {_number(stats[key])}"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latência por rota (template, ex.: /pokemons/{pokemon_id}) e status"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not sampled():
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        # Sem http.response.start (exceção antes da resposta) a requisição conta como 500
+        status = 500
+        recorded = False
+        
+        def record():
+            nonlocal recorded
+            recorded = True
+            route = scope.get("route")
+            path = route.path if route is not None else "<sem rota>"
+            REQUEST_LATENCY.observe((scope["method"], path, str(status)), time.perf_counter() - start)
+        
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Resposta entregue: tarefas em segundo plano não entram na latência
+                record()
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Exceção, cliente desconectado ou corpo interrompido: registra mesmo assim
+            if not recorded:
+                record()
+
+
+def render(cache_stats: Optional[dict[str, dict]] = None) -> str:
+    """Todas as métricas no formato texto do Prometheus"""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    if cache_stats:
+        lines.extend(_render_cache_stats(cache_stats))
+    return "\n".join(lines) + "\n"
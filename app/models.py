@@ -5,12 +5,20 @@ Define as estruturas de entrada e saída da API.
 from pydantic import BaseModel, Field
 from typing import Optional
 
+# Maior nível aceito (inteiro de 32 bits, a coluna de níveis do repositório colunar);
+# também mantém nivel_id = nivel * 10^12 + id dos GSIs do DynamoDB abaixo de 38 dígitos
+MAX_LEVEL = 2 ** 31 - 1
+
 # ============ MODELOS DE TREINADOR ============
 
 class TrainerCreate(BaseModel):
     """Dados para criar um novo treinador"""
     nome: str
 
+class TrainerBatchCreate(BaseModel):
+    """Lote de treinadores para criação em massa"""
+    treinadores: list[TrainerCreate] = Field(min_length=1, max_length=10000)
+
 class TrainerUpdate(BaseModel):
     """Dados para atualizar um treinador"""
     nome: str
@@ -20,20 +28,32 @@ class Trainer(BaseModel):
     id: int
     nome: str
 
+class TrainerSummary(BaseModel):
+    """Resumo dos pokémon de um treinador (mantido a cada escrita)"""
+    treinador_id: int
+    quantidade: int
+    nivel_medio: Optional[float] = None
+    nivel_maximo: Optional[int] = None
+    tipos: dict[str, int] = {}
+
 # ============ MODELOS DE POKÉMON ============
 
 class PokemonCreate(BaseModel):
     """Dados para criar um novo pokémon"""
     nome: str
     tipo: str
-    nivel: int = Field(ge=1, description="Nível mínimo é 1")
+    nivel: int = Field(ge=1, le=MAX_LEVEL, description="Nível mínimo é 1")
     treinador_id: int
 
+class PokemonBatchCreate(BaseModel):
+    """Lote de pokémon para criação em massa"""
+    pokemons: list[PokemonCreate] = Field(min_length=1, max_length=10000)
+
 class PokemonUpdate(BaseModel):
     """Dados para atualizar um pokémon (campos opcionais)"""
     nome: Optional[str] = None
     tipo: Optional[str] = None
-    nivel: Optional[int] = Field(default=None, ge=1)
+    nivel: Optional[int] = Field(default=None, ge=1, le=MAX_LEVEL)
 
 class Pokemon(BaseModel):
     """Representação completa de um pokémon"""
@@ -72,3 +92,73 @@ class BattleResultDraw(BaseModel):
     """Resultado de batalha com empate"""
     resultado: str = "empate"
     mensagem: str = "Os Pokémon possuem força equivalente"
+
+class BattleBatchRequest(BaseModel):
+    """Lote de batalhas resolvidas em uma única requisição"""
+    batalhas: list[BattleRequest] = Field(min_length=1, max_length=10000)
+
+class BattleSimulationRequest(BaseModel):
+    """Confrontos simulados rodada a rodada (Monte Carlo)"""
+    batalhas: list[BattleRequest] = Field(min_length=1, max_length=1000)
+    rodadas: int = Field(default=10000, ge=1, le=10_000_000)
+    semente: Optional[int] = None
+
+class SimulatedRate(BaseModel):
+    """Taxa observada com intervalo de confiança de 95% (Wilson)"""
+    taxa: float
+    ic_inferior: float
+    ic_superior: float
+
+class BattleSimulationResult(BaseModel):
+    """Resultado das rodadas simuladas de um confronto"""
+    pokemon_atacante_id: int
+    pokemon_defensor_id: int
+    rodadas: int
+    vitorias_atacante: int
+    empates: int
+    vitorias_defensor: int
+    atacante: SimulatedRate
+    empate: SimulatedRate
+    defensor: SimulatedRate
+
+class CacheStats(BaseModel):
+    """Contadores de um cache/memo"""
+    hits: int
+    misses: int
+    hit_rate: float
+    size: int
+    max_size: int
+
+# ============ MODELOS DE TORNEIO ============
+
+class TournamentRequest(BaseModel):
+    """Participantes do torneio: pokémon de treinadores e/ou IDs avulsos"""
+    treinador_ids: list[int] = []
+    pokemon_ids: list[int] = []
+
+class TournamentStanding(BaseModel):
+    """Linha da classificação do torneio"""
+    posicao: int
+    id: int
+    nome: str
+    treinador_id: int
+    vitorias: int
+    empates: int
+    derrotas: int
+    pontos: int
+
+class TournamentResult(BaseModel):
+    """Resultado de um torneio todos-contra-todos"""
+    participantes: int
+    batalhas: int
+    classificacao: list[TournamentStanding]
+
+# ============ MODELOS DE JOB ============
+
+class Job(BaseModel):
+    """Operação executada em segundo plano"""
+    id: str
+    tipo: str
+    status: str
+    itens_afetados: Optional[int] = None
+    erro: Optional[str] = None
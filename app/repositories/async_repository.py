@@ -0,0 +1,149 @@
+"""
+Repositórios assíncronos.
+Adaptam qualquer implementação síncrona às interfaces assíncronas:
+- Memória: as chamadas não bloqueiam, então rodam direto no event loop.
+- DynamoDB: as chamadas de rede rodam em um executor dedicado, dimensionado
+  junto com o pool de conexões do boto3, e não no threadpool do Starlette.
+- SQLite e memória persistente (MEMORY_DATA_DIR): as escritas esperam o disco
+  e também rodam no executor.
+"""
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Optional
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon, IDatabaseJob
+from app.interfaces.async_database_interface import IAsyncDatabaseTrainer, IAsyncDatabasePokemon, IAsyncDatabaseJob
+
+
+class _AsyncAdapter:
+    """Executa métodos síncronos direto (executor None) ou em um executor"""
+    
+    def __init__(self, executor: Optional[Executor]):
+        self._executor = executor
+    
+    async def _call(self, method: Callable, *args):
+        if self._executor is None:
+            return method(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args))
+
+
+class AsyncTrainerRepository(_AsyncAdapter, IAsyncDatabaseTrainer):
+    """Repositório assíncrono de Treinadores sobre um repositório síncrono"""
+    
+    def __init__(self, inner: IDatabaseTrainer, executor: Optional[Executor] = None):
+        super().__init__(executor)
+        self._inner = inner
+    
+    async def create(self, nome: str) -> dict:
+        """Cria um novo treinador"""
+        return await self._call(self._inner.create, nome)
+    
+    async def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores"""
+        return await self._call(self._inner.create_many, nomes)
+    
+    async def get(self, trainer_id: int) -> Optional[dict]:
+        """Busca treinador por ID"""
+        return await self._call(self._inner.get, trainer_id)
+    
+    async def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores por ID"""
+        return await self._call(self._inner.get_many, trainer_ids)
+    
+    async def list_all(self) -> list[dict]:
+        """Lista todos os treinadores"""
+        return await self._call(self._inner.list_all)
+    
+    async def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return await self._call(self._inner.list_page, limit, cursor)
+    
+    async def update(self, trainer_id: int, nome: str) -> Optional[dict]:
+        """Atualiza um treinador"""
+        return await self._call(self._inner.update, trainer_id, nome)
+    
+    async def delete(self, trainer_id: int) -> bool:
+        """Deleta um treinador"""
+        return await self._call(self._inner.delete, trainer_id)
+
+
+class AsyncPokemonRepository(_AsyncAdapter, IAsyncDatabasePokemon):
+    """Repositório assíncrono de Pokémon sobre um repositório síncrono"""
+    
+    def __init__(self, inner: IDatabasePokemon, executor: Optional[Executor] = None):
+        super().__init__(executor)
+        self._inner = inner
+    
+    async def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon"""
+        return await self._call(self._inner.create, nome, tipo, nivel, treinador_id)
+    
+    async def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon"""
+        return await self._call(self._inner.create_many, pokemons)
+    
+    async def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID"""
+        return await self._call(self._inner.get, pokemon_id)
+    
+    async def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon por ID"""
+        return await self._call(self._inner.get_many, pokemon_ids)
+    
+    async def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        return await self._call(self._inner.list_all)
+    
+    async def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return await self._call(self._inner.list_page, limit, cursor)
+    
+    async def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador"""
+        return await self._call(self._inner.get_by_trainer, treinador_id)
+    
+    async def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pokémon filtrados e ordenados"""
+        return await self._call(self._inner.find, tipo, nivel_min, nivel_max, treinador_id, sort, limit, after)
+    
+    async def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido"""
+        return await self._call(self._inner.get_summaries, treinador_ids)
+    
+    async def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon"""
+        return await self._call(self._inner.update, pokemon_id, nome, tipo, nivel)
+    
+    async def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        return await self._call(self._inner.delete, pokemon_id)
+    
+    async def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador"""
+        return await self._call(self._inner.delete_by_trainer, treinador_id)
+
+
+class AsyncJobRepository(_AsyncAdapter, IAsyncDatabaseJob):
+    """Repositório assíncrono de Jobs sobre um repositório síncrono"""
+    
+    def __init__(self, inner: IDatabaseJob, executor: Optional[Executor] = None):
+        super().__init__(executor)
+        self._inner = inner
+    
+    async def save(self, job: dict) -> None:
+        """Grava o job"""
+        return await self._call(self._inner.save, job)
+    
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Busca job por ID"""
+        return await self._call(self._inner.get, job_id)
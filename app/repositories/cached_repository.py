@@ -0,0 +1,276 @@
+"""
+Repositórios com cache de leitura (read-through).
+Envolvem qualquer implementação das interfaces e guardam os itens lidos por ID
+em um LRU limitado com TTL. Escritas invalidam o cache depois de gravar, e uma
+leitura do repositório só é guardada se a chave não foi invalidada enquanto ela
+acontecia (senão um update concorrente seria sobrescrito pelo valor antigo).
+
+O cache é por processo: em várias Lambdas, uma leitura pode ficar
+desatualizada por até TTL segundos depois de uma escrita em outra instância.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+
+
+class TTLCache:
+    """Cache LRU limitado com expiração por TTL e contadores de acerto/erro"""
+    
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._data: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Versões: o relógio avança a cada invalidação; só chaves com leituras em
+        # andamento guardam a versão da última invalidação (memória limitada a elas)
+        self._clock = 0
+        self._loading: dict[int, int] = {}
+        self._invalidated: dict[int, int] = {}
+        self._invalidated_all = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: int) -> Optional[dict]:
+        """Retorna o item se estiver no cache e não tiver expirado"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def begin_load(self, keys: list[int]) -> int:
+        """Registra uma leitura do repositório e retorna a versão para end_load"""
+        with self._lock:
+            for key in keys:
+                self._loading[key] = self._loading.get(key, 0) + 1
+            return self._clock
+    
+    def end_load(self, keys: list[int], found: dict[int, dict], version: int) -> None:
+        """Guarda os itens lidos, exceto os invalidados depois de begin_load"""
+        with self._lock:
+            for key in keys:
+                item = found.get(key)
+                if item is not None and self._invalidated.get(key, 0) <= version and self._invalidated_all <= version:
+                    self._store(key, item)
+                if self._loading[key] > 1:
+                    self._loading[key] -= 1
+                else:
+                    del self._loading[key]
+                    self._invalidated.pop(key, None)
+    
+    def set(self, key: int, value: dict) -> None:
+        """Guarda o item, descartando o menos usado se o cache estiver cheio"""
+        with self._lock:
+            self._store(key, value)
+    
+    def _store(self, key: int, value: dict) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+    
+    def invalidate(self, key: int) -> None:
+        """Remove um item do cache (e descarta as leituras dele em andamento)"""
+        with self._lock:
+            self._data.pop(key, None)
+            if key in self._loading:
+                self._clock += 1
+                self._invalidated[key] = self._clock
+    
+    def invalidate_where(self, predicate: Callable[[dict], bool]) -> None:
+        """
+        Remove os itens que satisfazem o predicado (custo limitado ao tamanho do cache).
+        Leituras em andamento são todas descartadas: o item delas ainda não é conhecido.
+        """
+        with self._lock:
+            for key in [k for k, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+            if self._loading:
+                self._clock += 1
+                self._invalidated_all = self._clock
+    
+    def stats(self) -> dict:
+        """Contadores de acerto/erro e ocupação"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "max_size": self._max_size
+            }
+
+
+def _get_cached(cache: TTLCache, item_id: int, load: Callable[[int], Optional[dict]]) -> Optional[dict]:
+    """Busca no cache e, se não estiver lá, no repositório"""
+    item = cache.get(item_id)
+    if item is not None:
+        return item
+    version = cache.begin_load([item_id])
+    try:
+        item = load(item_id)
+    finally:
+        cache.end_load([item_id], {item_id: item} if item is not None else {}, version)
+    return item
+
+
+def _get_many_cached(cache: TTLCache, ids: list[int], load: Callable[[list[int]], dict[int, dict]]) -> dict[int, dict]:
+    """Resolve o que estiver no cache e busca o restante em uma única leitura"""
+    result = {}
+    missing = []
+    for item_id in dict.fromkeys(ids):
+        item = cache.get(item_id)
+        if item is None:
+            missing.append(item_id)
+        else:
+            result[item_id] = item
+    if missing:
+        found = {}
+        version = cache.begin_load(missing)
+        try:
+            found = load(missing)
+        finally:
+            cache.end_load(missing, found, version)
+        result.update(found)
+    return result
+
+
+class CachedTrainerRepository(IDatabaseTrainer):
+    """Cache de leitura por ID na frente de um repositório de treinadores"""
+    
+    def __init__(self, inner: IDatabaseTrainer, max_size: int, ttl_seconds: float):
+        self._inner = inner
+        self._cache = TTLCache(max_size, ttl_seconds)
+    
+    def stats(self) -> dict:
+        """Contadores do cache"""
+        return self._cache.stats()
+    
+    def create(self, nome: str) -> dict:
+        """Cria um novo treinador"""
+        trainer = self._inner.create(nome)
+        self._cache.set(int(trainer["id"]), trainer)
+        return trainer
+    
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores"""
+        trainers = self._inner.create_many(nomes)
+        for trainer in trainers:
+            self._cache.set(int(trainer["id"]), trainer)
+        return trainers
+    
+    def get(self, trainer_id: int) -> Optional[dict]:
+        """Busca treinador por ID (cache primeiro)"""
+        return _get_cached(self._cache, trainer_id, self._inner.get)
+    
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores (cache primeiro)"""
+        return _get_many_cached(self._cache, trainer_ids, self._inner.get_many)
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os treinadores"""
+        return self._inner.list_all()
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return self._inner.list_page(limit, cursor)
+    
+    def update(self, trainer_id: int, nome: str) -> Optional[dict]:
+        """Atualiza um treinador (a próxima leitura busca a versão gravada)"""
+        trainer = self._inner.update(trainer_id, nome)
+        self._cache.invalidate(trainer_id)
+        return trainer
+    
+    def delete(self, trainer_id: int) -> bool:
+        """Deleta um treinador"""
+        deleted = self._inner.delete(trainer_id)
+        self._cache.invalidate(trainer_id)
+        return deleted
+
+
+class CachedPokemonRepository(IDatabasePokemon):
+    """Cache de leitura por ID na frente de um repositório de pokémon"""
+    
+    def __init__(self, inner: IDatabasePokemon, max_size: int, ttl_seconds: float):
+        self._inner = inner
+        self._cache = TTLCache(max_size, ttl_seconds)
+    
+    def stats(self) -> dict:
+        """Contadores do cache"""
+        return self._cache.stats()
+    
+    def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon"""
+        pokemon = self._inner.create(nome, tipo, nivel, treinador_id)
+        self._cache.set(int(pokemon["id"]), pokemon)
+        return pokemon
+    
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon"""
+        created = self._inner.create_many(pokemons)
+        for pokemon in created:
+            self._cache.set(int(pokemon["id"]), pokemon)
+        return created
+    
+    def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID (cache primeiro)"""
+        return _get_cached(self._cache, pokemon_id, self._inner.get)
+    
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon (cache primeiro)"""
+        return _get_many_cached(self._cache, pokemon_ids, self._inner.get_many)
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        return self._inner.list_all()
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return self._inner.list_page(limit, cursor)
+    
+    def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador"""
+        return self._inner.get_by_trainer(treinador_id)
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pokémon filtrados e ordenados"""
+        return self._inner.find(tipo, nivel_min, nivel_max, treinador_id, sort, limit, after)
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido"""
+        return self._inner.get_summaries(treinador_ids)
+    
+    def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon (a próxima leitura busca a versão gravada)"""
+        pokemon = self._inner.update(pokemon_id, nome, tipo, nivel)
+        self._cache.invalidate(pokemon_id)
+        return pokemon
+    
+    def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        deleted = self._inner.delete(pokemon_id)
+        self._cache.invalidate(pokemon_id)
+        return deleted
+    
+    def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador"""
+        count = self._inner.delete_by_trainer(treinador_id)
+        self._cache.invalidate_where(lambda p: int(p["treinador_id"]) == treinador_id)
+        return count
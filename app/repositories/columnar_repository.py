@@ -0,0 +1,430 @@
+"""
+Repositório de Pokémon em memória com armazenamento colunar.
+Alternativa compacta ao MemoryPokemonRepository para simulações com dezenas de
+milhões de pokémon: cada atributo fica em uma coluna `array` e nomes/tipos são
+codificados por dicionário (cada texto distinto é guardado uma única vez).
+Os dicts só são montados quando um item é pedido.
+As escritas são serializadas por um único lock (as colunas crescem juntas).
+Buscas com filtro (find) usam índices de tipo e de nível guardados em arrays.
+"""
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Optional
+from app.interfaces.database_interface import IDatabasePokemon
+from app.repositories.cursor import encode_cursor, decode_cursor
+from app.repositories.query import check_sort, matches, order
+from app.repositories.removed_trainers import RemovedTrainers
+from app.repositories.summary import TrainerAggregate, build_summary
+
+
+def _check_columns(nivel: Optional[int] = None, treinador_id: Optional[int] = None) -> None:
+    """
+    Confere se os valores cabem nas colunas (ValueError, senão) antes de qualquer
+    escrita: um OverflowError no meio da gravação deixaria colunas, índices e
+    contadores desencontrados.
+    """
+    if nivel is not None and not -2 ** 31 <= nivel < 2 ** 31:
+        raise ValueError(f"Nível fora do intervalo da coluna: {nivel}")
+    if treinador_id is not None and not -2 ** 63 <= treinador_id < 2 ** 63:
+        raise ValueError(f"ID de treinador fora do intervalo da coluna: {treinador_id}")
+
+
+class _StringDictionary:
+    """Codifica textos repetidos em inteiros (código → texto e texto → código)"""
+    
+    def __init__(self):
+        self._values: list[str] = []
+        self._codes: dict[str, int] = {}
+    
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._values.append(value)
+            self._codes[value] = code
+        return code
+    
+    def decode(self, code: int) -> str:
+        return self._values[code]
+    
+    def lookup(self, value: str) -> Optional[int]:
+        """Código do texto, sem cadastrar (None se nunca foi visto)"""
+        return self._codes.get(value)
+    
+    def values(self) -> list[str]:
+        return list(self._values)
+    
+    def load(self, values: list[str]) -> None:
+        self._values = list(values)
+        self._codes = {value: code for code, value in enumerate(self._values)}
+
+
+class _SlotBuckets:
+    """
+    Índice chave → posições (arrays compactos), com as chaves em ordem (bisect).
+    Cada posição guarda onde está no seu bucket: remover troca com o último
+    elemento do bucket, em O(1). A ordem dentro do bucket não é a de ID.
+    Só é alterado com o lock do repositório.
+    """
+    
+    def __init__(self):
+        self._buckets: dict[int, array] = {}
+        self._keys: list[int] = []
+        self._positions = array("I")
+    
+    def add(self, key: int, slot: int) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = array("q")
+            insort(self._keys, key)
+        if slot >= len(self._positions):
+            self._positions.extend([0] * (slot + 1 - len(self._positions)))
+        self._positions[slot] = len(bucket)
+        bucket.append(slot)
+    
+    def remove(self, key: int, slot: int) -> None:
+        bucket = self._buckets[key]
+        position = self._positions[slot]
+        last = bucket[-1]
+        bucket[position] = last
+        self._positions[last] = position
+        bucket.pop()
+        if not bucket:
+            del self._buckets[key]
+            del self._keys[bisect_left(self._keys, key)]
+    
+    def size(self, key: int) -> int:
+        bucket = self._buckets.get(key)
+        return 0 if bucket is None else len(bucket)
+    
+    def keys(self, low: Optional[int] = None, high: Optional[int] = None) -> list[int]:
+        """Chaves da faixa em ordem"""
+        start = 0 if low is None else bisect_left(self._keys, low)
+        end = len(self._keys) if high is None else bisect_right(self._keys, high)
+        return self._keys[start:end]
+    
+    def slots(self, key: int, limit: Optional[int] = None, accept=None) -> list[int]:
+        """
+        Posições da chave em ordem (cópia), só as aceitas por `accept` se dado;
+        com limit, só as `limit` menores em O(b log limit)
+        """
+        bucket = self._buckets.get(key, ())
+        if accept is not None:
+            bucket = [slot for slot in bucket if accept(slot)]
+        return sorted(bucket) if limit is None else heapq.nsmallest(limit, bucket)
+    
+    def dump(self) -> dict:
+        return {"buckets": {key: array("q", bucket) for key, bucket in self._buckets.items()}, "positions": array("I", self._positions)}
+    
+    def load(self, image: dict) -> None:
+        self._buckets = image["buckets"]
+        self._keys = sorted(self._buckets)
+        self._positions = image["positions"]
+
+
+class ColumnarPokemonRepository(IDatabasePokemon):
+    """
+    Repositório de Pokémon em colunas.
+    O ID é sequencial, então a posição de um pokémon nas colunas é `id - 1`;
+    exclusões só marcam a posição como removida.
+    """
+    
+    def __init__(self):
+        self._alive = bytearray()
+        self._levels = array("i")
+        self._trainer_ids = array("q")
+        self._name_codes = array("I")
+        self._type_codes = array("I")
+        self._names = _StringDictionary()
+        self._types = _StringDictionary()
+        # Índice por treinador: IDs em ordem de criação (removidos são filtrados na leitura)
+        self._by_trainer: dict[int, array] = {}
+        # Índices exatos (só itens vivos): código do tipo → posições e nível → posições
+        self._by_type = _SlotBuckets()
+        self._by_level = _SlotBuckets()
+        # Contadores do resumo por treinador (tipos pelo código do dicionário)
+        self._aggregates: dict[int, TrainerAggregate] = {}
+        # Treinadores excluídos em cascata há pouco (não recebem novos pokémon)
+        self._removed_trainers = RemovedTrainers()
+        self._lock = threading.Lock()
+    
+    def _slot(self, pokemon_id: int) -> Optional[int]:
+        """Posição do pokémon nas colunas (None se não existir)"""
+        slot = pokemon_id - 1
+        if 0 <= slot < len(self._alive) and self._alive[slot]:
+            return slot
+        return None
+    
+    def _index(self, slot: int) -> None:
+        self._by_type.add(self._type_codes[slot], slot)
+        self._by_level.add(self._levels[slot], slot)
+        self._count(slot, 1)
+    
+    def _unindex(self, slot: int) -> None:
+        self._by_type.remove(self._type_codes[slot], slot)
+        self._by_level.remove(self._levels[slot], slot)
+        self._count(slot, -1)
+    
+    def _count(self, slot: int, delta: int) -> None:
+        """Conta (1) ou desconta (-1) a linha nos contadores do seu treinador"""
+        trainer_id = self._trainer_ids[slot]
+        aggregate = self._aggregates.get(trainer_id)
+        if aggregate is None:
+            aggregate = self._aggregates[trainer_id] = TrainerAggregate()
+        aggregate.add(self._levels[slot], self._type_codes[slot], delta)
+        if aggregate.empty():
+            del self._aggregates[trainer_id]
+    
+    def _row(self, slot: int) -> dict:
+        """Monta o dict do pokémon a partir das colunas"""
+        return {
+            "id": slot + 1,
+            "nome": self._names.decode(self._name_codes[slot]),
+            "tipo": self._types.decode(self._type_codes[slot]),
+            "nivel": self._levels[slot],
+            "treinador_id": self._trainer_ids[slot]
+        }
+    
+    def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon (ValueError se o treinador já foi excluído)"""
+        _check_columns(nivel, treinador_id)
+        with self._lock:
+            if treinador_id in self._removed_trainers:
+                raise ValueError(f"Treinador excluído: {treinador_id}")
+            self._levels.append(nivel)
+            self._trainer_ids.append(treinador_id)
+            self._name_codes.append(self._names.encode(nome))
+            self._type_codes.append(self._types.encode(tipo))
+            # Marcado como vivo por último: a linha só aparece depois de completa
+            self._alive.append(1)
+            new_id = len(self._alive)
+            self._by_trainer.setdefault(treinador_id, array("q")).append(new_id)
+            self._index(new_id - 1)
+        return self._row(new_id - 1)
+    
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon (o lote inteiro é conferido antes da primeira gravação)"""
+        for p in pokemons:
+            _check_columns(p["nivel"], p["treinador_id"])
+        return [self.create(p["nome"], p["tipo"], p["nivel"], p["treinador_id"]) for p in pokemons]
+    
+    def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID"""
+        slot = self._slot(pokemon_id)
+        return None if slot is None else self._row(slot)
+    
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon por ID"""
+        result = {}
+        for pid in set(pokemon_ids):
+            slot = self._slot(pid)
+            if slot is not None:
+                result[pid] = self._row(slot)
+        return result
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        return [self._row(slot) for slot, alive in enumerate(self._alive) if alive]
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        slot = decode_cursor(cursor) or 0
+        items = []
+        while True:
+            # find() pula as linhas removidas em C, sem visitar slot a slot
+            slot = self._alive.find(1, slot)
+            if slot < 0:
+                return items, None
+            if len(items) == limit:
+                return items, encode_cursor(items[-1]["id"])
+            items.append(self._row(slot))
+            slot += 1
+    
+    def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador"""
+        ids = self._by_trainer.get(treinador_id, ())
+        return [self._row(pid - 1) for pid in ids if self._alive[pid - 1]]
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pelo índice mais seletivo; filtros restantes são conferidos nas colunas"""
+        check_sort(sort, tipo, treinador_id)
+        by_level = sort in ("nivel", "-nivel")
+        type_code = None if tipo is None else self._types.lookup(tipo)
+        if tipo is not None and type_code is None:
+            return []
+        with self._lock:
+            if treinador_id is not None:
+                # Treinador (poucos itens): o índice guarda IDs, inclusive de removidos
+                slots = [pid - 1 for pid in self._by_trainer.get(treinador_id, ()) if self._alive[pid - 1]]
+            elif tipo is not None and not (by_level and limit is not None):
+                slots = self._by_type.slots(type_code)
+            elif tipo is not None or nivel_min is not None or nivel_max is not None or by_level:
+                # Nível a nível, em ordem: com sort por nível pode parar no limite (ranking)
+                # e retomar da posição `after` (nível, ID); com tipo, o código de cada
+                # posição é conferido na coluna
+                accept = None if type_code is None else (lambda slot: self._type_codes[slot] == type_code)
+                low, high = nivel_min, nivel_max
+                if by_level and after is not None:
+                    if sort == "-nivel":
+                        high = after[0] if high is None else min(high, after[0])
+                    else:
+                        low = after[0] if low is None else max(low, after[0])
+                slots = []
+                levels = self._by_level.keys(low, high)
+                remaining = limit if by_level else None
+                for level in reversed(levels) if sort == "-nivel" else levels:
+                    level_accept = accept
+                    if by_level and after is not None and level == after[0]:
+                        # Posição = ID - 1: os IDs depois de after[1] são as posições >= after[1]
+                        level_accept = lambda slot, first=after[1]: slot >= first and (accept is None or accept(slot))
+                    slots.extend(self._by_level.slots(level, remaining, level_accept))
+                    if remaining is not None:
+                        remaining = limit - len(slots)
+                        if remaining <= 0:
+                            break
+                if by_level:
+                    return [self._row(slot) for slot in slots[:limit]]
+            else:
+                slots = None
+            if slots is not None:
+                items = [self._row(slot) for slot in slots]
+        if slots is None:
+            return order(self.list_all(), sort, limit, after)
+        return order([p for p in items if matches(p, tipo, nivel_min, nivel_max, treinador_id)], sort, limit, after)
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido, a partir dos contadores"""
+        summaries = {}
+        with self._lock:
+            for trainer_id in dict.fromkeys(treinador_ids):
+                aggregate = self._aggregates.get(trainer_id)
+                if aggregate is None:
+                    summaries[trainer_id] = build_summary(trainer_id)
+                    continue
+                types = {self._types.decode(code): count for code, count in aggregate.types.items()}
+                summaries[trainer_id] = build_summary(trainer_id, aggregate.levels, types)
+        return summaries
+    
+    def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon"""
+        _check_columns(nivel)
+        with self._lock:
+            slot = self._slot(pokemon_id)
+            if slot is None:
+                return None
+            reindex = tipo is not None or nivel is not None
+            if reindex:
+                self._unindex(slot)
+            if nome is not None:
+                self._name_codes[slot] = self._names.encode(nome)
+            if tipo is not None:
+                self._type_codes[slot] = self._types.encode(tipo)
+            if nivel is not None:
+                self._levels[slot] = nivel
+            if reindex:
+                self._index(slot)
+            return self._row(slot)
+    
+    def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        with self._lock:
+            slot = self._slot(pokemon_id)
+            if slot is None:
+                return False
+            self._alive[slot] = 0
+            self._unindex(slot)
+            return True
+    
+    def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador (e recusa criações posteriores para ele)"""
+        count = 0
+        with self._lock:
+            self._removed_trainers.add(treinador_id)
+            for pid in self._by_trainer.pop(treinador_id, ()):
+                if self._alive[pid - 1]:
+                    self._alive[pid - 1] = 0
+                    self._unindex(pid - 1)
+                    count += 1
+        return count
+    
+    # ============ PERSISTÊNCIA (usado pelo DurablePokemonRepository) ============
+    
+    def snapshot(self) -> dict:
+        """Cópia binária das colunas (arrays são serializados como bytes)"""
+        with self._lock:
+            return {
+                "alive": bytes(self._alive),
+                "levels": array("i", self._levels),
+                "trainer_ids": array("q", self._trainer_ids),
+                "name_codes": array("I", self._name_codes),
+                "type_codes": array("I", self._type_codes),
+                "names": self._names.values(),
+                "types": self._types.values(),
+                "by_trainer": {tid: array("q", ids) for tid, ids in self._by_trainer.items()},
+                "by_type": self._by_type.dump(),
+                "by_level": self._by_level.dump(),
+                "removed_trainers": self._removed_trainers.dump()
+            }
+    
+    def restore(self, image: dict) -> None:
+        """Carrega uma imagem gerada por snapshot()"""
+        with self._lock:
+            self._alive = bytearray(image["alive"])
+            self._levels = image["levels"]
+            self._trainer_ids = image["trainer_ids"]
+            self._name_codes = image["name_codes"]
+            self._type_codes = image["type_codes"]
+            self._names.load(image["names"])
+            self._types.load(image["types"])
+            self._by_trainer = image["by_trainer"]
+            self._removed_trainers.load(image.get("removed_trainers", {}))
+            self._by_type = _SlotBuckets()
+            self._by_level = _SlotBuckets()
+            self._aggregates = {}
+            if "by_type" in image:
+                self._by_type.load(image["by_type"])
+                self._by_level.load(image["by_level"])
+                # Contadores não vão no snapshot: recalculados a partir das colunas
+                for slot, alive in enumerate(self._alive):
+                    if alive:
+                        self._count(slot, 1)
+            else:
+                # Snapshot anterior aos índices: reconstrói a partir das colunas
+                for slot, alive in enumerate(self._alive):
+                    if alive:
+                        self._index(slot)
+    
+    def load_items(self, items: list[dict]) -> None:
+        """Grava itens que já têm ID (replay do log); posições puladas ficam removidas"""
+        for item in items:
+            _check_columns(item["nivel"], item["treinador_id"])
+        with self._lock:
+            for item in sorted(items, key=lambda p: p["id"]):
+                slot = item["id"] - 1
+                ids = self._by_trainer.setdefault(item["treinador_id"], array("q"))
+                # Só uma posição que já existia pode estar no índice
+                if slot >= len(self._alive) or item["id"] not in ids:
+                    ids.append(item["id"])
+                while len(self._alive) <= slot:
+                    for column in (self._levels, self._trainer_ids, self._name_codes, self._type_codes):
+                        column.append(0)
+                    self._alive.append(0)
+                if self._alive[slot]:
+                    self._unindex(slot)
+                self._levels[slot] = item["nivel"]
+                self._trainer_ids[slot] = item["treinador_id"]
+                self._name_codes[slot] = self._names.encode(item["nome"])
+                self._type_codes[slot] = self._types.encode(item["tipo"])
+                self._alive[slot] = 1
+                self._index(slot)
@@ -0,0 +1,43 @@
+"""
+Cursores opacos para paginação.
+O cliente recebe apenas uma string; internamente ela guarda o último ID retornado
+(ou, na busca ordenada, a chave de ordenação e o ID do último item).
+"""
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(last_id: int) -> str:
+    """Codifica o último ID da página em um cursor opaco"""
+    return base64.urlsafe_b64encode(str(int(last_id)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decodifica o cursor (ValueError se for inválido)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
+
+
+def encode_key_cursor(key: tuple) -> str:
+    """Codifica a chave (valores JSON) do último item da página em um cursor opaco"""
+    return base64.urlsafe_b64encode(json.dumps(list(key), separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_key_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """Decodifica o cursor de encode_key_cursor (ValueError se for inválido)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(key, list):
+        raise ValueError("Cursor inválido")
+    return tuple(key)
@@ -0,0 +1,486 @@
+"""
+Persistência local para os repositórios em memória.
+Cada escrita vira um registro em um log append-only; de tempos em tempos o log é
+compactado em um snapshot binário (imagem do repositório serializada com pickle).
+Na inicialização o estado é recuperado lendo o snapshot e reaplicando o log.
+
+Group commit: cada escrita só retorna depois que o seu registro está no disco.
+Quem encontra o disco livre grava de uma vez (um write + um fsync) todos os
+registros pendentes, inclusive os que chegaram durante o fsync anterior.
+As escritas são serializadas por faixa de chave (treinador, no caso dos pokémon),
+e a espera pelo fsync acontece fora do lock. As chamadas bloqueiam (fsync), então
+a API as executa no executor de repositórios, nunca no event loop.
+
+A compactação não trava as escritas: o log é trocado e o snapshot copia o estado
+enquanto elas continuam. Escritas desse intervalo podem estar no snapshot e no log
+novo, o que é inofensivo porque reaplicar um registro não muda o resultado.
+
+Cada registro do log é precedido do tamanho e do CRC32; na leitura, só um último
+registro incompleto (queda no meio da escrita) é descartado.
+
+Os arquivos são do próprio servidor; não carregue diretórios de terceiros
+(pickle executa código ao desserializar).
+"""
+import atexit
+import gc
+import os
+import pickle
+import shutil
+import struct
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+from typing import Iterator, Optional
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+
+
+SNAPSHOT_VERSION = 1
+
+# Cabeçalho de cada registro do log: tamanho e CRC32 do pickle
+RECORD_HEADER = struct.Struct("<II")
+
+# Faixas de lock de escrita por repositório (chaves em faixas diferentes não se bloqueiam)
+WRITE_STRIPES = 16
+
+
+class CorruptLogError(ValueError):
+    """Registro inválido antes do fim do log (não é uma escrita interrompida)"""
+
+
+def encode_record(record: tuple) -> bytes:
+    data = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+    return RECORD_HEADER.pack(len(data), zlib.crc32(data)) + data
+
+
+def read_log(path: str) -> list:
+    """
+    Lê os registros do log. Só o último registro pode estar incompleto (queda no
+    meio da escrita): ele é descartado e o arquivo truncado. Um registro inválido
+    seguido de outros levanta CorruptLogError.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    records = []
+    offset = 0
+    while offset < len(data):
+        start = offset + RECORD_HEADER.size
+        if start > len(data):
+            break
+        size, crc = RECORD_HEADER.unpack_from(data, offset)
+        end = start + size
+        if end > len(data):
+            break
+        if zlib.crc32(data[start:end]) != crc:
+            if end == len(data):
+                # Último registro gravado pela metade
+                break
+            raise CorruptLogError(f"Registro corrompido em {path} (byte {offset})")
+        try:
+            records.append(pickle.loads(data[start:end]))
+        except Exception as e:
+            raise CorruptLogError(f"Registro ilegível em {path} (byte {offset})") from e
+        offset = end
+    if offset < len(data):
+        os.truncate(path, offset)
+    return records
+
+
+def _fsync_dir(directory: str) -> None:
+    """Garante que renomeações no diretório sobrevivam a uma queda"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(path: str, image: dict) -> None:
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": SNAPSHOT_VERSION, "image": image}, f, pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def read_snapshot(path: str) -> dict:
+    """Lê o snapshot em uma única leitura"""
+    with open(path, "rb") as f:
+        data = f.read()
+    # Milhões de objetos novos: o GC não tem o que coletar durante a carga
+    gc.disable()
+    try:
+        snapshot = pickle.loads(data)
+    finally:
+        gc.enable()
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Versão de snapshot não suportada: {path}")
+    return snapshot["image"]
+
+
+class AppendOnlyLog:
+    """Log binário append-only com group commit"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.records = 0
+        self._pending: list[bytes] = []
+        # Número do último registro enfileirado e do último já no disco
+        self._appended = 0
+        self._durable = 0
+        # Há uma escrita em andamento (quem chega espera por ela em vez de fazer a sua)
+        self._writing = False
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._written = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()
+        self._file = open(path, "ab")
+    
+    def append(self, record: tuple) -> int:
+        """Enfileira um registro e retorna o seu número (para wait)"""
+        data = encode_record(record)
+        with self._lock:
+            self._pending.append(data)
+            self.records += 1
+            self._appended += 1
+            return self._appended
+    
+    def wait(self, ticket: int) -> None:
+        """
+        Bloqueia até o registro `ticket` estar no disco. Se não há escrita em
+        andamento, esta thread grava todos os pendentes; senão espera a atual,
+        que pode já levar o registro.
+        """
+        with self._written:
+            while self._durable < ticket and self._writing and self._error is None:
+                self._written.wait()
+            if self._error is not None:
+                raise OSError(f"Log indisponível após falha de escrita: {self.path}") from self._error
+            if self._durable >= ticket:
+                return
+            self._writing = True
+        try:
+            with self._io_lock:
+                self._write_pending()
+        finally:
+            with self._written:
+                self._writing = False
+                self._written.notify_all()
+    
+    def flush(self) -> None:
+        """Grava os registros pendentes com um único fsync"""
+        with self._io_lock:
+            self._write_pending()
+    
+    def _write_pending(self) -> None:
+        """Grava o lote pendente (chamar com `_io_lock` adquirido)"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            last = self._appended
+        if batch:
+            try:
+                self._file.write(b"".join(batch))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except BaseException as e:
+                # Os registros do lote se perderam: as escritas que esperam por eles falham
+                self._error = e
+                raise
+        with self._lock:
+            self._durable = last
+    
+    def rotate(self, old_path: str) -> None:
+        """
+        Move o log atual para `old_path` e recomeça em um arquivo vazio. Se uma
+        compactação anterior falhou e `old_path` ainda existe, o log atual é
+        acrescentado a ele (reaplicar um registro repetido após uma queda é inofensivo).
+        """
+        with self._io_lock:
+            self._write_pending()
+            self._file.close()
+            if os.path.exists(old_path):
+                with open(self.path, "rb") as current, open(old_path, "ab") as old:
+                    shutil.copyfileobj(current, old)
+                    old.flush()
+                    os.fsync(old.fileno())
+                self._file = open(self.path, "wb")
+            else:
+                os.replace(self.path, old_path)
+                self._file = open(self.path, "ab")
+            self.records = 0
+    
+    def close(self) -> None:
+        """Grava o que estiver pendente e fecha o arquivo"""
+        with self._io_lock:
+            self._write_pending()
+            self._file.close()
+
+
+class _DurableStore:
+    """
+    Snapshot + log de um repositório em memória.
+    O repositório precisa oferecer snapshot(), restore(image) e load_items(items).
+    """
+    
+    def __init__(self, inner, directory: str, name: str, compact_every: int, stripes: int = WRITE_STRIPES):
+        os.makedirs(directory, exist_ok=True)
+        self._inner = inner
+        self._snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        self._log_path = os.path.join(directory, f"{name}.log")
+        self._old_log_path = self._log_path + ".old"
+        self._compact_every = compact_every
+        self._compacting = False
+        # Serializam escrita no repositório + registro no log por faixa de chave: para
+        # a mesma chave o log segue a ordem real; chaves diferentes comutam no replay
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._recover()
+        self._log = AppendOnlyLog(self._log_path)
+        atexit.register(self._log.close)
+    
+    def _recover(self) -> None:
+        """Snapshot + log antigo (compactação interrompida) + log atual"""
+        if os.path.exists(self._snapshot_path):
+            self._inner.restore(read_snapshot(self._snapshot_path))
+        interrupted = os.path.exists(self._old_log_path)
+        for path in (self._old_log_path, self._log_path):
+            if os.path.exists(path):
+                for record in read_log(path):
+                    self._apply(record)
+        if interrupted:
+            # Termina a compactação interrompida antes de aceitar escritas
+            write_snapshot(self._snapshot_path, self._inner.snapshot())
+            os.remove(self._old_log_path)
+            if os.path.exists(self._log_path):
+                os.truncate(self._log_path, 0)
+    
+    def _apply(self, record: tuple) -> None:
+        """Reaplica um registro do log (reaplicar um registro já aplicado não muda o resultado)"""
+        kind = record[0]
+        if kind == "c":
+            self._inner.load_items(record[1])
+        elif kind == "u":
+            self._inner.update(record[1], **record[2])
+        elif kind == "d":
+            self._inner.delete(record[1])
+        elif kind == "t":
+            self._inner.delete_by_trainer(record[1])
+    
+    @contextmanager
+    def _locked(self, keys: tuple) -> Iterator[None]:
+        """Adquire as faixas das chaves (todas, sem chaves) em ordem crescente"""
+        if keys:
+            stripes = sorted({hash(key) % len(self._locks) for key in keys})
+        else:
+            stripes = range(len(self._locks))
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._locks[stripe])
+            yield
+    
+    @contextmanager
+    def writing(self, *keys) -> Iterator:
+        """
+        Escrita no repositório: o bloco roda com as faixas das chaves travadas e
+        registra os seus registros com a função recebida; na saída, os locks são
+        liberados e só então se espera o fsync do último registro.
+        """
+        tickets = []
+        with self._locked(keys):
+            yield lambda record: tickets.append(self._append(record))
+        if tickets:
+            self._log.wait(tickets[-1])
+    
+    def _append(self, record: tuple) -> int:
+        ticket = self._log.append(record)
+        if self._log.records >= self._compact_every and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self.compact, name="compaction", daemon=True).start()
+        return ticket
+    
+    def compact(self) -> None:
+        """Troca o log por um snapshot do estado atual (sem travar as escritas)"""
+        try:
+            # Tudo o que foi para o log antigo já está no repositório: a cópia feita
+            # depois da troca inclui esses registros, e o log novo repete o restante
+            self._log.rotate(self._old_log_path)
+            image = self._inner.snapshot()
+            write_snapshot(self._snapshot_path, image)
+            os.remove(self._old_log_path)
+        finally:
+            # Numa falha, o log antigo continua valendo e a próxima compactação o reaproveita
+            self._compacting = False
+    
+    def flush(self) -> None:
+        """Força a gravação dos registros pendentes"""
+        self._log.flush()
+    
+    def close(self) -> None:
+        """Grava o que estiver pendente e fecha o log"""
+        atexit.unregister(self._log.close)
+        self._log.close()
+
+
+class DurableTrainerRepository(IDatabaseTrainer):
+    """Repositório de treinadores em memória com log + snapshot em disco"""
+    
+    def __init__(self, inner: IDatabaseTrainer, directory: str, compact_every: int = 100_000):
+        self._inner = inner
+        # Poucas escritas de treinador: uma faixa só (o ID do create só existe depois dele)
+        self._store = _DurableStore(inner, directory, "treinadores", compact_every, stripes=1)
+    
+    def compact(self) -> None:
+        """Compacta o log em um snapshot"""
+        self._store.compact()
+    
+    def close(self) -> None:
+        """Grava o que estiver pendente e fecha o log"""
+        self._store.close()
+    
+    def create(self, nome: str) -> dict:
+        """Cria um novo treinador"""
+        with self._store.writing() as record:
+            trainer = self._inner.create(nome)
+            record(("c", [trainer]))
+        return trainer
+    
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores (um único registro no log)"""
+        with self._store.writing() as record:
+            trainers = self._inner.create_many(nomes)
+            record(("c", trainers))
+        return trainers
+    
+    def get(self, trainer_id: int) -> Optional[dict]:
+        """Busca treinador por ID"""
+        return self._inner.get(trainer_id)
+    
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores por ID"""
+        return self._inner.get_many(trainer_ids)
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os treinadores"""
+        return self._inner.list_all()
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return self._inner.list_page(limit, cursor)
+    
+    def update(self, trainer_id: int, nome: str) -> Optional[dict]:
+        """Atualiza um treinador"""
+        with self._store.writing() as record:
+            trainer = self._inner.update(trainer_id, nome)
+            if trainer is not None:
+                record(("u", trainer_id, {"nome": nome}))
+        return trainer
+    
+    def delete(self, trainer_id: int) -> bool:
+        """Deleta um treinador"""
+        with self._store.writing() as record:
+            deleted = self._inner.delete(trainer_id)
+            if deleted:
+                record(("d", trainer_id))
+        return deleted
+
+
+class DurablePokemonRepository(IDatabasePokemon):
+    """Repositório de pokémon em memória com log + snapshot em disco"""
+    
+    def __init__(self, inner: IDatabasePokemon, directory: str, compact_every: int = 100_000):
+        self._inner = inner
+        # Escritas serializadas por treinador (o treinador de um pokémon não muda)
+        self._store = _DurableStore(inner, directory, "pokemons", compact_every)
+    
+    def compact(self) -> None:
+        """Compacta o log em um snapshot"""
+        self._store.compact()
+    
+    def close(self) -> None:
+        """Grava o que estiver pendente e fecha o log"""
+        self._store.close()
+    
+    def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon"""
+        with self._store.writing(treinador_id) as record:
+            pokemon = self._inner.create(nome, tipo, nivel, treinador_id)
+            record(("c", [pokemon]))
+        return pokemon
+    
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon (um único registro no log)"""
+        with self._store.writing(*{p["treinador_id"] for p in pokemons}) as record:
+            created = self._inner.create_many(pokemons)
+            record(("c", created))
+        return created
+    
+    def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID"""
+        return self._inner.get(pokemon_id)
+    
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon por ID"""
+        return self._inner.get_many(pokemon_ids)
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        return self._inner.list_all()
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return self._inner.list_page(limit, cursor)
+    
+    def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador"""
+        return self._inner.get_by_trainer(treinador_id)
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pokémon filtrados e ordenados"""
+        return self._inner.find(tipo, nivel_min, nivel_max, treinador_id, sort, limit, after)
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido"""
+        return self._inner.get_summaries(treinador_ids)
+    
+    def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon"""
+        changes = {key: value for key, value in (("nome", nome), ("tipo", tipo), ("nivel", nivel)) if value is not None}
+        current = self._inner.get(pokemon_id)
+        if current is None:
+            return None
+        with self._store.writing(current["treinador_id"]) as record:
+            pokemon = self._inner.update(pokemon_id, **changes)
+            if pokemon is not None:
+                record(("u", pokemon_id, changes))
+        return pokemon
+    
+    def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        current = self._inner.get(pokemon_id)
+        if current is None:
+            return False
+        with self._store.writing(current["treinador_id"]) as record:
+            deleted = self._inner.delete(pokemon_id)
+            if deleted:
+                record(("d", pokemon_id))
+        return deleted
+    
+    def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador"""
+        with self._store.writing(treinador_id) as record:
+            count = self._inner.delete_by_trainer(treinador_id)
+            if count:
+                record(("t", treinador_id))
+        return count
@@ -4,10 +4,22 @@ Implementa as interfaces de banco de dados usando Amazon DynamoDB.
 Os dados são persistidos permanentemente.
 """
 import boto3
+import heapq
 import os
-from typing import Optional
-from botocore.exceptions import ClientError
-from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Iterator, Optional
+from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from app import metrics
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon, IDatabaseJob
+from app.repositories.cursor import encode_cursor, decode_cursor
+from app.repositories.query import check_sort, matches, order
+from app.repositories.summary import build_summary
 
 
 # Configuração do DynamoDB
@@ -15,31 +27,344 @@ REGION = os.environ.get("AWS_REGION", "us-east-1")
 STAGE = os.environ.get("STAGE", "dev")
 ENDPOINT_URL = os.environ.get("DYNAMODB_ENDPOINT", None)
 
+# Configuração do cliente HTTP compartilhado
+MAX_POOL_CONNECTIONS = int(os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS", "50"))
+RETRY_MODE = os.environ.get("DYNAMODB_RETRY_MODE", "standard")
+MAX_ATTEMPTS = int(os.environ.get("DYNAMODB_MAX_ATTEMPTS", "5"))
+
+# IDs reservados por incremento do contador (1 = sequência sem lacunas)
+TRAINER_ID_BLOCK_SIZE = int(os.environ.get("TRAINER_ID_BLOCK_SIZE", "1"))
+POKEMON_ID_BLOCK_SIZE = int(os.environ.get("POKEMON_ID_BLOCK_SIZE", "1"))
+
 # Nomes das tabelas
 TRAINERS_TABLE = f"pokedex-trainers-{STAGE}"
 POKEMONS_TABLE = f"pokedex-pokemons-{STAGE}"
 COUNTERS_TABLE = f"pokedex-counters-{STAGE}"
 
+# Índices secundários globais (GSI) da tabela de pokémon
+TRAINER_INDEX = "treinador_id-index"
+TYPE_LEVEL_INDEX = "tipo-nivel_id-index"
+LEVEL_INDEX = "nivel_particao-nivel_id-index"
+
+# Partições do GSI de nível (nivel_particao = id % N): evita uma partição quente
+# com todos os itens; buscas só por nível consultam as N em paralelo
+LEVEL_INDEX_PARTITIONS = 10
+
+# Chave de ordenação dos GSIs de nível: nivel_id = nivel * fator + id, em ordem
+# (nível, ID), então empates de nível também saem em ordem (IDs abaixo de 10^12)
+NIVEL_ID_FACTOR = 10 ** 12
+
+# Contadores do resumo de cada treinador: um item por treinador na tabela de
+# contadores, com um atributo por nível ("n#10") e por tipo ("t#Fogo") somados com ADD
+SUMMARY_PREFIX = "resumo#"
+
+# Jobs em segundo plano: um item por job na tabela de contadores, removido pelo
+# TTL do DynamoDB (atributo expira_em) depois de JOB_TTL_SECONDS
+JOB_PREFIX = "job#"
+JOB_TTL_SECONDS = 7 * 24 * 3600
+
+# Limites por chamada BatchGetItem / BatchWriteItem / TransactWriteItems
+BATCH_GET_SIZE = 100
+BATCH_WRITE_SIZE = 25
+TRANSACT_MAX_ITEMS = 100
+
+# Segundos até consultar de novo um GSI que a tabela não tinha (ela pode ter sido migrada)
+INDEX_RETRY_SECONDS = float(os.environ.get("DYNAMODB_INDEX_RETRY_SECONDS", "300"))
+
+
+# Recurso único (e seu pool de conexões) compartilhado por todos os repositórios
+_resource = None
+_resource_lock = threading.Lock()
+
 
 def _get_dynamodb_resource():
-    """Retorna recurso DynamoDB (local ou AWS)"""
-    if ENDPOINT_URL:
-        return boto3.resource("dynamodb", region_name=REGION, endpoint_url=ENDPOINT_URL)
-    return boto3.resource("dynamodb", region_name=REGION)
+    """Retorna recurso DynamoDB (local ou AWS), criado uma única vez"""
+    global _resource
+    if _resource is None:
+        with _resource_lock:
+            if _resource is None:
+                config = Config(
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=True,
+                    retries={"mode": RETRY_MODE, "max_attempts": MAX_ATTEMPTS}
+                )
+                session = boto3.session.Session(region_name=REGION)
+                _resource = session.resource("dynamodb", endpoint_url=ENDPOINT_URL, config=config)
+                if metrics.enabled():
+                    _register_metrics_hooks(_resource.meta.client.meta.events)
+    return _resource
 
 
-def _get_next_id(entity: str) -> int:
-    """Gera próximo ID usando contador atômico no DynamoDB"""
+def _request_consumed_capacity(params: dict, model, **kwargs) -> None:
+    """Pede a capacidade consumida em toda operação que a informa"""
+    if "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _record_call(parsed: dict, model, **kwargs) -> None:
+    """Conta a chamada e a capacidade consumida (inclusive em respostas de erro)"""
+    metrics.record_dynamodb_call(model.name, parsed.get("ConsumedCapacity"))
+
+
+def _register_metrics_hooks(events) -> None:
+    """Liga as métricas de chamadas/capacidade aos eventos do cliente boto3"""
+    events.register("provide-client-params.dynamodb", _request_consumed_capacity)
+    events.register("after-call.dynamodb", _record_call)
+
+
+def _collect_pages(operation, limit: Optional[int] = None, **kwargs) -> list[dict]:
+    """Executa scan/query seguindo LastEvaluatedKey até a última página (ou até ter `limit` itens)"""
+    if limit is not None and "FilterExpression" not in kwargs:
+        # Sem filtro, o Limit da chamada já é o número de itens devolvidos
+        kwargs["Limit"] = limit
+    items = []
+    while True:
+        response = operation(**kwargs)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response or (limit is not None and len(items) >= limit):
+            return items
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _index_attributes(item: dict) -> dict:
+    """Atributos gravados só para as chaves dos GSIs de nível"""
+    return {
+        "nivel_particao": item["id"] % LEVEL_INDEX_PARTITIONS,
+        "nivel_id": item["nivel"] * NIVEL_ID_FACTOR + item["id"]
+    }
+
+
+def _level_key(nivel_min: Optional[int], nivel_max: Optional[int], after: Optional[tuple[int, int]] = None):
+    """Condição de chave sobre nivel_id para a faixa de nível (só depois de `after` (nível, ID), se dado), ou None"""
+    low = None if nivel_min is None else nivel_min * NIVEL_ID_FACTOR
+    if after is not None:
+        start = after[0] * NIVEL_ID_FACTOR + after[1] + 1
+        low = start if low is None else max(low, start)
+    high = None if nivel_max is None else (nivel_max + 1) * NIVEL_ID_FACTOR - 1
+    if low is not None and high is not None:
+        return Key("nivel_id").between(low, high)
+    if low is not None:
+        return Key("nivel_id").gte(low)
+    if high is not None:
+        return Key("nivel_id").lte(high)
+    return None
+
+
+def _find_filter(tipo: Optional[str], nivel_min: Optional[int], nivel_max: Optional[int], treinador_id: Optional[int]) -> dict:
+    """FilterExpression do scan de fallback do find"""
+    conditions = []
+    if tipo is not None:
+        conditions.append(Attr("tipo").eq(tipo))
+    if nivel_min is not None:
+        conditions.append(Attr("nivel").gte(nivel_min))
+    if nivel_max is not None:
+        conditions.append(Attr("nivel").lte(nivel_max))
+    if treinador_id is not None:
+        conditions.append(Attr("treinador_id").eq(treinador_id))
+    if not conditions:
+        return {}
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return {"FilterExpression": expression}
+
+
+def _scan_page(table, limit: int, cursor: Optional[str]) -> tuple[list[dict], Optional[str]]:
+    """Lê uma única página do scan (no máximo `limit` itens)"""
+    kwargs = {"Limit": limit}
+    start_id = decode_cursor(cursor)
+    if start_id is not None:
+        kwargs["ExclusiveStartKey"] = {"id": start_id}
+    response = table.scan(**kwargs)
+    last_key = response.get("LastEvaluatedKey")
+    next_cursor = encode_cursor(last_key["id"]) if last_key else None
+    return response.get("Items", []), next_cursor
+
+
+def _batch_get_keys(dynamodb, table_name: str, keys: list[dict], consistent: bool = False) -> list[dict]:
+    """Busca itens por chave via BatchGetItem (lotes de 100, reenviando chaves não processadas)"""
+    items = []
+    for start in range(0, len(keys), BATCH_GET_SIZE):
+        request = {table_name: {"Keys": keys[start:start + BATCH_GET_SIZE], "ConsistentRead": consistent}}
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get("Responses", {}).get(table_name, []))
+            request = response.get("UnprocessedKeys") or None
+    return items
+
+
+def _batch_get(dynamodb, table_name: str, ids: list[int], consistent: bool = False) -> dict[int, dict]:
+    """Busca itens por ID via BatchGetItem"""
+    keys = [{"id": item_id} for item_id in dict.fromkeys(ids)]
+    return {int(item["id"]): item for item in _batch_get_keys(dynamodb, table_name, keys, consistent)}
+
+
+def _batch_put(table, items: list[dict]) -> None:
+    """Grava itens via BatchWriteItem (o batch_writer agrupa de 25 em 25 e reenvia os não processados)"""
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+
+
+def _summary_deltas(item: dict, delta: int, deltas: Optional[dict] = None) -> dict[int, dict[str, int]]:
+    """Acumula em `deltas` (treinador → atributo → delta) a contagem do pokémon"""
+    deltas = {} if deltas is None else deltas
+    counts = deltas.setdefault(int(item["treinador_id"]), {})
+    for name in (f"n#{int(item['nivel'])}", f"t#{item['tipo']}"):
+        counts[name] = counts.get(name, 0) + delta
+    return deltas
+
+
+def _summary_update(treinador_id: int, counts: dict[str, int]) -> Optional[dict]:
+    """Parâmetros do update com ADD atômico em todos os contadores do treinador (None sem deltas)"""
+    counts = {name: delta for name, delta in counts.items() if delta}
+    if not counts:
+        return None
+    placeholders = range(len(counts))
+    return {
+        "Key": {"entity": f"{SUMMARY_PREFIX}{treinador_id}"},
+        "UpdateExpression": "ADD " + ", ".join(f"#c{i} :c{i}" for i in placeholders),
+        "ExpressionAttributeNames": {f"#c{i}": name for i, name in zip(placeholders, counts)},
+        "ExpressionAttributeValues": {f":c{i}": delta for i, delta in zip(placeholders, counts.values())}
+    }
+
+
+def _summary_operations(deltas: dict[int, dict[str, int]]) -> list[dict]:
+    """Operações de TransactWriteItems com o ADD dos deltas de cada treinador"""
+    operations = []
+    for treinador_id, counts in deltas.items():
+        update = _summary_update(treinador_id, counts)
+        if update is not None:
+            operations.append({"Update": {"TableName": COUNTERS_TABLE, **update}})
+    return operations
+
+
+def _summary_chunks(items: list[dict], delta: int) -> Iterator[tuple[list[dict], dict[int, dict[str, int]]]]:
+    """
+    Divide os itens em grupos que cabem numa TransactWriteItems junto com um
+    update de contadores por treinador (uma transação não toca o mesmo item duas vezes)
+    """
+    chunk, deltas = [], {}
+    for item in items:
+        trainers = len(deltas) + (int(item["treinador_id"]) not in deltas)
+        if chunk and len(chunk) + 1 + trainers > TRANSACT_MAX_ITEMS:
+            yield chunk, deltas
+            chunk, deltas = [], {}
+        chunk.append(item)
+        _summary_deltas(item, delta, deltas)
+    if chunk:
+        yield chunk, deltas
+
+
+def _transact(dynamodb, operations: list[dict]) -> Optional[list[dict]]:
+    """
+    Executa a TransactWriteItems: ou todas as operações valem, ou nenhuma.
+    O token de idempotência faz uma retentativa do SDK (resposta perdida) não
+    aplicar a transação de novo; cancelamentos por conflito com outra transação
+    são repetidos com backoff. Retorna None se ela valeu, ou os motivos do
+    cancelamento (um por operação) se alguma condição não valeu.
+    """
+    attempt = 0
+    while True:
+        try:
+            # O cliente do resource já converte os valores para o formato tipado
+            dynamodb.meta.client.transact_write_items(TransactItems=operations, ClientRequestToken=str(uuid.uuid4()))
+            return None
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            reasons = e.response.get("CancellationReasons") or []
+            codes = {reason.get("Code") for reason in reasons}
+            if "ConditionalCheckFailed" in codes:
+                return reasons
+            attempt += 1
+            if "TransactionConflict" not in codes or attempt >= MAX_ATTEMPTS:
+                raise
+            time.sleep(min(0.05 * 2 ** attempt, 1.0))
+
+
+def _write_with_summaries(dynamodb, kind: str, params: dict, deltas: dict[int, dict[str, int]]) -> bool:
+    """
+    Escreve o pokémon e soma os deltas do resumo numa única TransactWriteItems:
+    ou as duas escritas valem, ou nenhuma (o resumo não diverge se uma falhar).
+    False se a condição da escrita do pokémon não valeu.
+    """
+    operations = [{kind: {"TableName": POKEMONS_TABLE, **params}}] + _summary_operations(deltas)
+    return _transact(dynamodb, operations) is None
+
+
+def _reserve_ids(entity: str, count: int) -> range:
+    """Reserva um bloco de `count` IDs com um único incremento atômico"""
     dynamodb = _get_dynamodb_resource()
     table = dynamodb.Table(COUNTERS_TABLE)
     
     response = table.update_item(
         Key={"entity": entity},
         UpdateExpression="SET current_id = if_not_exists(current_id, :start) + :inc",
-        ExpressionAttributeValues={":start": 0, ":inc": 1},
+        ExpressionAttributeValues={":start": 0, ":inc": count},
         ReturnValues="UPDATED_NEW"
     )
-    return int(response["Attributes"]["current_id"])
+    last_id = int(response["Attributes"]["current_id"])
+    return range(last_id - count + 1, last_id + 1)
+
+
+class IdAllocator:
+    """
+    Entrega IDs localmente a partir de blocos reservados no contador atômico.
+    Cada bloco custa um único update_item; IDs de um bloco não usado (ex.: queda
+    da Lambda) viram lacunas na sequência, mas nunca são repetidos.
+    """
+    
+    def __init__(self, entity: str, block_size: int):
+        self._entity = entity
+        self._block_size = max(1, block_size)
+        self._lock = threading.Lock()
+        self._block = range(0)
+        self._position = 0
+    
+    def next_id(self) -> int:
+        """Retorna o próximo ID do bloco atual, reservando outro quando acabar"""
+        with self._lock:
+            if self._position >= len(self._block):
+                self._block = _reserve_ids(self._entity, self._block_size)
+                self._position = 0
+            new_id = self._block[self._position]
+            self._position += 1
+            return new_id
+    
+    def reserve(self, count: int) -> range:
+        """Reserva `count` IDs contíguos direto no contador (criação em massa)"""
+        return _reserve_ids(self._entity, count)
+
+
+_allocators = {
+    "trainer": IdAllocator("trainer", TRAINER_ID_BLOCK_SIZE),
+    "pokemon": IdAllocator("pokemon", POKEMON_ID_BLOCK_SIZE)
+}
+
+
+def _get_next_id(entity: str) -> int:
+    """Gera próximo ID usando o alocador em blocos da entidade"""
+    return _allocators[entity].next_id()
+
+
+def warm_up(connections: int) -> None:
+    """
+    Pré-aquecimento (fase de init da Lambda): cria o cliente, resolve as
+    credenciais e abre `connections` conexões TLS no pool com leituras
+    concorrentes de uma chave inexistente. Falhas são ignoradas: a primeira
+    requisição real repete o caminho e reporta o erro.
+    """
+    table = _get_dynamodb_resource().Table(COUNTERS_TABLE)
+    
+    def touch(_):
+        try:
+            table.get_item(Key={"entity": "__warm_up__"}, ProjectionExpression="entity")
+        except (BotoCoreError, ClientError):
+            pass
+    
+    with ThreadPoolExecutor(max_workers=max(1, connections)) as pool:
+        list(pool.map(touch, range(max(1, connections))))
 
 
 class DynamoDBTrainerRepository(IDatabaseTrainer):
@@ -56,15 +381,31 @@ class DynamoDBTrainerRepository(IDatabaseTrainer):
         self._table.put_item(Item=item)
         return item
     
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores com um bloco de IDs e BatchWriteItem"""
+        if not nomes:
+            return []
+        ids = _allocators["trainer"].reserve(len(nomes))
+        items = [{"id": trainer_id, "nome": nome} for trainer_id, nome in zip(ids, nomes)]
+        _batch_put(self._table, items)
+        return items
+    
     def get(self, trainer_id: int) -> Optional[dict]:
         """Busca treinador por ID"""
         response = self._table.get_item(Key={"id": trainer_id})
         return response.get("Item")
     
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores via BatchGetItem"""
+        return _batch_get(self._dynamodb, TRAINERS_TABLE, trainer_ids)
+    
     def list_all(self) -> list[dict]:
-        """Lista todos os treinadores"""
-        response = self._table.scan()
-        return response.get("Items", [])
+        """Lista todos os treinadores (scan da tabela inteira: as rotas usam list_page)"""
+        return _collect_pages(self._table.scan)
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return _scan_page(self._table, limit, cursor)
     
     def update(self, trainer_id: int, nome: str) -> Optional[dict]:
         """Atualiza um treinador"""
@@ -102,6 +443,8 @@ class DynamoDBPokemonRepository(IDatabasePokemon):
     def __init__(self):
         self._dynamodb = _get_dynamodb_resource()
         self._table = self._dynamodb.Table(POKEMONS_TABLE)
+        # GSIs que a tabela ainda não tem → instante da próxima tentativa (até lá, scan)
+        self._missing_indexes: dict[str, float] = {}
     
     def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
         """Cria um novo pokémon"""
@@ -113,26 +456,215 @@ class DynamoDBPokemonRepository(IDatabasePokemon):
             "nivel": nivel,
             "treinador_id": treinador_id
         }
-        self._table.put_item(Item=item)
+        _write_with_summaries(self._dynamodb, "Put", {"Item": {**item, **_index_attributes(item)}}, _summary_deltas(item, 1))
         return item
     
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """
+        Cria vários pokémon com um bloco de IDs, em TransactWriteItems de até
+        TRANSACT_MAX_ITEMS operações: cada grupo grava os seus itens e soma os
+        contadores dos seus treinadores na mesma transação.
+        """
+        if not pokemons:
+            return []
+        ids = _allocators["pokemon"].reserve(len(pokemons))
+        items = [
+            {
+                "id": pokemon_id,
+                "nome": p["nome"],
+                "tipo": p["tipo"],
+                "nivel": p["nivel"],
+                "treinador_id": p["treinador_id"]
+            }
+            for pokemon_id, p in zip(ids, pokemons)
+        ]
+        # Os grupos vão em sequência: em paralelo disputariam o item de contadores do treinador
+        for chunk, deltas in _summary_chunks(items, 1):
+            operations = [
+                {"Put": {
+                    "TableName": POKEMONS_TABLE,
+                    "Item": {**item, **_index_attributes(item)},
+                    "ConditionExpression": "attribute_not_exists(id)"
+                }}
+                for item in chunk
+            ]
+            if _transact(self._dynamodb, operations + _summary_operations(deltas)) is not None:
+                raise RuntimeError("IDs reservados para o lote já estavam em uso")
+        return items
+    
     def get(self, pokemon_id: int) -> Optional[dict]:
         """Busca pokémon por ID"""
         response = self._table.get_item(Key={"id": pokemon_id})
         return response.get("Item")
     
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon via BatchGetItem"""
+        return _batch_get(self._dynamodb, POKEMONS_TABLE, pokemon_ids)
+    
     def list_all(self) -> list[dict]:
-        """Lista todos os pokémon"""
-        response = self._table.scan()
-        return response.get("Items", [])
+        """Lista todos os pokémon (scan da tabela inteira: as rotas usam list_page)"""
+        return _collect_pages(self._table.scan)
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return _scan_page(self._table, limit, cursor)
     
     def get_by_trainer(self, treinador_id: int) -> list[dict]:
         """Lista pokémon de um treinador"""
-        response = self._table.scan(
-            FilterExpression="treinador_id = :tid",
-            ExpressionAttributeValues={":tid": treinador_id}
+        if self._index_available(TRAINER_INDEX):
+            try:
+                return self._query_by_trainer(treinador_id)
+            except ClientError as e:
+                if not self._index_missing(TRAINER_INDEX, e):
+                    raise
+        return self._scan_by_trainer(treinador_id)
+    
+    def _index_available(self, index: str) -> bool:
+        """False enquanto o GSI estiver marcado como ausente; vencido o prazo, tenta de novo"""
+        retry_at = self._missing_indexes.get(index)
+        if retry_at is None:
+            return True
+        if time.monotonic() < retry_at:
+            return False
+        self._missing_indexes.pop(index, None)
+        return True
+    
+    def _index_missing(self, index: str, error: ClientError) -> bool:
+        """Se o erro é de GSI inexistente, marca o índice como ausente por INDEX_RETRY_SECONDS"""
+        if error.response["Error"]["Code"] not in ("ValidationException", "ResourceNotFoundException"):
+            return False
+        self._missing_indexes[index] = time.monotonic() + INDEX_RETRY_SECONDS
+        return True
+    
+    def _query_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Consulta paginada no GSI treinador_id"""
+        return _collect_pages(
+            self._table.query,
+            IndexName=TRAINER_INDEX,
+            KeyConditionExpression=Key("treinador_id").eq(treinador_id)
+        )
+    
+    def _scan_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Scan paginado com filtro (fallback sem GSI)"""
+        return _collect_pages(
+            self._table.scan,
+            FilterExpression=Attr("treinador_id").eq(treinador_id)
         )
-        return response.get("Items", [])
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """
+        Busca pelo GSI mais seletivo: treinador, tipo + nível ou nível (particionado).
+        Com sort por nível os GSIs já devolvem em ordem (nível, ID) e a leitura para
+        no limite (os K maiores custam O(K)) e retoma de `after` pela chave nivel_id;
+        sem o GSI na tabela, usa scan com filtro.
+        """
+        check_sort(sort, tipo, treinador_id)
+        by_level = sort in ("nivel", "-nivel")
+        bound = limit if by_level else None
+        items = None
+        if treinador_id is not None:
+            items = [p for p in self.get_by_trainer(treinador_id) if matches(p, tipo, nivel_min, nivel_max, treinador_id)]
+        elif by_level and after is not None and sort == "-nivel":
+            # Em ordem decrescente os empates vêm por ID crescente: primeiro o resto do
+            # nível da posição, depois os níveis abaixo dele
+            level, _ = after
+            in_range = (nivel_min is None or level >= nivel_min) and (nivel_max is None or level <= nivel_max)
+            items = self._query_by_level(tipo, level, level, False, bound, after) if in_range else []
+            if items is not None and (bound is None or len(items) < bound):
+                below = level - 1 if nivel_max is None else min(nivel_max, level - 1)
+                rest = [] if nivel_min is not None and below < nivel_min else self._query_in_order(
+                    tipo, nivel_min, below, True, None if bound is None else bound - len(items)
+                )
+                items = None if rest is None else items + rest
+        elif tipo is not None or nivel_min is not None or nivel_max is not None or by_level:
+            items = self._query_in_order(tipo, nivel_min, nivel_max, sort == "-nivel", bound, after if by_level else None)
+        if items is None:
+            items = _collect_pages(self._table.scan, **_find_filter(tipo, nivel_min, nivel_max, treinador_id))
+        return order(items, sort, limit, after)
+    
+    def _query_in_order(
+        self,
+        tipo: Optional[str],
+        nivel_min: Optional[int],
+        nivel_max: Optional[int],
+        descending: bool,
+        limit: Optional[int],
+        after: Optional[tuple[int, int]] = None
+    ) -> Optional[list[dict]]:
+        """Itens da faixa em ordem (nível, ID) crescente ou (nível decrescente, ID); None sem o GSI"""
+        items = self._query_by_level(tipo, nivel_min, nivel_max, descending, limit, after)
+        if items is not None and descending and limit is not None and len(items) >= limit:
+            # Em ordem decrescente os empates do nível da borda vêm do maior ID para o
+            # menor: relê só esse nível em ordem crescente, quantos itens faltarem
+            edge = items[limit - 1]["nivel"]
+            above = [p for p in items[:limit] if p["nivel"] != edge]
+            edge_items = self._query_by_level(tipo, edge, edge, False, limit - len(above))
+            if edge_items is None:
+                return None
+            items = above + edge_items
+        return items
+    
+    def _query_by_level(
+        self,
+        tipo: Optional[str],
+        nivel_min: Optional[int],
+        nivel_max: Optional[int],
+        descending: bool,
+        limit: Optional[int],
+        after: Optional[tuple[int, int]] = None
+    ) -> Optional[list[dict]]:
+        """Itens em ordem de nivel_id pelo GSI de tipo (ou pelas partições do GSI de nível); None sem o GSI"""
+        level = _level_key(nivel_min, nivel_max, after)
+        if tipo is not None:
+            condition = Key("tipo").eq(tipo)
+            return self._query_index(TYPE_LEVEL_INDEX, limit, condition if level is None else condition & level, descending)
+        
+        def query(partition: int) -> Optional[list[dict]]:
+            condition = Key("nivel_particao").eq(partition)
+            return self._query_index(LEVEL_INDEX, limit, condition if level is None else condition & level, descending)
+        
+        with ThreadPoolExecutor(max_workers=LEVEL_INDEX_PARTITIONS) as pool:
+            partitions = list(pool.map(query, range(LEVEL_INDEX_PARTITIONS)))
+        if any(items is None for items in partitions):
+            return None
+        merged = heapq.merge(*partitions, key=itemgetter("nivel_id"), reverse=descending)
+        return list(merged)
+    
+    def _query_index(self, index: str, limit: Optional[int], condition, descending: bool) -> Optional[list[dict]]:
+        """Consulta paginada em um GSI do find; None se a tabela ainda não tiver o índice"""
+        if not self._index_available(index):
+            return None
+        try:
+            return _collect_pages(
+                self._table.query,
+                limit=limit,
+                IndexName=index,
+                KeyConditionExpression=condition,
+                ScanIndexForward=not descending
+            )
+        except ClientError as e:
+            if not self._index_missing(index, e):
+                raise
+            return None
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido: BatchGetItem nos itens de contadores, sem scan"""
+        keys = [{"entity": f"{SUMMARY_PREFIX}{tid}"} for tid in dict.fromkeys(treinador_ids)]
+        found = {}
+        for item in _batch_get_keys(self._dynamodb, COUNTERS_TABLE, keys):
+            levels = {int(name[2:]): count for name, count in item.items() if name.startswith("n#")}
+            types = {name[2:]: count for name, count in item.items() if name.startswith("t#")}
+            found[int(item["entity"][len(SUMMARY_PREFIX):])] = (levels, types)
+        return {tid: build_summary(tid, *found.get(tid, ({}, {}))) for tid in dict.fromkeys(treinador_ids)}
     
     def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
         """Atualiza um pokémon"""
@@ -148,42 +680,116 @@ class DynamoDBPokemonRepository(IDatabasePokemon):
         if nivel is not None:
             update_parts.append("nivel = :nivel")
             values[":nivel"] = nivel
+            update_parts.append("nivel_id = :nivel_id")
+            values[":nivel_id"] = nivel * NIVEL_ID_FACTOR + pokemon_id
         
         if not update_parts:
             return self.get(pokemon_id)
         
-        try:
-            response = self._table.update_item(
-                Key={"id": pokemon_id},
-                UpdateExpression="SET " + ", ".join(update_parts),
-                ExpressionAttributeValues=values,
-                ConditionExpression="attribute_exists(id)",
-                ReturnValues="ALL_NEW"
-            )
-            return response.get("Attributes")
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+        if tipo is None and nivel is None:
+            # Só o nome: o resumo não muda
+            try:
+                response = self._table.update_item(
+                    Key={"id": pokemon_id},
+                    UpdateExpression="SET " + ", ".join(update_parts),
+                    ExpressionAttributeValues=values,
+                    ConditionExpression="attribute_exists(id)",
+                    ReturnValues="ALL_NEW"
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                    return None
+                raise
+            return response["Attributes"]
+        
+        while True:
+            # A escrita só vale se tipo e nível ainda são os lidos (senão os deltas sairiam errados)
+            previous = self._table.get_item(Key={"id": pokemon_id}, ConsistentRead=True).get("Item")
+            if previous is None:
                 return None
-            raise
+            updated = {**previous, **{name[1:]: value for name, value in values.items()}}
+            params = {
+                "Key": {"id": pokemon_id},
+                "UpdateExpression": "SET " + ", ".join(update_parts),
+                "ConditionExpression": "tipo = :tipo_anterior AND nivel = :nivel_anterior",
+                "ExpressionAttributeValues": {**values, ":tipo_anterior": previous["tipo"], ":nivel_anterior": previous["nivel"]}
+            }
+            if _write_with_summaries(self._dynamodb, "Update", params, _summary_deltas(updated, 1, _summary_deltas(previous, -1))):
+                return updated
     
     def delete(self, pokemon_id: int) -> bool:
         """Deleta um pokémon"""
-        try:
-            self._table.delete_item(
-                Key={"id": pokemon_id},
-                ConditionExpression="attribute_exists(id)"
-            )
-            return True
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+        while True:
+            # Como no update: só apaga o pokémon com o tipo e o nível descontados do resumo
+            current = self._table.get_item(Key={"id": pokemon_id}, ConsistentRead=True).get("Item")
+            if current is None:
                 return False
-            raise
+            params = {
+                "Key": {"id": pokemon_id},
+                "ConditionExpression": "tipo = :tipo AND nivel = :nivel",
+                "ExpressionAttributeValues": {":tipo": current["tipo"], ":nivel": current["nivel"]}
+            }
+            if _write_with_summaries(self._dynamodb, "Delete", params, _summary_deltas(current, -1)):
+                return True
     
     def delete_by_trainer(self, treinador_id: int) -> int:
-        """Deleta todos os pokémon de um treinador"""
-        pokemons = self.get_by_trainer(treinador_id)
-        count = 0
-        for pokemon in pokemons:
-            if self.delete(int(pokemon["id"])):
-                count += 1
-        return count
+        """
+        Deleta todos os pokémon de um treinador, em TransactWriteItems de até
+        TRANSACT_MAX_ITEMS operações: cada grupo apaga os seus itens e desconta o
+        resumo na mesma transação. Cada exclusão só vale se o item ainda existe
+        com o treinador, o tipo e o nível descontados; se outra escrita chegou
+        antes (exclusão concorrente, retentativa, update), a transação inteira é
+        cancelada e o grupo é relido e tentado de novo, sem descontar duas vezes.
+        O GSI é eventualmente consistente: a releitura consistente por chave
+        descarta os itens que já não existem (pokémon criados em paralelo
+        mantêm a contagem).
+        """
+        ids = [int(pokemon["id"]) for pokemon in self.get_by_trainer(treinador_id)]
+        deleted = 0
+        while ids:
+            pending = [
+                pokemon for pokemon in _batch_get(self._dynamodb, POKEMONS_TABLE, ids, consistent=True).values()
+                if pokemon["treinador_id"] == treinador_id
+            ]
+            ids = []
+            for chunk, deltas in _summary_chunks(pending, -1):
+                operations = [
+                    {"Delete": {
+                        "TableName": POKEMONS_TABLE,
+                        "Key": {"id": pokemon["id"]},
+                        "ConditionExpression": "treinador_id = :treinador AND tipo = :tipo AND nivel = :nivel",
+                        "ExpressionAttributeValues": {
+                            ":treinador": pokemon["treinador_id"], ":tipo": pokemon["tipo"], ":nivel": pokemon["nivel"]
+                        }
+                    }}
+                    for pokemon in chunk
+                ]
+                if _transact(self._dynamodb, operations + _summary_operations(deltas)) is None:
+                    deleted += len(chunk)
+                else:
+                    ids.extend(int(pokemon["id"]) for pokemon in chunk)
+        return deleted
+
+
+class DynamoDBJobRepository(IDatabaseJob):
+    """Jobs na tabela de contadores: visíveis a todas as instâncias da API e à função de jobs"""
+    
+    def __init__(self):
+        self._table = _get_dynamodb_resource().Table(COUNTERS_TABLE)
+    
+    def save(self, job: dict) -> None:
+        """Grava o job (atributos None ficam de fora) com a expiração do TTL"""
+        item = {name: value for name, value in job.items() if value is not None}
+        item["entity"] = f"{JOB_PREFIX}{job['id']}"
+        item["expira_em"] = int(time.time()) + JOB_TTL_SECONDS
+        self._table.put_item(Item=item)
+    
+    def get(self, job_id: str) -> Optional[dict]:
+        """Busca job por ID (leitura consistente: o status muda em outra instância)"""
+        response = self._table.get_item(Key={"entity": f"{JOB_PREFIX}{job_id}"}, ConsistentRead=True)
+        item = response.get("Item")
+        if item is None:
+            return None
+        item.pop("entity")
+        item.pop("expira_em", None)
+        return item
@@ -0,0 +1,133 @@
+"""
+Repositórios instrumentados.
+Envolvem qualquer implementação das interfaces e registram a latência de cada
+método no histograma pokedex_repository_call_duration_seconds (com amostragem).
+"""
+import time
+from typing import Optional
+from app import metrics
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+
+
+class _Timer:
+    """Cronometra chamadas de um repositório com rótulos fixos de backend/repositório"""
+    
+    def __init__(self, backend: str, repository: str):
+        self._backend = backend
+        self._repository = repository
+    
+    def call(self, operation: str, method, *args, **kwargs):
+        if not metrics.sampled():
+            return method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.REPOSITORY_LATENCY.observe(
+                (self._backend, self._repository, operation), time.perf_counter() - start
+            )
+
+
+class InstrumentedTrainerRepository(IDatabaseTrainer):
+    """Mede a latência de cada método de um repositório de treinadores"""
+    
+    def __init__(self, inner: IDatabaseTrainer, backend: str):
+        self._inner = inner
+        self._timer = _Timer(backend, "treinadores")
+    
+    def create(self, nome: str) -> dict:
+        """Cria um novo treinador"""
+        return self._timer.call("create", self._inner.create, nome)
+    
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores"""
+        return self._timer.call("create_many", self._inner.create_many, nomes)
+    
+    def get(self, trainer_id: int) -> Optional[dict]:
+        """Busca treinador por ID"""
+        return self._timer.call("get", self._inner.get, trainer_id)
+    
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores por ID"""
+        return self._timer.call("get_many", self._inner.get_many, trainer_ids)
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os treinadores"""
+        return self._timer.call("list_all", self._inner.list_all)
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return self._timer.call("list_page", self._inner.list_page, limit, cursor)
+    
+    def update(self, trainer_id: int, nome: str) -> Optional[dict]:
+        """Atualiza um treinador"""
+        return self._timer.call("update", self._inner.update, trainer_id, nome)
+    
+    def delete(self, trainer_id: int) -> bool:
+        """Deleta um treinador"""
+        return self._timer.call("delete", self._inner.delete, trainer_id)
+
+
+class InstrumentedPokemonRepository(IDatabasePokemon):
+    """Mede a latência de cada método de um repositório de pokémon"""
+    
+    def __init__(self, inner: IDatabasePokemon, backend: str):
+        self._inner = inner
+        self._timer = _Timer(backend, "pokemons")
+    
+    def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon"""
+        return self._timer.call("create", self._inner.create, nome, tipo, nivel, treinador_id)
+    
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon"""
+        return self._timer.call("create_many", self._inner.create_many, pokemons)
+    
+    def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID"""
+        return self._timer.call("get", self._inner.get, pokemon_id)
+    
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon por ID"""
+        return self._timer.call("get_many", self._inner.get_many, pokemon_ids)
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        return self._timer.call("list_all", self._inner.list_all)
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return self._timer.call("list_page", self._inner.list_page, limit, cursor)
+    
+    def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador"""
+        return self._timer.call("get_by_trainer", self._inner.get_by_trainer, treinador_id)
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pokémon filtrados e ordenados"""
+        return self._timer.call("find", self._inner.find, tipo, nivel_min, nivel_max, treinador_id, sort, limit, after)
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido"""
+        return self._timer.call("get_summaries", self._inner.get_summaries, treinador_ids)
+    
+    def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon"""
+        return self._timer.call("update", self._inner.update, pokemon_id, nome, tipo, nivel)
+    
+    def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        return self._timer.call("delete", self._inner.delete, pokemon_id)
+    
+    def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador"""
+        return self._timer.call("delete_by_trainer", self._inner.delete_by_trainer, treinador_id)
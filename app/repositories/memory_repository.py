@@ -2,113 +2,625 @@
 Repositório em memória para desenvolvimento local.
 Implementa as interfaces de banco de dados usando dicionários Python.
 Os dados são perdidos ao reiniciar o servidor.
+
+Seguro para acesso concorrente: os itens ficam divididos em shards, cada um com
+seu lock (lock striping), então escritas em shards diferentes não disputam o
+mesmo lock. Os itens são substituídos (nunca alterados no lugar), o que deixa
+as leituras por ID sem lock. As escritas de pokémon passam ainda por um lock por
+faixa de treinador, para que item, índices e contadores mudem juntos.
+
+Buscas com filtro (find) usam índices mantidos a cada escrita: treinador → IDs,
+tipo → níveis → IDs e nível → IDs, com os níveis distintos em ordem.
 """
-from typing import Optional
-from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+import heapq
+import threading
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from operator import itemgetter
+from typing import Iterator, Optional
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon, IDatabaseJob
+from app.repositories.cursor import encode_cursor, decode_cursor
+from app.repositories.query import check_sort, matches, order
+from app.repositories.removed_trainers import RemovedTrainers
+from app.repositories.summary import TrainerAggregate, build_summary
 
 
-class MemoryTrainerRepository(IDatabaseTrainer):
-    """Repositório de Treinadores em memória"""
+# Quantidade padrão de shards (locks independentes) por repositório
+DEFAULT_SHARDS = 16
+
+# IDs copiados por vez ao percorrer um nível (o lock do índice fica livre entre os blocos)
+SCAN_CHUNK = 256
+
+# Quantidade de jobs mantidos para consulta (os mais antigos são descartados)
+MAX_JOBS = 1000
+
+
+class _ShardedStore:
+    """
+    Mapa id → item dividido em shards, cada um protegido pelo seu lock. Cada
+    shard mantém também os seus IDs em ordem, para a paginação por cursor.
+    """
     
-    def __init__(self):
-        self._db: dict[int, dict] = {}
-        self._counter = 0
+    def __init__(self, shards: int):
+        self._shards: list[dict[int, dict]] = [{} for _ in range(shards)]
+        self._keys: list[list[int]] = [[] for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._id_lock = threading.Lock()
+        self.last_id = 0
     
-    def _get_next_id(self) -> int:
+    def next_id(self) -> int:
         """Gera próximo ID único"""
-        self._counter += 1
-        return self._counter
+        with self._id_lock:
+            self.last_id += 1
+            return self.last_id
+    
+    def put_existing(self, item: dict) -> None:
+        """Grava um item que já tem ID (replay do log), mantendo o contador à frente"""
+        with self._id_lock:
+            self.last_id = max(self.last_id, item["id"])
+        self.put(item)
+    
+    def get(self, item_id: int) -> Optional[dict]:
+        """Leitura sem lock (itens nunca são alterados no lugar)"""
+        return self._shards[item_id % len(self._shards)].get(item_id)
+    
+    def put(self, item: dict) -> None:
+        """Grava o item no seu shard"""
+        index = item["id"] % len(self._shards)
+        with self._locks[index]:
+            if item["id"] not in self._shards[index]:
+                # IDs novos são os maiores: o insort só acrescenta no fim
+                insort(self._keys[index], item["id"])
+            self._shards[index][item["id"]] = item
+    
+    def replace(self, item_id: int, changes: dict) -> Optional[dict]:
+        """Substitui o item por uma cópia com as alterações (None se não existir)"""
+        return self.exchange(item_id, changes)[1]
+    
+    def exchange(self, item_id: int, changes: dict) -> tuple[Optional[dict], Optional[dict]]:
+        """Como replace(), mas retorna também a versão anterior (para atualizar índices)"""
+        index = item_id % len(self._shards)
+        with self._locks[index]:
+            current = self._shards[index].get(item_id)
+            if current is None:
+                return None, None
+            updated = {**current, **changes}
+            self._shards[index][item_id] = updated
+            return current, updated
+    
+    def pop(self, item_id: int) -> Optional[dict]:
+        """Remove e retorna o item (None se não existir)"""
+        index = item_id % len(self._shards)
+        with self._locks[index]:
+            item = self._shards[index].pop(item_id, None)
+            if item is not None:
+                keys = self._keys[index]
+                del keys[bisect_left(keys, item_id)]
+            return item
+    
+    def values(self) -> list[dict]:
+        """Todos os itens em ordem de ID"""
+        items = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                items.extend(shard.values())
+        items.sort(key=lambda item: item["id"])
+        return items
+    
+    def dump(self) -> dict:
+        """Imagem do conteúdo (itens agrupados por shard) para snapshot"""
+        parts = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                parts.append(list(shard.values()))
+        return {"last_id": self.last_id, "shards": parts}
+    
+    def load(self, image: dict) -> None:
+        """Substitui o conteúdo por uma imagem gerada por dump()"""
+        parts = image["shards"]
+        if len(parts) == len(self._shards):
+            shards = [{item["id"]: item for item in part} for part in parts]
+        else:
+            shards = [{} for _ in self._shards]
+            for part in parts:
+                for item in part:
+                    shards[item["id"] % len(shards)][item["id"]] = item
+        keys = [sorted(shard) for shard in shards]
+        with self._id_lock:
+            self._shards = shards
+            self._keys = keys
+            self.last_id = image["last_id"]
+    
+    def page(self, limit: int, cursor: Optional[str]) -> tuple[list[dict], Optional[str]]:
+        """
+        Próximos `limit` IDs existentes após o cursor: até limit + 1 IDs de cada
+        shard (bisect nas listas ordenadas), intercalados em ordem. Não depende
+        de quantos IDs já foram removidos nem copia a tabela inteira.
+        """
+        start = decode_cursor(cursor) or 0
+        parts = []
+        for keys, lock in zip(self._keys, self._locks):
+            with lock:
+                position = bisect_right(keys, start)
+                parts.append(keys[position:position + limit + 1])
+        ids = list(islice(heapq.merge(*parts), limit + 1))
+        has_more = len(ids) > limit
+        ids = ids[:limit]
+        # Um item removido em paralelo é só omitido; o cursor continua do último ID visto
+        items = [item for item in map(self.get, ids) if item is not None]
+        return items, encode_cursor(ids[-1]) if has_more else None
+
+
+class _StripedIndex:
+    """Índice chave (int ou texto) → conjunto de IDs, com locks por faixa de chave"""
+    
+    def __init__(self, stripes: int):
+        self._stripes: list[dict[int, set[int]]] = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+    
+    def add(self, key: int, item_id: int) -> None:
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            self._stripes[index].setdefault(key, set()).add(item_id)
+    
+    def discard(self, key: int, item_id: int) -> None:
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            ids = self._stripes[index].get(key)
+            if ids is None:
+                return
+            ids.discard(item_id)
+            if not ids:
+                del self._stripes[index][key]
+    
+    def get(self, key: int) -> list[int]:
+        """IDs da chave em ordem crescente"""
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            return sorted(self._stripes[index].get(key, ()))
+    
+    def pop(self, key: int) -> set[int]:
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            return self._stripes[index].pop(key, set())
+    
+    def size(self, key) -> int:
+        """Quantidade de IDs da chave"""
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            return len(self._stripes[index].get(key, ()))
+    
+    def dump(self) -> list[dict[int, list[int]]]:
+        """Imagem do índice para snapshot"""
+        image = []
+        for stripe, lock in zip(self._stripes, self._locks):
+            with lock:
+                image.append({key: list(ids) for key, ids in stripe.items()})
+        return image
+    
+    def load(self, image: list[dict[int, list[int]]]) -> None:
+        """Substitui o índice por uma imagem gerada por dump()"""
+        stripes = [{} for _ in self._stripes]
+        for part in image:
+            for key, ids in part.items():
+                stripes[hash(key) % len(stripes)][key] = set(ids)
+        self._stripes = stripes
+
+
+class _LevelIndex:
+    """
+    Índice nível → IDs com os níveis distintos mantidos em ordem (bisect) e os
+    IDs de cada nível em listas ordenadas. Atende faixas de nível e percursos em
+    ordem (nível, ID) sem ordenar a base: os K primeiros custam O(log L + K).
+    """
+    
+    def __init__(self):
+        self._buckets: dict[int, list[int]] = {}
+        self._levels: list[int] = []
+        self._lock = threading.Lock()
+    
+    def add(self, level: int, item_id: int) -> None:
+        with self._lock:
+            bucket = self._buckets.get(level)
+            if bucket is None:
+                bucket = self._buckets[level] = []
+                insort(self._levels, level)
+            # IDs novos são os maiores: na criação o insort só acrescenta no fim
+            position = bisect_left(bucket, item_id)
+            if position == len(bucket) or bucket[position] != item_id:
+                bucket.insert(position, item_id)
+    
+    def discard(self, level: int, item_id: int) -> None:
+        with self._lock:
+            bucket = self._buckets.get(level)
+            if bucket is None:
+                return
+            position = bisect_left(bucket, item_id)
+            if position < len(bucket) and bucket[position] == item_id:
+                del bucket[position]
+            if not bucket:
+                del self._buckets[level]
+                del self._levels[bisect_left(self._levels, level)]
+    
+    def count(self, nivel_min: Optional[int] = None, nivel_max: Optional[int] = None) -> int:
+        """Quantidade de IDs na faixa"""
+        with self._lock:
+            return sum(len(self._buckets[level]) for level in self._range(nivel_min, nivel_max))
+    
+    def scan(
+        self,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        descending: bool = False,
+        after: Optional[tuple[int, int]] = None
+    ) -> Iterator[tuple[int, list[int]]]:
+        """
+        (nível, IDs em ordem) da faixa, nível a nível e em blocos de até
+        SCAN_CHUNK IDs; quem consome pode parar a qualquer momento. Cada bloco
+        continua do último ID visto, então escritas entre blocos não repetem IDs.
+        Com `after` (nível, ID) o percurso retoma depois dessa posição.
+        """
+        if after is not None:
+            if descending:
+                nivel_max = after[0] if nivel_max is None else min(nivel_max, after[0])
+            else:
+                nivel_min = after[0] if nivel_min is None else max(nivel_min, after[0])
+        with self._lock:
+            levels = self._range(nivel_min, nivel_max)
+        for level in reversed(levels) if descending else levels:
+            start = after[1] + 1 if after is not None and level == after[0] else 0
+            while True:
+                with self._lock:
+                    bucket = self._buckets.get(level, ())
+                    position = bisect_left(bucket, start)
+                    ids = bucket[position:position + SCAN_CHUNK]
+                if not ids:
+                    break
+                yield level, ids
+                start = ids[-1] + 1
+    
+    def _range(self, nivel_min: Optional[int], nivel_max: Optional[int]) -> list[int]:
+        start = 0 if nivel_min is None else bisect_left(self._levels, nivel_min)
+        end = len(self._levels) if nivel_max is None else bisect_right(self._levels, nivel_max)
+        return self._levels[start:end]
+
+
+class _TypeLevelIndex:
+    """Um _LevelIndex por tipo (tipo → nível → IDs)"""
+    
+    def __init__(self):
+        self._by_type: dict[str, _LevelIndex] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, tipo: str) -> Optional[_LevelIndex]:
+        return self._by_type.get(tipo)
+    
+    def add(self, tipo: str, level: int, item_id: int) -> None:
+        index = self._by_type.get(tipo)
+        if index is None:
+            with self._lock:
+                index = self._by_type.setdefault(tipo, _LevelIndex())
+        index.add(level, item_id)
+    
+    def discard(self, tipo: str, level: int, item_id: int) -> None:
+        index = self._by_type.get(tipo)
+        if index is not None:
+            index.discard(level, item_id)
+
+
+class _StripedAggregates:
+    """Contadores por treinador (histograma de níveis e de tipos), com locks por faixa de treinador"""
+    
+    def __init__(self, stripes: int):
+        self._stripes: list[dict[int, TrainerAggregate]] = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+    
+    def add(self, item: dict, delta: int = 1) -> None:
+        """Conta (delta=1) ou desconta (delta=-1) um pokémon no seu treinador"""
+        key = item["treinador_id"]
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            aggregate = self._stripes[index].get(key)
+            if aggregate is None:
+                aggregate = self._stripes[index][key] = TrainerAggregate()
+            aggregate.add(item["nivel"], item["tipo"], delta)
+            if aggregate.empty():
+                del self._stripes[index][key]
+    
+    def summary(self, key: int) -> dict:
+        index = hash(key) % len(self._stripes)
+        with self._locks[index]:
+            aggregate = self._stripes[index].get(key)
+            if aggregate is None:
+                return build_summary(key)
+            return build_summary(key, aggregate.levels, aggregate.types)
+    
+    def clear(self) -> None:
+        for stripe, lock in zip(self._stripes, self._locks):
+            with lock:
+                stripe.clear()
+
+
+class MemoryTrainerRepository(IDatabaseTrainer):
+    """Repositório de Treinadores em memória"""
+    
+    def __init__(self, shards: int = DEFAULT_SHARDS):
+        self._db = _ShardedStore(shards)
     
     def create(self, nome: str) -> dict:
         """Cria um novo treinador"""
-        new_id = self._get_next_id()
-        item = {"id": new_id, "nome": nome}
-        self._db[new_id] = item
+        item = {"id": self._db.next_id(), "nome": nome}
+        self._db.put(item)
         return item
     
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores"""
+        return [self.create(nome) for nome in nomes]
+    
     def get(self, trainer_id: int) -> Optional[dict]:
         """Busca treinador por ID"""
         return self._db.get(trainer_id)
     
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores por ID"""
+        found = ((tid, self._db.get(tid)) for tid in set(trainer_ids))
+        return {tid: trainer for tid, trainer in found if trainer is not None}
+    
     def list_all(self) -> list[dict]:
         """Lista todos os treinadores"""
-        return list(self._db.values())
+        return self._db.values()
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return self._db.page(limit, cursor)
     
     def update(self, trainer_id: int, nome: str) -> Optional[dict]:
         """Atualiza um treinador"""
-        if trainer_id not in self._db:
-            return None
-        self._db[trainer_id]["nome"] = nome
-        return self._db[trainer_id]
+        return self._db.replace(trainer_id, {"nome": nome})
     
     def delete(self, trainer_id: int) -> bool:
         """Deleta um treinador"""
-        if trainer_id not in self._db:
-            return False
-        del self._db[trainer_id]
-        return True
+        return self._db.pop(trainer_id) is not None
+    
+    # ============ PERSISTÊNCIA (usado pelo DurableTrainerRepository) ============
+    
+    def snapshot(self) -> dict:
+        """Imagem do estado atual"""
+        return {"store": self._db.dump()}
+    
+    def restore(self, image: dict) -> None:
+        """Carrega uma imagem gerada por snapshot()"""
+        self._db.load(image["store"])
+    
+    def load_items(self, items: list[dict]) -> None:
+        """Grava itens que já têm ID (replay do log)"""
+        for item in items:
+            self._db.put_existing(item)
 
 
 class MemoryPokemonRepository(IDatabasePokemon):
     """Repositório de Pokémon em memória"""
     
-    def __init__(self):
-        self._db: dict[int, dict] = {}
-        self._counter = 0
+    def __init__(self, shards: int = DEFAULT_SHARDS):
+        self._db = _ShardedStore(shards)
+        # Índices secundários: treinador_id → ids; tipo → nível → ids; nível → ids
+        self._by_trainer = _StripedIndex(shards)
+        self._by_type = _TypeLevelIndex()
+        self._by_level = _LevelIndex()
+        # Contadores do resumo por treinador
+        self._aggregates = _StripedAggregates(shards)
+        # Escritas de pokémon do mesmo treinador são serializadas (lock por faixa de
+        # treinador): item, índices e contadores mudam juntos, e a cascata não deixa
+        # para trás um pokémon criado em paralelo. Treinadores excluídos não recebem novos.
+        self._trainer_locks = [threading.Lock() for _ in range(shards)]
+        self._removed_trainers = RemovedTrainers()
     
-    def _get_next_id(self) -> int:
-        """Gera próximo ID único"""
-        self._counter += 1
-        return self._counter
+    def _trainer_lock(self, treinador_id: int) -> threading.Lock:
+        return self._trainer_locks[hash(treinador_id) % len(self._trainer_locks)]
+    
+    def _index(self, item: dict) -> None:
+        self._by_trainer.add(item["treinador_id"], item["id"])
+        self._by_type.add(item["tipo"], item["nivel"], item["id"])
+        self._by_level.add(item["nivel"], item["id"])
+        self._aggregates.add(item)
+    
+    def _unindex_attributes(self, item: dict) -> None:
+        """Remove o item dos índices de tipo e nível e dos contadores (o de treinador é tratado à parte)"""
+        self._by_type.discard(item["tipo"], item["nivel"], item["id"])
+        self._by_level.discard(item["nivel"], item["id"])
+        self._aggregates.add(item, -1)
     
     def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
-        """Cria um novo pokémon"""
-        new_id = self._get_next_id()
-        item = {
-            "id": new_id,
-            "nome": nome,
-            "tipo": tipo,
-            "nivel": nivel,
-            "treinador_id": treinador_id
-        }
-        self._db[new_id] = item
+        """Cria um novo pokémon (ValueError se o treinador já foi excluído)"""
+        with self._trainer_lock(treinador_id):
+            if treinador_id in self._removed_trainers:
+                raise ValueError(f"Treinador excluído: {treinador_id}")
+            item = {
+                "id": self._db.next_id(),
+                "nome": nome,
+                "tipo": tipo,
+                "nivel": nivel,
+                "treinador_id": treinador_id
+            }
+            # Gravação e índices juntos: a cascata vê o pokémon inteiro ou não o vê
+            self._db.put(item)
+            self._index(item)
         return item
     
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon"""
+        return [self.create(p["nome"], p["tipo"], p["nivel"], p["treinador_id"]) for p in pokemons]
+    
     def get(self, pokemon_id: int) -> Optional[dict]:
         """Busca pokémon por ID"""
         return self._db.get(pokemon_id)
     
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon por ID"""
+        found = ((pid, self._db.get(pid)) for pid in set(pokemon_ids))
+        return {pid: pokemon for pid, pokemon in found if pokemon is not None}
+    
     def list_all(self) -> list[dict]:
         """Lista todos os pokémon"""
-        return list(self._db.values())
+        return self._db.values()
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return self._db.page(limit, cursor)
     
     def get_by_trainer(self, treinador_id: int) -> list[dict]:
         """Lista pokémon de um treinador"""
-        return [p for p in self._db.values() if p["treinador_id"] == treinador_id]
+        found = (self._db.get(pid) for pid in self._by_trainer.get(treinador_id))
+        # Um pokémon removido em paralelo pode ainda estar no índice
+        return [pokemon for pokemon in found if pokemon is not None]
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """Busca pelo índice mais seletivo e confere cada item com os filtros"""
+        check_sort(sort, tipo, treinador_id)
+        by_level = sort in ("nivel", "-nivel")
+        level_index = self._by_type.get(tipo) if tipo is not None else self._by_level
+        if level_index is None:
+            return []
+        has_level_filter = tipo is not None or nivel_min is not None or nivel_max is not None
+        
+        if treinador_id is not None and not (
+            has_level_filter and level_index.count(nivel_min, nivel_max) < self._by_trainer.size(treinador_id)
+        ):
+            found = (self._db.get(pid) for pid in self._by_trainer.get(treinador_id))
+            items = [p for p in found if p is not None and matches(p, tipo, nivel_min, nivel_max, treinador_id)]
+            return order(items, sort, limit, after)
+        if not (has_level_filter or by_level):
+            return order(self._db.values(), sort, limit, after)
+        
+        # Percurso nível a nível: em ordem de nível pode parar ao atingir o limite
+        # e retomar da posição `after` (nível, ID)
+        items = []
+        stop = limit if by_level else None
+        start = after if by_level else None
+        for level, ids in level_index.scan(nivel_min, nivel_max, descending=sort == "-nivel", after=start):
+            for pid in ids:
+                pokemon = self._db.get(pid)
+                # Entradas de um item alterado em paralelo podem estar no nível antigo
+                if pokemon is not None and pokemon["nivel"] == level and matches(pokemon, tipo, nivel_min, nivel_max, treinador_id):
+                    items.append(pokemon)
+            if stop is not None and len(items) >= stop:
+                break
+        return items[:limit] if by_level else order(items, sort, limit, after)
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido, a partir dos contadores"""
+        return {tid: self._aggregates.summary(tid) for tid in dict.fromkeys(treinador_ids)}
     
     def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
         """Atualiza um pokémon"""
-        if pokemon_id not in self._db:
-            return None
-        pokemon = self._db[pokemon_id]
+        changes = {}
         if nome is not None:
-            pokemon["nome"] = nome
+            changes["nome"] = nome
         if tipo is not None:
-            pokemon["tipo"] = tipo
+            changes["tipo"] = tipo
         if nivel is not None:
-            pokemon["nivel"] = nivel
-        return pokemon
+            changes["nivel"] = nivel
+        current = self._db.get(pokemon_id)
+        if current is None:
+            return None
+        # O treinador de um pokémon não muda: o lock dele vale para a versão atual
+        with self._trainer_lock(current["treinador_id"]):
+            previous, updated = self._db.exchange(pokemon_id, changes)
+            if previous is not None and (previous["tipo"] != updated["tipo"] or previous["nivel"] != updated["nivel"]):
+                self._unindex_attributes(previous)
+                self._by_type.add(updated["tipo"], updated["nivel"], pokemon_id)
+                self._by_level.add(updated["nivel"], pokemon_id)
+                self._aggregates.add(updated)
+        return updated
     
     def delete(self, pokemon_id: int) -> bool:
         """Deleta um pokémon"""
-        if pokemon_id not in self._db:
+        current = self._db.get(pokemon_id)
+        if current is None:
             return False
-        del self._db[pokemon_id]
+        with self._trainer_lock(current["treinador_id"]):
+            pokemon = self._db.pop(pokemon_id)
+            if pokemon is None:
+                return False
+            self._by_trainer.discard(pokemon["treinador_id"], pokemon_id)
+            self._unindex_attributes(pokemon)
         return True
     
     def delete_by_trainer(self, treinador_id: int) -> int:
-        """Deleta todos os pokémon de um treinador"""
-        to_delete = [pid for pid, p in self._db.items() if p["treinador_id"] == treinador_id]
-        for pid in to_delete:
-            del self._db[pid]
-        return len(to_delete)
+        """Deleta todos os pokémon de um treinador (e recusa criações posteriores para ele)"""
+        count = 0
+        with self._trainer_lock(treinador_id):
+            self._removed_trainers.add(treinador_id)
+            for pid in self._by_trainer.pop(treinador_id):
+                pokemon = self._db.pop(pid)
+                if pokemon is not None:
+                    self._unindex_attributes(pokemon)
+                    count += 1
+        return count
+    
+    # ============ PERSISTÊNCIA (usado pelo DurablePokemonRepository) ============
+    
+    def snapshot(self) -> dict:
+        """
+        Imagem do estado atual, copiada shard a shard sem travar as escritas (cada
+        item está inteiro; os índices não vão na imagem e são refeitos no restore)
+        """
+        return {"store": self._db.dump(), "removed_trainers": self._removed_trainers.dump()}
+    
+    def restore(self, image: dict) -> None:
+        """Carrega uma imagem gerada por snapshot() (índices e contadores são reconstruídos)"""
+        self._db.load(image["store"])
+        self._removed_trainers.load(image.get("removed_trainers", {}))
+        self._by_trainer.load([])
+        self._by_type = _TypeLevelIndex()
+        self._by_level = _LevelIndex()
+        self._aggregates.clear()
+        # Em ordem de ID cada inserção nas listas dos níveis é só um append
+        items = sorted((item for part in image["store"]["shards"] for item in part), key=itemgetter("id"))
+        for item in items:
+            self._by_trainer.add(item["treinador_id"], item["id"])
+            self._by_type.add(item["tipo"], item["nivel"], item["id"])
+            self._by_level.add(item["nivel"], item["id"])
+            self._aggregates.add(item)
+    
+    def load_items(self, items: list[dict]) -> None:
+        """Grava itens que já têm ID (replay do log)"""
+        for item in items:
+            previous = self._db.get(item["id"])
+            if previous is not None:
+                self._by_trainer.discard(previous["treinador_id"], previous["id"])
+                self._unindex_attributes(previous)
+            self._db.put_existing(item)
+            self._index(item)
+
+
+class MemoryJobRepository(IDatabaseJob):
+    """Jobs em memória: só o processo que os criou os enxerga (desenvolvimento local)"""
+    
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_jobs = max_jobs
+    
+    def save(self, job: dict) -> None:
+        """Grava o job (cópia), descartando os mais antigos acima do limite"""
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+            while len(self._jobs) > self._max_jobs:
+                self._jobs.popitem(last=False)
+    
+    def get(self, job_id: str) -> Optional[dict]:
+        """Busca job por ID (cópia)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
@@ -0,0 +1,89 @@
+"""
+Filtros, ordenação e paginação da busca de pokémon (find).
+Os backends em memória conferem cada item vindo de um índice com matches()
+(o índice pode estar um passo atrás de uma escrita concorrente) e ordenam o
+resultado com order(); SQLite e DynamoDB traduzem os mesmos critérios.
+As páginas seguem por keyset: a posição de um item é (campo de sort, ID), ou
+só (ID,) sem sort, e a próxima página começa depois da posição do último item.
+"""
+from operator import itemgetter
+from typing import Optional
+
+from app.repositories.cursor import encode_key_cursor, decode_key_cursor
+
+
+# Ordenações aceitas: campo crescente ou "-campo" decrescente (empates por ID)
+SORT_FIELDS = ("nivel", "-nivel", "nome", "-nome")
+# Sem índice de nome: essas ordenações exigem um filtro de tipo ou treinador
+NAME_SORTS = ("nome", "-nome")
+
+
+def check_sort(sort: Optional[str], tipo: Optional[str], treinador_id: Optional[int]) -> None:
+    """Recusa (ValueError) a ordenação por nome sem filtro que limite a leitura"""
+    if sort in NAME_SORTS and tipo is None and treinador_id is None:
+        raise ValueError("Ordenação por nome exige filtro de tipo ou treinador_id")
+
+
+def matches(pokemon: dict, tipo: Optional[str], nivel_min: Optional[int], nivel_max: Optional[int], treinador_id: Optional[int]) -> bool:
+    """Confere se o pokémon atende aos filtros (tipo exato, faixa de nível, treinador)"""
+    if tipo is not None and pokemon["tipo"] != tipo:
+        return False
+    if nivel_min is not None and pokemon["nivel"] < nivel_min:
+        return False
+    if nivel_max is not None and pokemon["nivel"] > nivel_max:
+        return False
+    if treinador_id is not None and pokemon["treinador_id"] != treinador_id:
+        return False
+    return True
+
+
+def position(pokemon: dict, sort: Optional[str]) -> tuple:
+    """Posição do pokémon na ordenação: (valor do campo, ID), ou (ID,) sem sort"""
+    if sort is None:
+        return (int(pokemon["id"]),)
+    field = sort.lstrip("-")
+    value = int(pokemon[field]) if field == "nivel" else pokemon[field]
+    return value, int(pokemon["id"])
+
+
+def follows(pokemon: dict, sort: Optional[str], after: tuple) -> bool:
+    """Confere se o pokémon vem depois da posição `after` na ordenação"""
+    if sort is None:
+        return pokemon["id"] > after[0]
+    value, last_id = after
+    current = pokemon[sort.lstrip("-")]
+    if current == value:
+        return pokemon["id"] > last_id
+    return current < value if sort.startswith("-") else current > value
+
+
+def order(items: list[dict], sort: Optional[str], limit: Optional[int] = None, after: Optional[tuple] = None) -> list[dict]:
+    """
+    Ordena por ID e, se pedido, pelo campo de `sort` (sort estável: empates ficam
+    por ID); com `after`, só os itens depois dessa posição
+    """
+    if after is not None:
+        items = [p for p in items if follows(p, sort, after)]
+    items.sort(key=itemgetter("id"))
+    if sort is not None:
+        items.sort(key=itemgetter(sort.lstrip("-")), reverse=sort.startswith("-"))
+    return items if limit is None else items[:limit]
+
+
+def encode_position(pokemon: dict, sort: Optional[str]) -> str:
+    """Cursor da próxima página: a posição do último item da página"""
+    return encode_key_cursor(position(pokemon, sort))
+
+
+def decode_position(cursor: Optional[str], sort: Optional[str]) -> Optional[tuple]:
+    """Posição guardada no cursor, conferida com o sort pedido (ValueError se não combinar)"""
+    after = decode_key_cursor(cursor)
+    if after is None:
+        return None
+    if sort is None:
+        expected = (int,)
+    else:
+        expected = (str if sort.lstrip("-") == "nome" else int, int)
+    if len(after) != len(expected) or any(type(value) is not kind for value, kind in zip(after, expected)):
+        raise ValueError("Cursor inválido")
+    return after
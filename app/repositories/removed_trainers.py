@@ -0,0 +1,61 @@
+"""
+Treinadores excluídos em cascata, lembrados pelos repositórios de pokémon em
+memória para recusar uma criação que validou o treinador antes da exclusão.
+Só criações em andamento correm esse risco, então cada marca expira depois de
+REMOVED_TRAINER_RETENTION_SECONDS (a memória não cresce com as exclusões) e vai
+no snapshot com o instante da exclusão (vale também depois de reiniciar).
+"""
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+
+
+# Por quanto tempo uma exclusão recusa criações (bem acima da duração de uma requisição)
+REMOVED_TRAINER_RETENTION_SECONDS = 600.0
+
+
+class RemovedTrainers:
+    """Treinador → instante da exclusão, em ordem de exclusão (as expiradas são descartadas)"""
+    
+    def __init__(self, retention_seconds: float = REMOVED_TRAINER_RETENTION_SECONDS):
+        self._retention = retention_seconds
+        self._removed: OrderedDict[int, float] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def add(self, treinador_id: int) -> None:
+        with self._lock:
+            self._prune()
+            self._removed[treinador_id] = time.time()
+            self._removed.move_to_end(treinador_id)
+    
+    def __contains__(self, treinador_id: int) -> bool:
+        with self._lock:
+            self._prune()
+            return treinador_id in self._removed
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune()
+            return len(self._removed)
+    
+    def dump(self) -> dict[int, float]:
+        """Marcas ainda válidas (para o snapshot)"""
+        with self._lock:
+            self._prune()
+            return dict(self._removed)
+    
+    def load(self, image: dict[int, float]) -> None:
+        """Carrega as marcas de dump()"""
+        with self._lock:
+            self._removed = OrderedDict(sorted(image.items(), key=itemgetter(1)))
+            self._prune()
+    
+    def _prune(self) -> None:
+        """Descarta as marcas expiradas (as mais antigas ficam no começo)"""
+        expired = time.time() - self._retention
+        while self._removed:
+            treinador_id, removed_at = next(iter(self._removed.items()))
+            if removed_at > expired:
+                return
+            del self._removed[treinador_id]
@@ -0,0 +1,367 @@
+"""
+Repositório SQLite para armazenamento durável em um único nó.
+Implementa as interfaces de banco de dados usando o módulo sqlite3 da biblioteca padrão.
+
+O banco roda em modo WAL (leitores não bloqueiam o escritor) e cada thread usa
+a sua própria conexão. As instruções SQL são constantes, então o cache de
+statements de cada conexão as reaproveita já preparadas.
+"""
+import sqlite3
+import threading
+from typing import Optional
+from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+from app.repositories.cursor import encode_cursor, decode_cursor
+from app.repositories.query import check_sort
+from app.repositories.summary import build_summary
+
+
+# Máximo de parâmetros por consulta IN (limite antigo do SQLite é 999)
+IN_CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS treinadores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pokemons (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    nivel INTEGER NOT NULL,
+    treinador_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pokemons_treinador_id ON pokemons (treinador_id);
+CREATE INDEX IF NOT EXISTS idx_pokemons_tipo_nivel ON pokemons (tipo, nivel);
+CREATE INDEX IF NOT EXISTS idx_pokemons_nivel ON pokemons (nivel);
+
+-- Contadores do resumo por treinador, mantidos por triggers na mesma transação da escrita
+CREATE TABLE IF NOT EXISTS treinador_niveis (
+    treinador_id INTEGER NOT NULL,
+    nivel INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL,
+    PRIMARY KEY (treinador_id, nivel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS treinador_tipos (
+    treinador_id INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    PRIMARY KEY (treinador_id, tipo)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS pokemons_resumo_insert AFTER INSERT ON pokemons BEGIN
+    INSERT INTO treinador_niveis VALUES (NEW.treinador_id, NEW.nivel, 1)
+        ON CONFLICT (treinador_id, nivel) DO UPDATE SET quantidade = quantidade + 1;
+    INSERT INTO treinador_tipos VALUES (NEW.treinador_id, NEW.tipo, 1)
+        ON CONFLICT (treinador_id, tipo) DO UPDATE SET quantidade = quantidade + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS pokemons_resumo_delete AFTER DELETE ON pokemons BEGIN
+    UPDATE treinador_niveis SET quantidade = quantidade - 1 WHERE treinador_id = OLD.treinador_id AND nivel = OLD.nivel;
+    UPDATE treinador_tipos SET quantidade = quantidade - 1 WHERE treinador_id = OLD.treinador_id AND tipo = OLD.tipo;
+    DELETE FROM treinador_niveis WHERE treinador_id = OLD.treinador_id AND nivel = OLD.nivel AND quantidade <= 0;
+    DELETE FROM treinador_tipos WHERE treinador_id = OLD.treinador_id AND tipo = OLD.tipo AND quantidade <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS pokemons_resumo_update AFTER UPDATE OF tipo, nivel ON pokemons
+WHEN OLD.tipo IS NOT NEW.tipo OR OLD.nivel IS NOT NEW.nivel BEGIN
+    UPDATE treinador_niveis SET quantidade = quantidade - 1 WHERE treinador_id = OLD.treinador_id AND nivel = OLD.nivel;
+    UPDATE treinador_tipos SET quantidade = quantidade - 1 WHERE treinador_id = OLD.treinador_id AND tipo = OLD.tipo;
+    DELETE FROM treinador_niveis WHERE treinador_id = OLD.treinador_id AND nivel = OLD.nivel AND quantidade <= 0;
+    DELETE FROM treinador_tipos WHERE treinador_id = OLD.treinador_id AND tipo = OLD.tipo AND quantidade <= 0;
+    INSERT INTO treinador_niveis VALUES (NEW.treinador_id, NEW.nivel, 1)
+        ON CONFLICT (treinador_id, nivel) DO UPDATE SET quantidade = quantidade + 1;
+    INSERT INTO treinador_tipos VALUES (NEW.treinador_id, NEW.tipo, 1)
+        ON CONFLICT (treinador_id, tipo) DO UPDATE SET quantidade = quantidade + 1;
+END;
+"""
+
+# Versão do esquema (PRAGMA user_version); bancos mais antigos são migrados ao abrir
+SCHEMA_VERSION = 1
+
+# Preenche os contadores do resumo a partir dos pokémon já gravados (versão 0 → 1)
+BACKFILL_SUMMARIES = """
+DELETE FROM treinador_niveis;
+DELETE FROM treinador_tipos;
+INSERT INTO treinador_niveis SELECT treinador_id, nivel, COUNT(*) FROM pokemons GROUP BY treinador_id, nivel;
+INSERT INTO treinador_tipos SELECT treinador_id, tipo, COUNT(*) FROM pokemons GROUP BY treinador_id, tipo;
+"""
+
+# ORDER BY de cada valor de sort do find (empates por ID)
+ORDER_BY = {
+    None: "id",
+    "nivel": "nivel, id",
+    "-nivel": "nivel DESC, id",
+    "nome": "nome, id",
+    "-nome": "nome DESC, id"
+}
+
+# Condição de keyset de cada sort: itens depois da posição (valor, ID) da página
+# anterior; a comparação com >=/<= isolada deixa o índice de nível limitar a faixa
+AFTER = {
+    None: "id > ?",
+    "nivel": "nivel >= ? AND (nivel > ? OR id > ?)",
+    "-nivel": "nivel <= ? AND (nivel < ? OR id > ?)",
+    "nome": "nome >= ? AND (nome > ? OR id > ?)",
+    "-nome": "nome <= ? AND (nome < ? OR id > ?)"
+}
+
+
+class SQLiteDatabase:
+    """Arquivo SQLite compartilhado pelos repositórios, com uma conexão por thread"""
+    
+    def __init__(self, path: str):
+        if path == ":memory:":
+            raise ValueError("Use um arquivo: cada thread abre a sua conexão e não veria o banco das outras")
+        self._path = path
+        self._local = threading.local()
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            conn.executescript(f"BEGIN IMMEDIATE; {BACKFILL_SUMMARIES} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+    
+    def connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual (criada na primeira chamada)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=30, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Em WAL, NORMAL só faz fsync nos checkpoints e continua consistente após queda
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+def _chunks(ids: list[int]):
+    """Divide os IDs em grupos que cabem em uma consulta IN"""
+    unique = list(dict.fromkeys(ids))
+    for i in range(0, len(unique), IN_CHUNK_SIZE):
+        yield unique[i:i + IN_CHUNK_SIZE]
+
+
+def _trainer_row(row: tuple) -> dict:
+    return {"id": row[0], "nome": row[1]}
+
+
+def _pokemon_row(row: tuple) -> dict:
+    return {"id": row[0], "nome": row[1], "tipo": row[2], "nivel": row[3], "treinador_id": row[4]}
+
+
+def _page(conn: sqlite3.Connection, sql: str, limit: int, cursor: Optional[str], to_dict) -> tuple[list[dict], Optional[str]]:
+    """Busca limit + 1 linhas a partir do cursor para saber se há próxima página"""
+    rows = conn.execute(sql, (decode_cursor(cursor) or 0, limit + 1)).fetchall()
+    items = [to_dict(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1]["id"]) if len(rows) > limit else None
+    return items, next_cursor
+
+
+class SQLiteTrainerRepository(IDatabaseTrainer):
+    """Repositório de Treinadores no SQLite"""
+    
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+    
+    def create(self, nome: str) -> dict:
+        """Cria um novo treinador"""
+        conn = self._db.connection()
+        with conn:
+            new_id = conn.execute("INSERT INTO treinadores (nome) VALUES (?)", (nome,)).lastrowid
+        return {"id": new_id, "nome": nome}
+    
+    def create_many(self, nomes: list[str]) -> list[dict]:
+        """Cria vários treinadores em uma única transação"""
+        if not nomes:
+            return []
+        conn = self._db.connection()
+        with conn:
+            # O ID de cada linha vem do próprio INSERT (nada garante IDs consecutivos)
+            return [
+                {"id": conn.execute("INSERT INTO treinadores (nome) VALUES (?)", (nome,)).lastrowid, "nome": nome}
+                for nome in nomes
+            ]
+    
+    def get(self, trainer_id: int) -> Optional[dict]:
+        """Busca treinador por ID"""
+        row = self._db.connection().execute(
+            "SELECT id, nome FROM treinadores WHERE id = ?", (trainer_id,)
+        ).fetchone()
+        return None if row is None else _trainer_row(row)
+    
+    def get_many(self, trainer_ids: list[int]) -> dict[int, dict]:
+        """Busca vários treinadores por ID"""
+        conn = self._db.connection()
+        result = {}
+        for chunk in _chunks(trainer_ids):
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT id, nome FROM treinadores WHERE id IN ({placeholders})", chunk):
+                result[row[0]] = _trainer_row(row)
+        return result
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os treinadores"""
+        rows = self._db.connection().execute("SELECT id, nome FROM treinadores ORDER BY id")
+        return [_trainer_row(row) for row in rows]
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de treinadores"""
+        return _page(
+            self._db.connection(),
+            "SELECT id, nome FROM treinadores WHERE id > ? ORDER BY id LIMIT ?",
+            limit, cursor, _trainer_row
+        )
+    
+    def update(self, trainer_id: int, nome: str) -> Optional[dict]:
+        """Atualiza um treinador"""
+        conn = self._db.connection()
+        with conn:
+            updated = conn.execute("UPDATE treinadores SET nome = ? WHERE id = ?", (nome, trainer_id)).rowcount
+        return {"id": trainer_id, "nome": nome} if updated else None
+    
+    def delete(self, trainer_id: int) -> bool:
+        """Deleta um treinador"""
+        conn = self._db.connection()
+        with conn:
+            return conn.execute("DELETE FROM treinadores WHERE id = ?", (trainer_id,)).rowcount > 0
+
+
+class SQLitePokemonRepository(IDatabasePokemon):
+    """Repositório de Pokémon no SQLite"""
+    
+    COLUMNS = "id, nome, tipo, nivel, treinador_id"
+    
+    def __init__(self, database: SQLiteDatabase):
+        self._db = database
+    
+    def create(self, nome: str, tipo: str, nivel: int, treinador_id: int) -> dict:
+        """Cria um novo pokémon"""
+        conn = self._db.connection()
+        with conn:
+            new_id = conn.execute(
+                "INSERT INTO pokemons (nome, tipo, nivel, treinador_id) VALUES (?, ?, ?, ?)",
+                (nome, tipo, nivel, treinador_id)
+            ).lastrowid
+        return {"id": new_id, "nome": nome, "tipo": tipo, "nivel": nivel, "treinador_id": treinador_id}
+    
+    def create_many(self, pokemons: list[dict]) -> list[dict]:
+        """Cria vários pokémon em uma única transação"""
+        if not pokemons:
+            return []
+        conn = self._db.connection()
+        created = []
+        with conn:
+            # O ID de cada linha vem do próprio INSERT (nada garante IDs consecutivos);
+            # o statement preparado é reaproveitado a cada linha, na mesma transação
+            for p in pokemons:
+                new_id = conn.execute(
+                    "INSERT INTO pokemons (nome, tipo, nivel, treinador_id) VALUES (?, ?, ?, ?)",
+                    (p["nome"], p["tipo"], p["nivel"], p["treinador_id"])
+                ).lastrowid
+                created.append({"id": new_id, "nome": p["nome"], "tipo": p["tipo"], "nivel": p["nivel"], "treinador_id": p["treinador_id"]})
+        return created
+    
+    def get(self, pokemon_id: int) -> Optional[dict]:
+        """Busca pokémon por ID"""
+        row = self._db.connection().execute(
+            f"SELECT {self.COLUMNS} FROM pokemons WHERE id = ?", (pokemon_id,)
+        ).fetchone()
+        return None if row is None else _pokemon_row(row)
+    
+    def get_many(self, pokemon_ids: list[int]) -> dict[int, dict]:
+        """Busca vários pokémon por ID"""
+        conn = self._db.connection()
+        result = {}
+        for chunk in _chunks(pokemon_ids):
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT {self.COLUMNS} FROM pokemons WHERE id IN ({placeholders})", chunk):
+                result[row[0]] = _pokemon_row(row)
+        return result
+    
+    def list_all(self) -> list[dict]:
+        """Lista todos os pokémon"""
+        rows = self._db.connection().execute(f"SELECT {self.COLUMNS} FROM pokemons ORDER BY id")
+        return [_pokemon_row(row) for row in rows]
+    
+    def list_page(self, limit: int, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Lista uma página de pokémon"""
+        return _page(
+            self._db.connection(),
+            f"SELECT {self.COLUMNS} FROM pokemons WHERE id > ? ORDER BY id LIMIT ?",
+            limit, cursor, _pokemon_row
+        )
+    
+    def get_by_trainer(self, treinador_id: int) -> list[dict]:
+        """Lista pokémon de um treinador (consulta pelo índice de treinador_id)"""
+        rows = self._db.connection().execute(
+            f"SELECT {self.COLUMNS} FROM pokemons WHERE treinador_id = ? ORDER BY id", (treinador_id,)
+        )
+        return [_pokemon_row(row) for row in rows]
+    
+    def find(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
+    ) -> list[dict]:
+        """
+        Busca com WHERE/ORDER BY/LIMIT no próprio SQLite (índices de treinador,
+        tipo + nível e nível). Só existem poucas combinações de filtros, então os
+        statements montados continuam cabendo no cache da conexão.
+        """
+        check_sort(sort, tipo, treinador_id)
+        conditions, params = [], []
+        for clause, value in (("tipo = ?", tipo), ("nivel >= ?", nivel_min), ("nivel <= ?", nivel_max), ("treinador_id = ?", treinador_id)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        if after is not None:
+            conditions.append(AFTER[sort])
+            params.extend(after if sort is None else (after[0], after[0], after[1]))
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        # LIMIT -1 é "sem limite" no SQLite
+        params.append(-1 if limit is None else limit)
+        rows = self._db.connection().execute(
+            f"SELECT {self.COLUMNS} FROM pokemons {where}ORDER BY {ORDER_BY[sort]} LIMIT ?", params
+        )
+        return [_pokemon_row(row) for row in rows]
+    
+    def get_summaries(self, treinador_ids: list[int]) -> dict[int, dict]:
+        """Resumo de cada treinador pedido, a partir das tabelas de contadores"""
+        conn = self._db.connection()
+        levels = {tid: {} for tid in treinador_ids}
+        types = {tid: {} for tid in treinador_ids}
+        for chunk in _chunks(treinador_ids):
+            placeholders = ",".join("?" * len(chunk))
+            for trainer_id, nivel, quantidade in conn.execute(
+                f"SELECT treinador_id, nivel, quantidade FROM treinador_niveis WHERE treinador_id IN ({placeholders})", chunk
+            ):
+                levels[trainer_id][nivel] = quantidade
+            for trainer_id, tipo, quantidade in conn.execute(
+                f"SELECT treinador_id, tipo, quantidade FROM treinador_tipos WHERE treinador_id IN ({placeholders})", chunk
+            ):
+                types[trainer_id][tipo] = quantidade
+        return {tid: build_summary(tid, levels[tid], types[tid]) for tid in levels}
+    
+    def update(self, pokemon_id: int, nome: str = None, tipo: str = None, nivel: int = None) -> Optional[dict]:
+        """Atualiza um pokémon"""
+        conn = self._db.connection()
+        with conn:
+            updated = conn.execute(
+                "UPDATE pokemons SET nome = COALESCE(?, nome), tipo = COALESCE(?, tipo), nivel = COALESCE(?, nivel) WHERE id = ?",
+                (nome, tipo, nivel, pokemon_id)
+            ).rowcount
+            if not updated:
+                return None
+            row = conn.execute(f"SELECT {self.COLUMNS} FROM pokemons WHERE id = ?", (pokemon_id,)).fetchone()
+        return _pokemon_row(row)
+    
+    def delete(self, pokemon_id: int) -> bool:
+        """Deleta um pokémon"""
+        conn = self._db.connection()
+        with conn:
+            return conn.execute("DELETE FROM pokemons WHERE id = ?", (pokemon_id,)).rowcount > 0
+    
+    def delete_by_trainer(self, treinador_id: int) -> int:
+        """Deleta todos os pokémon de um treinador com um único DELETE"""
+        conn = self._db.connection()
+        with conn:
+            return conn.execute("DELETE FROM pokemons WHERE treinador_id = ?", (treinador_id,)).rowcount
@@ -0,0 +1,47 @@
+"""
+Resumo por treinador (quantidade, nível médio e máximo, distribuição de tipos).
+Os backends mantêm, a cada escrita de pokémon, um histograma de níveis e uma
+contagem por tipo de cada treinador; o resumo é montado na leitura a partir
+deles (O(níveis distintos)), sem percorrer os pokémon do treinador.
+"""
+from typing import Optional
+
+
+class TrainerAggregate:
+    """Contadores de um treinador: nível → quantidade e tipo → quantidade"""
+    
+    __slots__ = ("levels", "types")
+    
+    def __init__(self):
+        self.levels: dict[int, int] = {}
+        self.types: dict[str, int] = {}
+    
+    def add(self, nivel: int, tipo: str, delta: int = 1) -> None:
+        """Soma `delta` (1 ao criar, -1 ao remover) nos contadores do nível e do tipo"""
+        _bump(self.levels, nivel, delta)
+        _bump(self.types, tipo, delta)
+    
+    def empty(self) -> bool:
+        return not self.levels
+
+
+def _bump(counts: dict, key, delta: int) -> None:
+    count = counts.get(key, 0) + delta
+    if count > 0:
+        counts[key] = count
+    else:
+        counts.pop(key, None)
+
+
+def build_summary(treinador_id: int, levels: Optional[dict[int, int]] = None, types: Optional[dict[str, int]] = None) -> dict:
+    """Resumo a partir dos contadores (contadores zerados ou negativos são ignorados)"""
+    levels = {int(level): int(count) for level, count in (levels or {}).items() if count > 0}
+    types = {tipo: int(count) for tipo, count in sorted((types or {}).items()) if count > 0}
+    quantidade = sum(levels.values())
+    return {
+        "treinador_id": treinador_id,
+        "quantidade": quantidade,
+        "nivel_medio": round(sum(level * count for level, count in levels.items()) / quantidade, 2) if quantidade else None,
+        "nivel_maximo": max(levels) if levels else None,
+        "tipos": types
+    }
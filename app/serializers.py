@@ -0,0 +1,69 @@
+"""
+Serialização rápida das listagens.
+Converte os dicts dos repositórios direto em bytes JSON com um TypeAdapter
+pré-compilado (pydantic-core), sem criar um modelo Pydantic por item e sem a
+segunda validação do response_model. A saída é idêntica à dos modelos em models.py.
+"""
+from typing import Optional
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+from app.metrics import timed_stage
+
+
+class _TrainerRow(TypedDict):
+    id: int
+    nome: str
+
+
+class _TrainerSummaryRow(TypedDict):
+    treinador_id: int
+    quantidade: int
+    nivel_medio: Optional[float]
+    nivel_maximo: Optional[int]
+    tipos: dict[str, int]
+
+
+class _PokemonRow(TypedDict):
+    id: int
+    nome: str
+    tipo: str
+    nivel: int
+    treinador_id: int
+
+
+class _PokemonSimpleRow(TypedDict):
+    id: int
+    nome: str
+    tipo: str
+    nivel: int
+
+
+# Em modo lax, Decimal inteiro (DynamoDB) vira int e campos extras são ignorados
+_trainers = TypeAdapter(list[_TrainerRow])
+_trainer_summaries = TypeAdapter(list[_TrainerSummaryRow])
+_pokemons = TypeAdapter(list[_PokemonRow])
+_pokemons_simple = TypeAdapter(list[_PokemonSimpleRow])
+
+
+def dump_trainers(items: list[dict]) -> bytes:
+    """Serializa treinadores no formato de list[Trainer]"""
+    with timed_stage("serializacao"):
+        return _trainers.dump_json(_trainers.validate_python(items))
+
+
+def dump_trainer_summaries(items: list[dict]) -> bytes:
+    """Serializa resumos no formato de list[TrainerSummary]"""
+    with timed_stage("serializacao"):
+        return _trainer_summaries.dump_json(_trainer_summaries.validate_python(items))
+
+
+def dump_pokemons(items: list[dict]) -> bytes:
+    """Serializa pokémon no formato de list[Pokemon]"""
+    with timed_stage("serializacao"):
+        return _pokemons.dump_json(_pokemons.validate_python(items))
+
+
+def dump_pokemons_simple(items: list[dict]) -> bytes:
+    """Serializa pokémon no formato de list[PokemonSimple]"""
+    with timed_stage("serializacao"):
+        return _pokemons_simple.dump_json(_pokemons_simple.validate_python(items))
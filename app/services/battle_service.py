@@ -2,41 +2,223 @@
 Serviço de Batalhas.
 Contém a lógica de negócio para simulação de batalhas entre pokémon.
 """
+import asyncio
+import math
+import random
+from concurrent.futures import Executor
+from typing import Callable, Optional
 from fastapi import HTTPException
-from app.models import BattleRequest, BattleResultVictory, BattleResultDraw, BattleWinner
-from app.interfaces.database_interface import IDatabasePokemon
+from app.models import (
+    BattleRequest, BattleBatchRequest, BattleResultVictory, BattleResultDraw, BattleWinner,
+    BattleSimulationRequest, BattleSimulationResult, SimulatedRate
+)
+from app.interfaces.async_database_interface import IAsyncDatabasePokemon
+from app.services.type_chart import TypeChart, DEFAULT_TYPE_CHART
+from app.metrics import timed_stage
 
 
-# Vantagens de tipo: chave vence valor
-TYPE_ADVANTAGES = {
-    "fogo": "planta",
-    "planta": "agua",
-    "agua": "fogo"
-}
+# ============ SIMULAÇÃO (MONTE CARLO) ============
 
+# Força de um confronto em log-odds: cada nível de diferença pesa mais que a
+# vantagem de tipo, então o favorito é sempre o vencedor pelas regras de battle()
+LEVEL_WEIGHT = 0.5
+TYPE_BONUS = 0.4
+# Chance de empate por rodada quando as regras de battle() dariam empate
+DRAW_CHANCE = 0.2
 
-def _normalize_type(tipo: str) -> str:
-    """Normaliza tipo para minúsculas sem acentos"""
-    replacements = {"á": "a", "é": "e", "í": "i", "ó": "o", "ú": "u", "ã": "a"}
-    result = tipo.lower()
-    for accented, plain in replacements.items():
-        result = result.replace(accented, plain)
-    return result
+# Limite de rodadas por requisição (soma de todos os confrontos)
+MAX_SIMULATION_ROUNDS = 100_000_000
+# Rodadas por tarefa enviada ao pool de processos
+ROUNDS_PER_TASK = 1_000_000
+# Abaixo disso a simulação roda no próprio processo (o envio ao pool custa mais)
+INLINE_ROUNDS = 100_000
+
+# Lotes com mais confrontos que isso são resolvidos numa thread, fora do event
+# loop: o trabalho é CPU e travaria as outras requisições enquanto roda
+INLINE_BATTLES = 1000
+
+# z do intervalo de confiança de 95%
+CONFIDENCE_Z = 1.96
+
+# Códigos sorteados por rodada
+_ATTACKER, _DRAW, _DEFENDER = 0, 1, 2
+
+
+def _decide(chart: TypeChart, attacker_nivel: int, attacker_code: int, defender_nivel: int, defender_code: int) -> int:
+    """
+    Aplica as regras de batalha sobre níveis e códigos de tipo.
+    Retorna 1 se o atacante vence, -1 se o defensor vence e 0 em empate.
+    """
+    # Regra 1: Nível maior vence
+    if attacker_nivel != defender_nivel:
+        return 1 if attacker_nivel > defender_nivel else -1
+    # Regra 2: Vantagem de tipo (Regra 3, empate, é o 0 da matriz)
+    return chart.matrix[attacker_code * chart.size + defender_code]
+
+
+def _decide_bulk(chart: TypeChart, levels: list[int], codes: list[int], attackers: list[int], defenders: list[int]) -> list[int]:
+    """
+    Regras de _decide() para um lote inteiro, sobre colunas planas de inteiros:
+    nível e código de tipo por pokémon (em posições densas 0..n-1) e as posições
+    de atacante e defensor de cada confronto. O lote é resolvido numa única
+    compreensão, sem dicts nem chamadas de função por confronto.
+    
+    Sem NumPy (fora das dependências para não pesar o pacote da Vercel/Lambda).
+    As colunas são listas e não array("q"): ler um array cria um int a cada
+    acesso, e nas listas os níveis e códigos pequenos já são objetos prontos.
+    """
+    matrix, size = chart.matrix, chart.size
+    return [
+        (levels[a] > levels[d]) - (levels[a] < levels[d]) or matrix[codes[a] * size + codes[d]]
+        for a, d in zip(attackers, defenders)
+    ]
+
+
+def _round_probabilities(chart: TypeChart, attacker_nivel: int, attacker_code: int, defender_nivel: int, defender_code: int) -> tuple[float, float]:
+    """Probabilidades de vitória do atacante e de empate em uma rodada"""
+    strength = LEVEL_WEIGHT * (attacker_nivel - defender_nivel) + TYPE_BONUS * chart.outcome(attacker_code, defender_code)
+    if strength == 0:
+        return (1 - DRAW_CHANCE) / 2, DRAW_CHANCE
+    return _logistic(strength), 0.0
+
+
+def _logistic(x: float) -> float:
+    """1 / (1 + e^-x) sem overflow: a exponencial é sempre de um valor <= 0"""
+    if x >= 0:
+        return 1 / (1 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1 + z)
+
+
+def _simulate_tasks(tasks: list[tuple[float, float, int, Optional[str]]]) -> list[tuple[int, int]]:
+    """
+    Sorteia as rodadas de cada tarefa (p_vitória, p_empate, rodadas, semente).
+    Roda nos processos do pool; random.choices sorteia a tarefa inteira em C.
+    """
+    counts = []
+    for p_win, p_draw, rounds, seed in tasks:
+        rng = random.Random(seed)
+        draws = rng.choices((_ATTACKER, _DRAW, _DEFENDER), cum_weights=(p_win, p_win + p_draw, 1.0), k=rounds)
+        counts.append((draws.count(_ATTACKER), draws.count(_DRAW)))
+    return counts
+
+
+def _wilson(successes: int, total: int) -> SimulatedRate:
+    """Taxa com intervalo de confiança de Wilson"""
+    rate = successes / total
+    z2 = CONFIDENCE_Z * CONFIDENCE_Z
+    center = (rate + z2 / (2 * total)) / (1 + z2 / total)
+    margin = CONFIDENCE_Z * math.sqrt(rate * (1 - rate) / total + z2 / (4 * total * total)) / (1 + z2 / total)
+    return SimulatedRate(taxa=rate, ic_inferior=max(0.0, center - margin), ic_superior=min(1.0, center + margin))
+
+
+def _to_result(outcome: int, attacker: dict, defender: dict) -> BattleResultVictory | BattleResultDraw:
+    """Converte o resultado numérico no modelo de resposta"""
+    if outcome == 0:
+        return BattleResultDraw()
+    winner, loser = (attacker, defender) if outcome > 0 else (defender, attacker)
+    return BattleResultVictory(
+        vencedor=BattleWinner(id=int(winner["id"]), nome=winner["nome"]),
+        perdedor=BattleWinner(id=int(loser["id"]), nome=loser["nome"])
+    )
+
+
+class DecisionMemo:
+    """
+    Memo limitado das decisões de battle(), compartilhado entre requisições.
+    Com níveis diferentes a decisão é uma comparação (Regra 1); com níveis
+    iguais ela só depende dos dois tipos, então a chave é o par de tipos como
+    veio do repositório e um acerto dispensa normalizar e codificar os textos.
+    """
+    
+    def __init__(self, chart: TypeChart, max_size: int):
+        self._chart = chart
+        self._max_size = max_size
+        self._decisions: dict[tuple[str, str], int] = {}
+        self.lookups = 0
+        self.misses = 0
+    
+    def decide(self, attacker: dict, defender: dict) -> int:
+        """Decisão de uma batalha (1 atacante, -1 defensor, 0 empate)"""
+        attacker_nivel, defender_nivel = int(attacker["nivel"]), int(defender["nivel"])
+        if attacker_nivel != defender_nivel:
+            return 1 if attacker_nivel > defender_nivel else -1
+        self.lookups += 1
+        key = (attacker["tipo"], defender["tipo"])
+        outcome = self._decisions.get(key)
+        return self._compute(key) if outcome is None else outcome
+    
+    def decide_many(self, pokemons: dict[int, dict], pairs: list[tuple[int, int]]) -> list[int]:
+        """
+        Decisões de um lote, na ordem de `pairs`: os níveis são convertidos uma
+        vez por pokémon e só os confrontos de mesmo nível consultam o memo.
+        """
+        levels = {pid: int(p["nivel"]) for pid, p in pokemons.items()}
+        decisions = self._decisions
+        outcomes = []
+        lookups = 0
+        for a, d in pairs:
+            attacker_nivel, defender_nivel = levels[a], levels[d]
+            if attacker_nivel != defender_nivel:
+                outcomes.append(1 if attacker_nivel > defender_nivel else -1)
+                continue
+            lookups += 1
+            key = (pokemons[a]["tipo"], pokemons[d]["tipo"])
+            outcome = decisions.get(key)
+            outcomes.append(self._compute(key) if outcome is None else outcome)
+        self.lookups += lookups
+        return outcomes
+    
+    def _compute(self, key: tuple[str, str]) -> int:
+        self.misses += 1
+        chart = self._chart
+        outcome = chart.outcome(chart.code(key[0]), chart.code(key[1]))
+        if len(self._decisions) >= self._max_size:
+            # Os pares de tipos reais são poucos; encher o memo indica texto livre
+            # variado, e recomeçar custa menos que manter ordem de uso
+            self._decisions.clear()
+        self._decisions[key] = outcome
+        return outcome
+    
+    def stats(self) -> dict:
+        """Contadores de acerto/erro e ocupação"""
+        hits = self.lookups - self.misses
+        return {
+            "hits": hits,
+            "misses": self.misses,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "size": len(self._decisions),
+            "max_size": self._max_size
+        }
 
 
 class BattleService:
     """Serviço responsável pelas batalhas entre Pokémon"""
     
-    def __init__(self, pokemon_repo: IDatabasePokemon):
+    def __init__(
+        self,
+        pokemon_repo: IAsyncDatabasePokemon,
+        type_chart: TypeChart = DEFAULT_TYPE_CHART,
+        simulation_executor: Executor = None,
+        memo: DecisionMemo = None,
+        simulation_executor_factory: Callable[[], Optional[Executor]] = None
+    ):
         self._pokemon_repo = pokemon_repo
+        self._type_chart = type_chart
+        # Memo de decisões (None: decide a cada batalha)
+        self._memo = memo
+        # Pool de processos da simulação (None: threads do event loop); com a
+        # fábrica, o pool só é pedido quando uma simulação grande precisa dele
+        self._simulation_executor = simulation_executor
+        self._simulation_executor_factory = simulation_executor_factory
     
-    def battle(self, data: BattleRequest) -> BattleResultVictory | BattleResultDraw:
+    async def battle(self, data: BattleRequest) -> BattleResultVictory | BattleResultDraw:
         """
         Simula uma batalha entre dois pokémon.
         
         Regras:
         1. Pokémon com nível maior vence
-        2. Em empate de nível, tipo decide (Fogo > Planta > Água > Fogo)
+        2. Em empate de nível, tipo decide (tabela de tipos; padrão Fogo > Planta > Água > Fogo)
         3. Se nível e tipo forem iguais, empate
         """
         # Validar: não pode batalhar contra si mesmo
@@ -46,9 +228,10 @@ class BattleService:
                 detail="Um Pokémon não pode batalhar contra ele mesmo"
             )
         
-        # Buscar pokémon
-        attacker = self._pokemon_repo.get(data.pokemon_atacante_id)
-        defender = self._pokemon_repo.get(data.pokemon_defensor_id)
+        # Buscar pokémon (os dois em uma única leitura)
+        found = await self._pokemon_repo.get_many([data.pokemon_atacante_id, data.pokemon_defensor_id])
+        attacker = found.get(data.pokemon_atacante_id)
+        defender = found.get(data.pokemon_defensor_id)
         
         # Validar existência
         if not attacker:
@@ -57,31 +240,155 @@ class BattleService:
             raise HTTPException(status_code=404, detail="Pokémon defensor não encontrado")
         
         # Converter níveis (DynamoDB retorna Decimal)
-        attacker_nivel = int(attacker["nivel"])
-        defender_nivel = int(defender["nivel"])
+        if self._memo is not None:
+            return _to_result(self._memo.decide(attacker, defender), attacker, defender)
+        chart = self._type_chart
+        outcome = _decide(
+            chart,
+            int(attacker["nivel"]), chart.code(attacker["tipo"]),
+            int(defender["nivel"]), chart.code(defender["tipo"])
+        )
+        return _to_result(outcome, attacker, defender)
+    
+    def memo_stats(self) -> dict:
+        """Contadores do memo de decisões"""
+        if self._memo is None:
+            raise HTTPException(status_code=404, detail="Memo de decisões desativado")
+        return self._memo.stats()
+    
+    async def battle_batch(self, data: BattleBatchRequest) -> list[BattleResultVictory | BattleResultDraw]:
+        """
+        Resolve um lote de batalhas com as mesmas regras de battle().
+        Todos os pokémon envolvidos são buscados em uma única leitura, cada um
+        é codificado uma só vez em colunas planas de inteiros (nível, tipo) e
+        os confrontos são resolvidos de uma vez (_decide_bulk); o resultado
+        segue a ordem de entrada.
+        """
+        pairs = [(b.pokemon_atacante_id, b.pokemon_defensor_id) for b in data.batalhas]
+        pokemons = await self._load_pairs(pairs)
+        if len(pairs) <= INLINE_BATTLES:
+            return self._resolve_batch(pokemons, pairs)
+        return await asyncio.to_thread(self._resolve_batch, pokemons, pairs)
+    
+    def _resolve_batch(self, pokemons: dict[int, dict], pairs: list[tuple[int, int]]) -> list[BattleResultVictory | BattleResultDraw]:
+        """Decide os confrontos e monta as respostas (só CPU, sem I/O)"""
+        if self._memo is not None:
+            outcomes = self._memo.decide_many(pokemons, pairs)
+        else:
+            # Colunas por pokémon (nível convertido e tipo codificado) na posição densa de cada um
+            chart = self._type_chart
+            positions = {pid: position for position, pid in enumerate(pokemons)}
+            outcomes = _decide_bulk(
+                chart,
+                [int(p["nivel"]) for p in pokemons.values()],
+                [chart.code(p["tipo"]) for p in pokemons.values()],
+                [positions[a] for a, _ in pairs],
+                [positions[d] for _, d in pairs]
+            )
+        
+        # Modelos de resposta montados uma vez por pokémon e reaproveitados
+        with timed_stage("modelos_batalha"):
+            fighters = {pid: BattleWinner(id=int(p["id"]), nome=p["nome"]) for pid, p in pokemons.items()}
+            draw = BattleResultDraw()
+            results = []
+            for outcome, (a, d) in zip(outcomes, pairs):
+                if outcome == 0:
+                    results.append(draw)
+                    continue
+                winner, loser = (a, d) if outcome > 0 else (d, a)
+                results.append(BattleResultVictory(vencedor=fighters[winner], perdedor=fighters[loser]))
+        return results
+    
+    async def simulate(self, data: BattleSimulationRequest) -> list[BattleSimulationResult]:
+        """
+        Simula `rodadas` rodadas aleatórias de cada confronto.
+        A chance de vitória por rodada cresce com a diferença de nível e recebe
+        um bônus de tipo; empates só ocorrem onde battle() daria empate.
+        Simulações grandes são divididas em tarefas e espalhadas pelo pool de processos.
+        """
+        pairs = [(b.pokemon_atacante_id, b.pokemon_defensor_id) for b in data.batalhas]
+        total_rounds = len(pairs) * data.rodadas
+        if total_rounds > MAX_SIMULATION_ROUNDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Simulação grande demais ({total_rounds} rodadas, máximo {MAX_SIMULATION_ROUNDS})"
+            )
+        pokemons = await self._load_pairs(pairs)
+        
+        chart = self._type_chart
+        probabilities = [
+            _round_probabilities(
+                chart,
+                int(pokemons[a]["nivel"]), chart.code(pokemons[a]["tipo"]),
+                int(pokemons[d]["nivel"]), chart.code(pokemons[d]["tipo"])
+            )
+            for a, d in pairs
+        ]
         
-        winner = None
-        loser = None
+        # Cada confronto vira tarefas de até ROUNDS_PER_TASK rodadas; tarefas
+        # pequenas são agrupadas para o envio ao pool compensar
+        groups: list[list[tuple[float, float, int, Optional[str]]]] = [[]]
+        owners: list[list[int]] = [[]]
+        group_rounds = 0
+        for index, (p_win, p_draw) in enumerate(probabilities):
+            for chunk, start in enumerate(range(0, data.rodadas, ROUNDS_PER_TASK)):
+                rounds = min(ROUNDS_PER_TASK, data.rodadas - start)
+                seed = None if data.semente is None else f"{data.semente}:{index}:{chunk}"
+                if group_rounds + rounds > ROUNDS_PER_TASK and groups[-1]:
+                    groups.append([])
+                    owners.append([])
+                    group_rounds = 0
+                groups[-1].append((p_win, p_draw, rounds, seed))
+                owners[-1].append(index)
+                group_rounds += rounds
         
-        # Regra 1: Nível maior vence
-        if attacker_nivel > defender_nivel:
-            winner, loser = attacker, defender
-        elif defender_nivel > attacker_nivel:
-            winner, loser = defender, attacker
+        if total_rounds <= INLINE_ROUNDS:
+            group_counts = [_simulate_tasks(group) for group in groups]
         else:
-            # Regra 2: Vantagem de tipo
-            attacker_type = _normalize_type(attacker["tipo"])
-            defender_type = _normalize_type(defender["tipo"])
-            
-            if TYPE_ADVANTAGES.get(attacker_type) == defender_type:
-                winner, loser = attacker, defender
-            elif TYPE_ADVANTAGES.get(defender_type) == attacker_type:
-                winner, loser = defender, attacker
-            else:
-                # Regra 3: Empate
-                return BattleResultDraw()
+            executor = self._simulation_executor
+            if executor is None and self._simulation_executor_factory is not None:
+                executor = self._simulation_executor_factory()
+            loop = asyncio.get_running_loop()
+            group_counts = await asyncio.gather(*(
+                loop.run_in_executor(executor, _simulate_tasks, group) for group in groups
+            ))
         
-        return BattleResultVictory(
-            vencedor=BattleWinner(id=int(winner["id"]), nome=winner["nome"]),
-            perdedor=BattleWinner(id=int(loser["id"]), nome=loser["nome"])
-        )
+        wins = [0] * len(pairs)
+        draws = [0] * len(pairs)
+        for counts, indexes in zip(group_counts, owners):
+            for (task_wins, task_draws), index in zip(counts, indexes):
+                wins[index] += task_wins
+                draws[index] += task_draws
+        
+        rounds = data.rodadas
+        return [
+            BattleSimulationResult(
+                pokemon_atacante_id=a,
+                pokemon_defensor_id=d,
+                rodadas=rounds,
+                vitorias_atacante=wins[index],
+                empates=draws[index],
+                vitorias_defensor=rounds - wins[index] - draws[index],
+                atacante=_wilson(wins[index], rounds),
+                empate=_wilson(draws[index], rounds),
+                defensor=_wilson(rounds - wins[index] - draws[index], rounds)
+            )
+            for index, (a, d) in enumerate(pairs)
+        ]
+    
+    async def _load_pairs(self, pairs: list[tuple[int, int]]) -> dict[int, dict]:
+        """Valida os confrontos e busca todos os pokémon envolvidos em uma única leitura"""
+        for attacker_id, defender_id in pairs:
+            if attacker_id == defender_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Um Pokémon não pode batalhar contra ele mesmo (id {attacker_id})"
+                )
+        
+        pokemons = await self._pokemon_repo.get_many([pid for pair in pairs for pid in pair])
+        for attacker_id, defender_id in pairs:
+            if attacker_id not in pokemons:
+                raise HTTPException(status_code=404, detail=f"Pokémon atacante não encontrado (id {attacker_id})")
+            if defender_id not in pokemons:
+                raise HTTPException(status_code=404, detail=f"Pokémon defensor não encontrado (id {defender_id})")
+        return pokemons
@@ -0,0 +1,114 @@
+"""
+Serviço de Jobs.
+Acompanha operações executadas em segundo plano (ex.: exclusão em cascata de treinador).
+Os jobs ficam no repositório de jobs (no DynamoDB, visíveis a todas as instâncias)
+e rodam fora da requisição que os criou: numa invocação assíncrona da função de
+jobs (JOBS_FUNCTION) ou, sem ela, em segundo plano no próprio processo.
+"""
+import asyncio
+import json
+import uuid
+from functools import partial
+from typing import Awaitable, Callable, Optional
+from fastapi import HTTPException
+from app.models import Job
+from app.interfaces.async_database_interface import IAsyncDatabaseJob
+
+
+# Operação de um tipo de job: recebe os parâmetros e retorna a quantidade de itens afetados
+JobHandler = Callable[[dict], Awaitable[int]]
+
+# Status finais (entregas repetidas de um job já encerrado não o executam de novo)
+FINISHED = ("concluido", "erro")
+
+
+class LambdaJobDispatcher:
+    """Entrega o job à função de jobs numa invocação assíncrona (InvocationType=Event)"""
+    
+    def __init__(self, function_name: str):
+        self._function_name = function_name
+        self._client = None
+    
+    def __call__(self, job_id: str) -> None:
+        if self._client is None:
+            # boto3 só é importado quando há função de jobs (custa no cold start)
+            import boto3
+            self._client = boto3.client("lambda")
+        self._client.invoke(
+            FunctionName=self._function_name,
+            InvocationType="Event",
+            Payload=json.dumps({"job_id": job_id}).encode()
+        )
+
+
+def _to_job(item: dict) -> Job:
+    """Converte o registro do repositório no modelo de resposta (DynamoDB retorna Decimal)"""
+    affected = item.get("itens_afetados")
+    return Job(
+        id=item["id"],
+        tipo=item["tipo"],
+        status=item["status"],
+        itens_afetados=int(affected) if affected is not None else None,
+        erro=item.get("erro")
+    )
+
+
+class JobService:
+    """Serviço responsável pelo registro e execução de jobs em segundo plano"""
+    
+    def __init__(self, job_repo: IAsyncDatabaseJob, dispatcher: Optional[Callable[[str], None]] = None):
+        self._job_repo = job_repo
+        # Entrega fora de banda (None: roda no próprio processo, depois da resposta)
+        self._dispatcher = dispatcher
+        self._handlers: dict[str, JobHandler] = {}
+    
+    def register(self, tipo: str, handler: JobHandler) -> None:
+        """Associa um tipo de job à operação que o executa"""
+        self._handlers[tipo] = handler
+    
+    async def create(self, tipo: str, parametros: dict) -> Job:
+        """Registra um novo job pendente"""
+        item = {"id": uuid.uuid4().hex, "tipo": tipo, "status": "pendente", "parametros": parametros}
+        await self._job_repo.save(item)
+        return _to_job(item)
+    
+    async def get(self, job_id: str) -> Job:
+        """Busca job por ID"""
+        item = await self._job_repo.get(job_id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Job não encontrado")
+        return _to_job(item)
+    
+    async def submit(self, job_id: str) -> Optional[Callable[[], Awaitable[None]]]:
+        """
+        Dispara o job. Com a função de jobs a invocação sai agora e retorna None;
+        sem ela, retorna a tarefa que a rota agenda para depois da resposta.
+        """
+        if self._dispatcher is None:
+            return partial(self.run, job_id)
+        try:
+            await asyncio.to_thread(self._dispatcher, job_id)
+        except Exception as e:
+            await self._finish(job_id, {"status": "erro", "erro": f"Falha ao iniciar o job: {e}"})
+            raise HTTPException(status_code=503, detail="Não foi possível iniciar o job")
+        return None
+    
+    async def run(self, job_id: str) -> None:
+        """Executa o job e registra o resultado (quantidade de itens afetados)"""
+        item = await self._job_repo.get(job_id)
+        if item is None or item["status"] in FINISHED:
+            return
+        item["status"] = "executando"
+        await self._job_repo.save(item)
+        try:
+            item["itens_afetados"] = await self._handlers[item["tipo"]](item["parametros"])
+            item["status"] = "concluido"
+        except Exception as e:
+            item["status"] = "erro"
+            item["erro"] = str(e)
+        await self._job_repo.save(item)
+    
+    async def _finish(self, job_id: str, changes: dict) -> None:
+        item = await self._job_repo.get(job_id)
+        if item is not None:
+            await self._job_repo.save({**item, **changes})
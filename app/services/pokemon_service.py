@@ -2,32 +2,59 @@
 Serviço de Pokémon.
 Contém a lógica de negócio para operações com pokémon.
 """
+from typing import Optional
 from fastapi import HTTPException
-from app.models import PokemonCreate, PokemonUpdate, Pokemon, PokemonSimple
-from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+from app.models import PokemonCreate, PokemonBatchCreate, PokemonUpdate, Pokemon
+from app.serializers import dump_pokemons, dump_pokemons_simple
+from app.repositories.query import decode_position, encode_position
+from app.interfaces.async_database_interface import IAsyncDatabaseTrainer, IAsyncDatabasePokemon
 
 
 class PokemonService:
     """Serviço responsável pelas operações de Pokémon"""
     
-    def __init__(self, pokemon_repo: IDatabasePokemon, trainer_repo: IDatabaseTrainer):
+    def __init__(self, pokemon_repo: IAsyncDatabasePokemon, trainer_repo: IAsyncDatabaseTrainer):
         self._pokemon_repo = pokemon_repo
         self._trainer_repo = trainer_repo
     
-    def list_all(self) -> list[Pokemon]:
-        """Lista todos os pokémon"""
-        pokemons = self._pokemon_repo.list_all()
-        return [Pokemon(
-            id=int(p["id"]),
-            nome=p["nome"],
-            tipo=p["tipo"],
-            nivel=int(p["nivel"]),
-            treinador_id=int(p["treinador_id"])
-        ) for p in pokemons]
+    async def list_page_json(self, limit: int, cursor: Optional[str] = None) -> tuple[bytes, Optional[str]]:
+        """Lista uma página de pokémon já serializada em JSON"""
+        try:
+            pokemons, next_cursor = await self._pokemon_repo.list_page(limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        return dump_pokemons(pokemons), next_cursor
     
-    def get_by_id(self, pokemon_id: int) -> Pokemon:
+    async def find_json(
+        self,
+        tipo: Optional[str] = None,
+        nivel_min: Optional[int] = None,
+        nivel_max: Optional[int] = None,
+        treinador_id: Optional[int] = None,
+        sort: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> tuple[bytes, Optional[str]]:
+        """
+        Busca uma página de pokémon filtrados/ordenados já serializada em JSON.
+        O cursor guarda a posição (campo de sort, ID) do último item da página.
+        """
+        try:
+            after = decode_position(cursor, sort)
+            # Um item a mais diz se há próxima página
+            pokemons = await self._pokemon_repo.find(tipo, nivel_min, nivel_max, treinador_id, sort, limit + 1, after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        next_cursor = encode_position(pokemons[limit - 1], sort) if len(pokemons) > limit else None
+        return dump_pokemons(pokemons[:limit]), next_cursor
+    
+    async def ranking_json(self, top: int, tipo: Optional[str] = None, treinador_id: Optional[int] = None) -> bytes:
+        """Os `top` pokémon de maior nível (geral, por tipo e/ou por treinador), empates por ID"""
+        return dump_pokemons(await self._pokemon_repo.find(tipo=tipo, treinador_id=treinador_id, sort="-nivel", limit=top))
+    
+    async def get_by_id(self, pokemon_id: int) -> Pokemon:
         """Busca pokémon por ID"""
-        pokemon = self._pokemon_repo.get(pokemon_id)
+        pokemon = await self._pokemon_repo.get(pokemon_id)
         if not pokemon:
             raise HTTPException(status_code=404, detail="Pokémon não encontrado")
         return Pokemon(
@@ -38,27 +65,23 @@ class PokemonService:
             treinador_id=int(pokemon["treinador_id"])
         )
     
-    def get_by_trainer(self, trainer_id: int) -> list[PokemonSimple]:
-        """Lista pokémon de um treinador"""
-        # Verificar se treinador existe
-        if not self._trainer_repo.get(trainer_id):
+    async def get_by_trainer_json(self, trainer_id: int) -> bytes:
+        """Lista pokémon de um treinador já serializados em JSON"""
+        if not await self._trainer_repo.get(trainer_id):
             raise HTTPException(status_code=404, detail="Treinador não encontrado")
-        
-        pokemons = self._pokemon_repo.get_by_trainer(trainer_id)
-        return [PokemonSimple(
-            id=int(p["id"]),
-            nome=p["nome"],
-            tipo=p["tipo"],
-            nivel=int(p["nivel"])
-        ) for p in pokemons]
+        return dump_pokemons_simple(await self._pokemon_repo.get_by_trainer(trainer_id))
     
-    def create(self, data: PokemonCreate) -> Pokemon:
+    async def create(self, data: PokemonCreate) -> Pokemon:
         """Cria um novo pokémon"""
         # Validar se treinador existe
-        if not self._trainer_repo.get(data.treinador_id):
+        if not await self._trainer_repo.get(data.treinador_id):
             raise HTTPException(status_code=400, detail="Treinador não encontrado")
         
-        pokemon = self._pokemon_repo.create(data.nome, data.tipo, data.nivel, data.treinador_id)
+        try:
+            pokemon = await self._pokemon_repo.create(data.nome, data.tipo, data.nivel, data.treinador_id)
+        except ValueError:
+            # Treinador excluído entre a validação e a gravação
+            raise HTTPException(status_code=400, detail="Treinador não encontrado")
         return Pokemon(
             id=int(pokemon["id"]),
             nome=pokemon["nome"],
@@ -67,9 +90,29 @@ class PokemonService:
             treinador_id=int(pokemon["treinador_id"])
         )
     
-    def update(self, pokemon_id: int, data: PokemonUpdate) -> Pokemon:
+    async def create_many(self, data: PokemonBatchCreate) -> list[Pokemon]:
+        """Cria vários pokémon de uma vez (treinadores validados em uma leitura)"""
+        trainer_ids = list(dict.fromkeys(p.treinador_id for p in data.pokemons))
+        found = await self._trainer_repo.get_many(trainer_ids)
+        for trainer_id in trainer_ids:
+            if trainer_id not in found:
+                raise HTTPException(status_code=400, detail=f"Treinador não encontrado (id {trainer_id})")
+        
+        try:
+            pokemons = await self._pokemon_repo.create_many([p.model_dump() for p in data.pokemons])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Treinador não encontrado")
+        return [Pokemon(
+            id=int(p["id"]),
+            nome=p["nome"],
+            tipo=p["tipo"],
+            nivel=int(p["nivel"]),
+            treinador_id=int(p["treinador_id"])
+        ) for p in pokemons]
+    
+    async def update(self, pokemon_id: int, data: PokemonUpdate) -> Pokemon:
         """Atualiza um pokémon"""
-        pokemon = self._pokemon_repo.update(pokemon_id, data.nome, data.tipo, data.nivel)
+        pokemon = await self._pokemon_repo.update(pokemon_id, data.nome, data.tipo, data.nivel)
         if not pokemon:
             raise HTTPException(status_code=404, detail="Pokémon não encontrado")
         return Pokemon(
@@ -80,13 +123,9 @@ class PokemonService:
             treinador_id=int(pokemon["treinador_id"])
         )
     
-    def delete(self, pokemon_id: int) -> bool:
+    async def delete(self, pokemon_id: int) -> bool:
         """Deleta um pokémon"""
-        if not self._pokemon_repo.get(pokemon_id):
+        if not await self._pokemon_repo.get(pokemon_id):
             raise HTTPException(status_code=404, detail="Pokémon não encontrado")
-        self._pokemon_repo.delete(pokemon_id)
+        await self._pokemon_repo.delete(pokemon_id)
         return True
-    
-    def get_raw(self, pokemon_id: int) -> dict | None:
-        """Retorna dados brutos do pokémon (para batalhas)"""
-        return self._pokemon_repo.get(pokemon_id)
@@ -0,0 +1,129 @@
+"""
+Serviço de Torneios.
+Executa torneios todos-contra-todos usando as regras do BattleService.
+"""
+import asyncio
+from collections import Counter
+from fastapi import HTTPException
+from app.models import TournamentRequest, TournamentResult, TournamentStanding
+from app.interfaces.async_database_interface import IAsyncDatabaseTrainer, IAsyncDatabasePokemon
+from app.services.type_chart import TypeChart, DEFAULT_TYPE_CHART
+
+
+# Pontuação da classificação
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+# Torneios com mais participantes que isso são calculados numa thread, fora do
+# event loop (agrupar, ordenar e montar a classificação é só CPU)
+INLINE_PARTICIPANTS = 1000
+
+
+class TournamentService:
+    """Serviço responsável pelos torneios entre Pokémon"""
+    
+    def __init__(self, pokemon_repo: IAsyncDatabasePokemon, trainer_repo: IAsyncDatabaseTrainer, type_chart: TypeChart = DEFAULT_TYPE_CHART):
+        self._pokemon_repo = pokemon_repo
+        self._trainer_repo = trainer_repo
+        self._type_chart = type_chart
+    
+    async def run(self, data: TournamentRequest) -> TournamentResult:
+        """
+        Cada pokémon enfrenta todos os outros uma vez.
+        
+        O resultado de uma batalha depende só de (nível, tipo), então os
+        participantes são agrupados por essa chave e as vitórias/empates/derrotas
+        de cada grupo saem de contagens, sem montar a matriz N×N de confrontos.
+        """
+        pokemons = await self._collect_participants(data)
+        if len(pokemons) < 2:
+            raise HTTPException(status_code=400, detail="O torneio precisa de pelo menos 2 pokémon")
+        if len(pokemons) <= INLINE_PARTICIPANTS:
+            return self._standings(pokemons)
+        return await asyncio.to_thread(self._standings, pokemons)
+    
+    def _standings(self, pokemons: list[dict]) -> TournamentResult:
+        """Classificação a partir dos participantes (só CPU, sem I/O)"""
+        # Colunas compactas: nível e código de tipo por participante
+        chart = self._type_chart
+        keys = [(int(p["nivel"]), chart.code(p["tipo"])) for p in pokemons]
+        group_sizes = Counter(keys)
+        level_sizes = Counter(level for level, _ in keys)
+        
+        # Quantos participantes têm nível estritamente menor
+        below = {}
+        seen = 0
+        for level in sorted(level_sizes):
+            below[level] = seen
+            seen += level_sizes[level]
+        
+        # Tipos presentes em cada nível
+        level_types: dict[int, list[int]] = {}
+        for level, code in group_sizes:
+            level_types.setdefault(level, []).append(code)
+        
+        total = len(pokemons)
+        records = {}
+        for (level, code) in group_sizes:
+            # Regra 2: no mesmo nível, a vantagem de tipo decide
+            type_wins = type_losses = 0
+            for other in level_types[level]:
+                outcome = chart.outcome(code, other)
+                if outcome > 0:
+                    type_wins += group_sizes[(level, other)]
+                elif outcome < 0:
+                    type_losses += group_sizes[(level, other)]
+            # Regra 1: nível maior vence
+            wins = below[level] + type_wins
+            losses = total - below[level] - level_sizes[level] + type_losses
+            # Regra 3: o restante do mesmo nível empata (menos o próprio pokémon)
+            draws = level_sizes[level] - 1 - type_wins - type_losses
+            records[(level, code)] = (wins, draws, losses)
+        
+        rows = []
+        for pokemon, key in zip(pokemons, keys):
+            wins, draws, losses = records[key]
+            rows.append((wins * POINTS_WIN + draws * POINTS_DRAW, wins, draws, losses, pokemon))
+        rows.sort(key=lambda row: (-row[0], -row[1], int(row[4]["id"])))
+        
+        return TournamentResult(
+            participantes=total,
+            batalhas=total * (total - 1) // 2,
+            classificacao=[
+                TournamentStanding(
+                    posicao=position,
+                    id=int(pokemon["id"]),
+                    nome=pokemon["nome"],
+                    treinador_id=int(pokemon["treinador_id"]),
+                    vitorias=wins,
+                    empates=draws,
+                    derrotas=losses,
+                    pontos=points
+                )
+                for position, (points, wins, draws, losses, pokemon) in enumerate(rows, start=1)
+            ]
+        )
+    
+    async def _collect_participants(self, data: TournamentRequest) -> list[dict]:
+        """Reúne os pokémon dos treinadores e os IDs avulsos, sem repetição"""
+        participants: dict[int, dict] = {}
+        trainer_ids = list(dict.fromkeys(data.treinador_ids))
+        if trainer_ids:
+            found_trainers = await self._trainer_repo.get_many(trainer_ids)
+            for trainer_id in trainer_ids:
+                if trainer_id not in found_trainers:
+                    raise HTTPException(status_code=404, detail=f"Treinador não encontrado (id {trainer_id})")
+            # Elencos dos treinadores buscados em paralelo
+            rosters = await asyncio.gather(*(self._pokemon_repo.get_by_trainer(tid) for tid in trainer_ids))
+            for roster in rosters:
+                for pokemon in roster:
+                    participants[int(pokemon["id"])] = pokemon
+        
+        missing_ids = [pid for pid in dict.fromkeys(data.pokemon_ids) if pid not in participants]
+        if missing_ids:
+            found = await self._pokemon_repo.get_many(missing_ids)
+            for pid in missing_ids:
+                if pid not in found:
+                    raise HTTPException(status_code=404, detail=f"Pokémon não encontrado (id {pid})")
+                participants[pid] = found[pid]
+        return list(participants.values())
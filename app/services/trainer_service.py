@@ -2,55 +2,107 @@
 Serviço de Treinadores.
 Contém a lógica de negócio para operações com treinadores.
 """
+from typing import Optional
 from fastapi import HTTPException
-from app.models import TrainerCreate, TrainerUpdate, Trainer
-from app.interfaces.database_interface import IDatabaseTrainer, IDatabasePokemon
+from app.models import TrainerCreate, TrainerBatchCreate, TrainerUpdate, Trainer, TrainerSummary, Job
+from app.services.job_service import JobService
+from app.serializers import dump_trainers, dump_trainer_summaries
+from app.interfaces.async_database_interface import IAsyncDatabaseTrainer, IAsyncDatabasePokemon
+
+
+# Tipo do job de exclusão em cascata (parâmetros: treinador_id)
+DELETE_JOB = "exclusao_treinador"
 
 
 class TrainerService:
     """Serviço responsável pelas operações de Treinador"""
     
-    def __init__(self, trainer_repo: IDatabaseTrainer, pokemon_repo: IDatabasePokemon):
+    def __init__(self, trainer_repo: IAsyncDatabaseTrainer, pokemon_repo: IAsyncDatabasePokemon):
         self._trainer_repo = trainer_repo
         self._pokemon_repo = pokemon_repo
     
-    def list_all(self) -> list[Trainer]:
-        """Lista todos os treinadores"""
-        trainers = self._trainer_repo.list_all()
-        return [Trainer(id=int(t["id"]), nome=t["nome"]) for t in trainers]
+    async def list_page_json(self, limit: int, cursor: Optional[str] = None) -> tuple[bytes, Optional[str]]:
+        """Lista uma página de treinadores já serializada em JSON"""
+        try:
+            trainers, next_cursor = await self._trainer_repo.list_page(limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        return dump_trainers(trainers), next_cursor
     
-    def get_by_id(self, trainer_id: int) -> Trainer:
+    async def get_by_id(self, trainer_id: int) -> Trainer:
         """Busca treinador por ID"""
-        trainer = self._trainer_repo.get(trainer_id)
+        trainer = await self._trainer_repo.get(trainer_id)
         if not trainer:
             raise HTTPException(status_code=404, detail="Treinador não encontrado")
         return Trainer(id=int(trainer["id"]), nome=trainer["nome"])
     
-    def create(self, data: TrainerCreate) -> Trainer:
+    async def get_summary(self, trainer_id: int) -> TrainerSummary:
+        """Resumo dos pokémon do treinador (contadores mantidos pelo repositório)"""
+        if not await self._trainer_repo.get(trainer_id):
+            raise HTTPException(status_code=404, detail="Treinador não encontrado")
+        summaries = await self._pokemon_repo.get_summaries([trainer_id])
+        return TrainerSummary(**summaries[trainer_id])
+    
+    async def list_summaries_json(
+        self,
+        trainer_ids: Optional[list[int]] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> tuple[bytes, Optional[str]]:
+        """
+        Resumos de vários treinadores já serializados em JSON; IDs inexistentes são ignorados.
+        Sem IDs, resume uma página de treinadores e retorna o cursor da próxima.
+        """
+        next_cursor = None
+        if trainer_ids is None:
+            try:
+                trainers, next_cursor = await self._trainer_repo.list_page(limit, cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Cursor inválido")
+            ids = [int(t["id"]) for t in trainers]
+        else:
+            found = await self._trainer_repo.get_many(trainer_ids)
+            ids = [tid for tid in dict.fromkeys(trainer_ids) if tid in found]
+        summaries = await self._pokemon_repo.get_summaries(ids)
+        return dump_trainer_summaries([summaries[tid] for tid in ids]), next_cursor
+    
+    async def create(self, data: TrainerCreate) -> Trainer:
         """Cria um novo treinador"""
-        trainer = self._trainer_repo.create(data.nome)
+        trainer = await self._trainer_repo.create(data.nome)
         return Trainer(id=int(trainer["id"]), nome=trainer["nome"])
     
-    def update(self, trainer_id: int, data: TrainerUpdate) -> Trainer:
+    async def create_many(self, data: TrainerBatchCreate) -> list[Trainer]:
+        """Cria vários treinadores de uma vez"""
+        trainers = await self._trainer_repo.create_many([t.nome for t in data.treinadores])
+        return [Trainer(id=int(t["id"]), nome=t["nome"]) for t in trainers]
+    
+    async def update(self, trainer_id: int, data: TrainerUpdate) -> Trainer:
         """Atualiza um treinador"""
-        trainer = self._trainer_repo.update(trainer_id, data.nome)
+        trainer = await self._trainer_repo.update(trainer_id, data.nome)
         if not trainer:
             raise HTTPException(status_code=404, detail="Treinador não encontrado")
         return Trainer(id=int(trainer["id"]), nome=trainer["nome"])
     
-    def delete(self, trainer_id: int) -> bool:
+    async def delete(self, trainer_id: int) -> bool:
         """Deleta treinador e seus pokémon"""
-        trainer = self._trainer_repo.get(trainer_id)
+        trainer = await self._trainer_repo.get(trainer_id)
         if not trainer:
             raise HTTPException(status_code=404, detail="Treinador não encontrado")
-        
+        await self.delete_cascade(trainer_id)
+        return True
+    
+    async def start_delete(self, trainer_id: int, jobs: JobService) -> Job:
+        """Valida o treinador e registra um job de exclusão (executado por delete_cascade)"""
+        trainer = await self._trainer_repo.get(trainer_id)
+        if not trainer:
+            raise HTTPException(status_code=404, detail="Treinador não encontrado")
+        return await jobs.create(DELETE_JOB, {"treinador_id": trainer_id})
+    
+    async def delete_cascade(self, trainer_id: int) -> int:
+        """Deleta os pokémon e depois o treinador; retorna quantos pokémon foram removidos"""
         # Deletar pokémon do treinador primeiro (integridade referencial)
-        self._pokemon_repo.delete_by_trainer(trainer_id)
+        removed = await self._pokemon_repo.delete_by_trainer(trainer_id)
         
         # Deletar treinador
-        self._trainer_repo.delete(trainer_id)
-        return True
-    
-    def exists(self, trainer_id: int) -> bool:
-        """Verifica se treinador existe"""
-        return self._trainer_repo.get(trainer_id) is not None
+        await self._trainer_repo.delete(trainer_id)
+        return removed
@@ -0,0 +1,77 @@
+"""
+Tabela de vantagens de tipo.
+Os tipos são normalizados e convertidos em códigos inteiros uma única vez
+(cache por texto recebido); o resultado de cada confronto de tipos fica em uma
+matriz pré-calculada, consultada por índice durante as batalhas.
+"""
+import json
+from typing import Iterable
+
+
+# Vantagens padrão: cada tipo vence os tipos da lista (Fogo > Planta > Água > Fogo)
+DEFAULT_TYPE_ADVANTAGES = {
+    "fogo": ["planta"],
+    "planta": ["agua"],
+    "agua": ["fogo"]
+}
+
+# Código dos tipos fora da tabela (nunca têm vantagem)
+UNKNOWN_TYPE = 0
+
+# Limite do cache de textos já codificados (tipos são texto livre na API)
+MAX_CACHED_NAMES = 4096
+
+_ACCENTS = str.maketrans("áéíóúã", "aeioua")
+
+
+def normalize_type(tipo: str) -> str:
+    """Normaliza tipo para minúsculas sem acentos"""
+    return tipo.lower().translate(_ACCENTS)
+
+
+class TypeChart:
+    """Códigos de tipo + matriz de resultados (1 atacante vence, -1 defensor vence, 0 neutro)"""
+    
+    def __init__(self, advantages: dict[str, Iterable[str]]):
+        normalized = {
+            normalize_type(strong): {normalize_type(weak) for weak in weaks}
+            for strong, weaks in advantages.items()
+        }
+        names = sorted(set(normalized) | {weak for weaks in normalized.values() for weak in weaks})
+        self._codes = {name: code for code, name in enumerate(names, start=UNKNOWN_TYPE + 1)}
+        self.size = len(names) + 1
+        
+        # matrix[atacante * size + defensor]; vantagem mútua se anula
+        self.matrix = [0] * (self.size * self.size)
+        for strong, weaks in normalized.items():
+            for weak in weaks - {strong}:
+                a, d = self._codes[strong], self._codes[weak]
+                if self.matrix[a * self.size + d] == 0:
+                    self.matrix[a * self.size + d] = 1
+                    self.matrix[d * self.size + a] = -1
+                else:
+                    self.matrix[a * self.size + d] = 0
+                    self.matrix[d * self.size + a] = 0
+        self._cache: dict[str, int] = {}
+    
+    @classmethod
+    def from_file(cls, path: str) -> "TypeChart":
+        """Carrega a tabela de um JSON no formato {"tipo": ["tipos que ele vence"]}"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+    
+    def code(self, tipo: str) -> int:
+        """Código do tipo (normalização feita uma vez por texto distinto)"""
+        code = self._cache.get(tipo)
+        if code is None:
+            code = self._codes.get(normalize_type(tipo), UNKNOWN_TYPE)
+            if len(self._cache) < MAX_CACHED_NAMES:
+                self._cache[tipo] = code
+        return code
+    
+    def outcome(self, attacker_code: int, defender_code: int) -> int:
+        """Resultado do confronto de tipos"""
+        return self.matrix[attacker_code * self.size + defender_code]
+
+
+DEFAULT_TYPE_CHART = TypeChart(DEFAULT_TYPE_ADVANTAGES)
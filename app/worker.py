@@ -0,0 +1,18 @@
+"""
+Worker de jobs (função `jobs` do serverless.yml).
+A API registra o job no DynamoDB e invoca esta função de forma assíncrona com
+{"job_id": ...}; a exclusão em cascata roda aqui, com timeout próprio, fora da
+invocação HTTP que respondeu 202.
+"""
+import asyncio
+from app.dependencies import get_job_service
+
+
+async def _run(job_id: str) -> None:
+    jobs = await get_job_service()
+    await jobs.run(job_id)
+
+
+def handler(event: dict, context) -> None:
+    """Entrada da Lambda de jobs"""
+    asyncio.run(_run(event["job_id"]))
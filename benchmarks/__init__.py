@@ -0,0 +1,4 @@
+"""
+Benchmarks da API Pokédex.
+Executar a partir da raiz do projeto, por exemplo: python -m benchmarks.bench_battle
+"""
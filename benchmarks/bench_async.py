@@ -0,0 +1,93 @@
+"""
+Teste de carga: endpoints sync (threadpool do Starlette) x async (executor dedicado).
+Simula a latência de rede do DynamoDB com um repositório que bloqueia a cada chamada.
+Os dois caminhos usam o mesmo número de threads (REPOSITORY_WORKERS, padrão 50):
+a comparação é do modelo de execução, não do tamanho do pool.
+Uso: python -m benchmarks.bench_async [requisicoes] [concorrencia] [latencia_ms] [threads]
+Requer httpx.
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app import dependencies
+from app.main import app as async_app
+from app.repositories.memory_repository import MemoryTrainerRepository, MemoryPokemonRepository
+from app.repositories.async_repository import AsyncTrainerRepository, AsyncPokemonRepository
+
+
+class _SlowPokemonRepository(MemoryPokemonRepository):
+    """Repositório em memória com latência bloqueante (como uma chamada boto3)"""
+    
+    def __init__(self, latency: float):
+        super().__init__()
+        self._latency = latency
+    
+    def get(self, pokemon_id: int):
+        time.sleep(self._latency)
+        return super().get(pokemon_id)
+    
+    def get_many(self, pokemon_ids: list[int]):
+        time.sleep(self._latency)
+        return super().get_many(pokemon_ids)
+
+
+def _sync_app(repo: MemoryPokemonRepository) -> FastAPI:
+    """Caminho anterior: endpoint `def`, executado no threadpool do Starlette"""
+    sync_app = FastAPI()
+    
+    @sync_app.get("/pokemons/{pokemon_id}")
+    def get_pokemon(pokemon_id: int):
+        pokemon = repo.get(pokemon_id)
+        if not pokemon:
+            raise HTTPException(status_code=404)
+        return pokemon
+    
+    return sync_app
+
+
+async def _load(app: FastAPI, requests: int, concurrency: int, workers: int) -> float:
+    """Dispara `requests` GETs com `concurrency` clientes e retorna req/s"""
+    # Threadpool do Starlette (40 por padrão) do mesmo tamanho do executor dedicado
+    anyio.to_thread.current_default_thread_limiter().total_tokens = workers
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = list(range(requests))
+        
+        async def worker():
+            while queue:
+                queue.pop()
+                response = await client.get("/pokemons/1")
+                response.raise_for_status()
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+def main(requests: int = 2000, concurrency: int = 200, latency_ms: float = 50, workers: int = dependencies.REPOSITORY_WORKERS) -> None:
+    repo = _SlowPokemonRepository(latency_ms / 1000)
+    repo.create("Pikachu", "Elétrico", 10, 1)
+    
+    executor = ThreadPoolExecutor(max_workers=workers)
+    dependencies._async_trainer_repo = AsyncTrainerRepository(MemoryTrainerRepository(), executor)
+    dependencies._async_pokemon_repo = AsyncPokemonRepository(repo, executor)
+    
+    print(f"requisições: {requests}, concorrência: {concurrency}, latência simulada: {latency_ms} ms, threads: {workers}")
+    print(f"sync  (threadpool Starlette): {asyncio.run(_load(_sync_app(repo), requests, concurrency, workers)):,.0f} req/s")
+    print(f"async (executor dedicado):    {asyncio.run(_load(async_app, requests, concurrency, workers)):,.0f} req/s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 2000,
+        int(args[1]) if len(args) > 1 else 200,
+        float(args[2]) if len(args) > 2 else 50,
+        int(args[3]) if len(args) > 3 else dependencies.REPOSITORY_WORKERS
+    )
@@ -0,0 +1,57 @@
+"""
+Benchmark: operações de pokémon em memória x SQLite x DynamoDB.
+O DynamoDB só entra quando DYNAMODB_ENDPOINT aponta para um DynamoDB Local com as tabelas criadas:
+    DYNAMODB_ENDPOINT=http://localhost:8000 python -m benchmarks.bench_backends 5000
+Uso: python -m benchmarks.bench_backends [quantidade]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.sqlite_repository import SQLiteDatabase, SQLitePokemonRepository
+
+TRAINERS = 100
+READS = 5_000
+
+
+def _timed(operation) -> float:
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def _run(name: str, repo, count: int) -> None:
+    """Criação em lote, leituras por ID, listagem e exclusão por treinador"""
+    pokemons = [
+        {"nome": f"Bench{i}", "tipo": "Fogo", "nivel": i % 100 + 1, "treinador_id": 1_000_000 + i % TRAINERS}
+        for i in range(count)
+    ]
+    created = []
+    create_time = _timed(lambda: created.extend(repo.create_many(pokemons)))
+    ids = [int(p["id"]) for p in created]
+    rnd = random.Random(0)
+    sample = [rnd.choice(ids) for _ in range(READS)]
+    get_time = _timed(lambda: [repo.get(pid) for pid in sample])
+    by_trainer_time = _timed(lambda: [repo.get_by_trainer(1_000_000 + t) for t in range(TRAINERS)])
+    delete_time = _timed(lambda: [repo.delete_by_trainer(1_000_000 + t) for t in range(TRAINERS)])
+    print(
+        f"{name:9} create_many: {count / create_time:10,.0f}/s | get: {READS / get_time:10,.0f}/s | "
+        f"get_by_trainer: {TRAINERS / by_trainer_time:8,.0f}/s | delete_by_trainer: {TRAINERS / delete_time:8,.0f}/s"
+    )
+
+
+def main(count: int = 100_000) -> None:
+    print(f"pokémon: {count} | treinadores: {TRAINERS} | leituras: {READS}")
+    _run("memória", MemoryPokemonRepository(), count)
+    with tempfile.TemporaryDirectory() as directory:
+        _run("sqlite", SQLitePokemonRepository(SQLiteDatabase(os.path.join(directory, "bench.db"))), count)
+    if os.environ.get("DYNAMODB_ENDPOINT"):
+        from app.repositories.dynamodb_repository import DynamoDBPokemonRepository
+        _run("dynamodb", DynamoDBPokemonRepository(), count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,76 @@
+"""
+Benchmark: batalhas individuais (loop de battle) x lote (battle_batch), e só a
+etapa de decisão: _decide por confronto x _decide_bulk sobre colunas planas.
+Uso: python -m benchmarks.bench_battle [quantidade_de_pares]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from app.models import BattleRequest, BattleBatchRequest
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.async_repository import AsyncPokemonRepository
+from app.services.battle_service import BattleService, _decide, _decide_bulk
+from app.services.type_chart import DEFAULT_TYPE_CHART
+
+TYPES = ["Fogo", "Planta", "Água", "Elétrico"]
+
+
+def _seed(repo: MemoryPokemonRepository, count: int) -> list[int]:
+    """Cria pokémon com níveis e tipos aleatórios"""
+    return [
+        repo.create(f"P{i}", random.choice(TYPES), random.randint(1, 20), 1)["id"]
+        for i in range(count)
+    ]
+
+
+async def _bench(pairs_count: int) -> None:
+    random.seed(42)
+    repo = MemoryPokemonRepository()
+    ids = _seed(repo, 1000)
+    service = BattleService(pokemon_repo=AsyncPokemonRepository(repo))
+    requests = [
+        BattleRequest(pokemon_atacante_id=a, pokemon_defensor_id=d)
+        for a, d in (random.sample(ids, 2) for _ in range(pairs_count))
+    ]
+    
+    start = time.perf_counter()
+    for request in requests:
+        await service.battle(request)
+    single = time.perf_counter() - start
+    
+    batch = BattleBatchRequest.model_construct(batalhas=requests)
+    start = time.perf_counter()
+    await service.battle_batch(batch)
+    batched = time.perf_counter() - start
+    
+    print(f"pares: {pairs_count}")
+    print(f"battle (loop):  {pairs_count / single:,.0f} pares/s")
+    print(f"battle_batch:   {pairs_count / batched:,.0f} pares/s")
+    
+    # Só a decisão, com os níveis e tipos já codificados
+    chart = DEFAULT_TYPE_CHART
+    pokemons = repo.get_many(ids)
+    positions = {pid: position for position, pid in enumerate(pokemons)}
+    levels = [p["nivel"] for p in pokemons.values()]
+    codes = [chart.code(p["tipo"]) for p in pokemons.values()]
+    attackers = [positions[r.pokemon_atacante_id] for r in requests]
+    defenders = [positions[r.pokemon_defensor_id] for r in requests]
+    start = time.perf_counter()
+    per_pair = [_decide(chart, levels[a], codes[a], levels[d], codes[d]) for a, d in zip(attackers, defenders)]
+    looped = time.perf_counter() - start
+    start = time.perf_counter()
+    bulk = _decide_bulk(chart, levels, codes, attackers, defenders)
+    vectorized = time.perf_counter() - start
+    assert bulk == per_pair
+    print(f"decisão _decide:      {pairs_count / looped:,.0f} pares/s")
+    print(f"decisão _decide_bulk: {pairs_count / vectorized:,.0f} pares/s")
+
+
+def main(pairs_count: int = 100_000) -> None:
+    asyncio.run(_bench(pairs_count))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
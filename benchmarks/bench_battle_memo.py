@@ -0,0 +1,85 @@
+"""
+Benchmark: battle() e battle_batch() com e sem o memo de decisões (BATTLE_MEMO_SIZE).
+Os pokémon seguem uma distribuição enviesada (poucos níveis e tipos concentram
+a maior parte da liga), como nas ligas reais. Mede a requisição inteira e só
+a etapa de decisão (o resto de battle() não muda com o memo).
+Uso: python -m benchmarks.bench_battle_memo [quantidade_de_pares]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from app.models import BattleRequest, BattleBatchRequest
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.async_repository import AsyncPokemonRepository
+from app.services.battle_service import BattleService, DecisionMemo, _decide
+from app.services.type_chart import DEFAULT_TYPE_CHART
+
+LEVELS = list(range(1, 101))
+# Zipf: nível k tem peso 1/k^1.2
+LEVEL_WEIGHTS = [1 / level ** 1.2 for level in LEVELS]
+TYPES = ["Normal", "Água", "Fogo", "Planta", "Elétrico", "Pedra", "Fantasma"]
+TYPE_WEIGHTS = [30, 20, 15, 15, 10, 7, 3]
+
+
+async def _time(service: BattleService, requests: list[BattleRequest]) -> tuple[float, float]:
+    """Pares por segundo no loop de battle() e em battle_batch()"""
+    start = time.perf_counter()
+    for request in requests:
+        await service.battle(request)
+    single = len(requests) / (time.perf_counter() - start)
+    batch = BattleBatchRequest.model_construct(batalhas=requests)
+    start = time.perf_counter()
+    await service.battle_batch(batch)
+    batched = len(requests) / (time.perf_counter() - start)
+    return single, batched
+
+
+def _time_decisions(pokemons: dict[int, dict], pairs: list[tuple[int, int]], memo: DecisionMemo) -> tuple[float, float]:
+    """Decisões por segundo sem e com o memo (já aquecido)"""
+    chart = DEFAULT_TYPE_CHART
+    start = time.perf_counter()
+    for a, d in pairs:
+        attacker, defender = pokemons[a], pokemons[d]
+        _decide(chart, int(attacker["nivel"]), chart.code(attacker["tipo"]), int(defender["nivel"]), chart.code(defender["tipo"]))
+    direct = len(pairs) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for a, d in pairs:
+        memo.decide(pokemons[a], pokemons[d])
+    memoized = len(pairs) / (time.perf_counter() - start)
+    return direct, memoized
+
+
+async def _bench(pairs_count: int) -> None:
+    rnd = random.Random(42)
+    repo = MemoryPokemonRepository()
+    ids = [
+        repo.create(f"P{i}", rnd.choices(TYPES, TYPE_WEIGHTS)[0], rnd.choices(LEVELS, LEVEL_WEIGHTS)[0], 1)["id"]
+        for i in range(10_000)
+    ]
+    requests = [
+        BattleRequest(pokemon_atacante_id=a, pokemon_defensor_id=d)
+        for a, d in (rnd.sample(ids, 2) for _ in range(pairs_count))
+    ]
+    pokemon_repo = AsyncPokemonRepository(repo)
+    
+    plain = await _time(BattleService(pokemon_repo), requests)
+    memo = DecisionMemo(DEFAULT_TYPE_CHART, 65_536)
+    memoized = await _time(BattleService(pokemon_repo, memo=memo), requests)
+    stats = memo.stats()
+    pairs = [(r.pokemon_atacante_id, r.pokemon_defensor_id) for r in requests]
+    direct_decisions, memo_decisions = _time_decisions({pid: repo.get(pid) for pid in ids}, pairs, memo)
+    
+    print(f"pares: {pairs_count} | acertos do memo: {stats['hit_rate']:.1%} ({stats['size']} entradas)")
+    print(f"battle (loop) sem memo: {plain[0]:10,.0f} pares/s     | com memo: {memoized[0]:10,.0f} pares/s")
+    print(f"battle_batch  sem memo: {plain[1]:10,.0f} pares/s     | com memo: {memoized[1]:10,.0f} pares/s")
+    print(f"só a decisão  sem memo: {direct_decisions:10,.0f} decisões/s | com memo: {memo_decisions:10,.0f} decisões/s")
+
+
+def main(pairs_count: int = 100_000) -> None:
+    asyncio.run(_bench(pairs_count))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
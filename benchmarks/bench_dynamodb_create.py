@@ -0,0 +1,32 @@
+"""
+Benchmark: criação de pokémon no DynamoDB com recurso compartilhado x recurso novo a cada chamada.
+Requer DynamoDB Local com as tabelas criadas, por exemplo:
+    DYNAMODB_ENDPOINT=http://localhost:8000 python -m benchmarks.bench_dynamodb_create 500
+"""
+import sys
+import time
+
+from app.repositories import dynamodb_repository
+from app.repositories.dynamodb_repository import DynamoDBPokemonRepository
+
+
+def _run(count: int, fresh_resource: bool) -> float:
+    """Cria `count` pokémon e retorna criações por segundo"""
+    repo = DynamoDBPokemonRepository()
+    start = time.perf_counter()
+    for i in range(count):
+        if fresh_resource:
+            # Comportamento anterior: novo recurso/sessão/pool a cada create
+            dynamodb_repository._resource = None
+        repo.create(f"Bench{i}", "Fogo", 1, 1)
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int = 500) -> None:
+    print(f"criações: {count}")
+    print(f"recurso novo por chamada: {_run(count, fresh_resource=True):,.0f} creates/s")
+    print(f"recurso compartilhado:    {_run(count, fresh_resource=False):,.0f} creates/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
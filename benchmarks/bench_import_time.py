@@ -0,0 +1,89 @@
+"""
+Benchmark: custo de cold start da importação de app.main (python -X importtime).
+Cada configuração roda em um processo novo, várias vezes; reporta a mediana do
+tempo de importação de app.main, o tempo total do processo, os módulos que mais
+pesam e se bibliotecas pesadas (boto3, multiprocessing, sqlite3) foram carregadas.
+Uso: python -m benchmarks.bench_import_time [execucoes] [--saida arquivo.json]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CONFIGS = {
+    "memory": {"USE_DYNAMODB": "false", "SQLITE_PATH": ""},
+    "sqlite": {"USE_DYNAMODB": "false", "SQLITE_PATH": "bench.db"},
+    "dynamodb": {"USE_DYNAMODB": "true", "SQLITE_PATH": ""}
+}
+HEAVY_MODULES = ("boto3", "botocore", "multiprocessing", "sqlite3")
+TOP_MODULES = 8
+
+
+def _parse(stderr: str) -> dict[str, int]:
+    """Tempo cumulativo (µs) de cada módulo na saída de -X importtime"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def _run_once(env: dict[str, str]) -> tuple[float, dict[str, int]]:
+    """Tempo total do processo (ms) e tempos cumulativos da importação"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env={**os.environ, **env}, capture_output=True, text=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000, _parse(result.stderr)
+
+
+def main(runs: int = 5, output: str = None) -> None:
+    report = {}
+    for name, env in CONFIGS.items():
+        walls, imports, samples = [], [], []
+        for _ in range(runs):
+            wall, cumulative = _run_once(env)
+            walls.append(wall)
+            imports.append(cumulative["app.main"] / 1000)
+            samples.append(cumulative)
+        last = samples[-1]
+        # Módulos de nível superior importados por app.main (e suas dependências) que mais pesam
+        top = sorted(
+            ((module, total) for module, total in last.items() if module != "app.main" and "." not in module),
+            key=lambda item: item[1], reverse=True
+        )[:TOP_MODULES]
+        report[name] = {
+            "importacao_app_main_ms": round(statistics.median(imports), 1),
+            "processo_ms": round(statistics.median(walls), 1),
+            "modulos_pesados": [module for module in HEAVY_MODULES if module in last],
+            "maiores_ms": {module: round(total / 1000, 1) for module, total in top}
+        }
+        print(
+            f"{name:9} app.main {report[name]['importacao_app_main_ms']:7.1f} ms | processo "
+            f"{report[name]['processo_ms']:7.1f} ms | carregados: {', '.join(report[name]['modulos_pesados']) or '-'}",
+            file=sys.stderr
+        )
+    if os.path.exists("bench.db"):
+        os.remove("bench.db")
+    
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    saida = None
+    if "--saida" in args:
+        index = args.index("--saida")
+        saida = args[index + 1]
+        del args[index:index + 2]
+    main(int(args[0]) if args else 5, saida)
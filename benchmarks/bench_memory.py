@@ -0,0 +1,35 @@
+"""
+Benchmark: memória por pokémon no repositório em dicts x colunar.
+Uso: python -m benchmarks.bench_memory [quantidade]
+"""
+import sys
+import tracemalloc
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+
+NAMES = ["Pikachu", "Charmander", "Bulbasaur", "Squirtle", "Eevee", "Snorlax"]
+TYPES = ["Elétrico", "Fogo", "Planta", "Água", "Normal"]
+
+
+def _measure(repo_class, count: int) -> float:
+    """Bytes alocados por pokémon ao carregar `count` itens"""
+    tracemalloc.start()
+    repo = repo_class()
+    for i in range(count):
+        repo.create(NAMES[i % len(NAMES)], TYPES[i % len(TYPES)], i % 100 + 1, i % 1000 + 1)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / count
+
+
+def main(count: int = 500_000) -> None:
+    dict_bytes = _measure(MemoryPokemonRepository, count)
+    columnar_bytes = _measure(ColumnarPokemonRepository, count)
+    print(f"pokémon: {count}")
+    print(f"dict:    {dict_bytes:7.1f} bytes/pokémon")
+    print(f"colunar: {columnar_bytes:7.1f} bytes/pokémon ({dict_bytes / columnar_bytes:.1f}x menor)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,67 @@
+"""
+Benchmark/estresse: repositórios em memória acessados por várias threads.
+Cada thread mistura leituras por ID, criações, atualizações e exclusões.
+A consistência sob concorrência é verificada em tests/test_concurrency.py.
+Uso: python -m benchmarks.bench_memory_threads [threads] [operações por thread]
+
+Em builds com GIL o ganho de throughput é limitado; o que se mede aqui é
+principalmente a ausência de disputa em um lock global (e de corridas).
+"""
+import random
+import sys
+import threading
+import time
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+
+TRAINERS = 50
+
+
+def _worker(repo, seed: int, ops: int, created: list[int]) -> None:
+    rnd = random.Random(seed)
+    local = []
+    for _ in range(ops):
+        op = rnd.random()
+        if op < 0.7 or not local:
+            repo.get(rnd.randint(1, len(created) + len(local) + 1))
+        elif op < 0.9:
+            pokemon = repo.create("Pikachu", "Elétrico", rnd.randint(1, 100), rnd.randint(1, TRAINERS))
+            local.append(pokemon["id"])
+        elif op < 0.95:
+            repo.update(rnd.choice(local), nivel=rnd.randint(1, 100))
+        else:
+            repo.delete(rnd.choice(local))
+    created.extend(local)
+
+
+def _run(repo_class, threads: int, ops: int) -> float:
+    """Operações por segundo com `threads` threads"""
+    repo = repo_class()
+    for i in range(10_000):
+        repo.create("Eevee", "Normal", i % 100 + 1, i % TRAINERS + 1)
+    created = list(range(1, 10_001))
+    workers = [
+        threading.Thread(target=_worker, args=(repo, seed, ops, created))
+        for seed in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * ops / elapsed
+
+
+def main(threads: int = 8, ops: int = 50_000) -> None:
+    print(f"threads: {threads} | operações/thread: {ops}")
+    for repo_class in (MemoryPokemonRepository, ColumnarPokemonRepository):
+        single = _run(repo_class, 1, ops)
+        multi = _run(repo_class, threads, ops)
+        print(f"{repo_class.__name__:28} 1 thread: {single:10,.0f} ops/s | {threads} threads: {multi:10,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,73 @@
+"""
+Benchmark: custo da instrumentação (app/metrics.py) por taxa de amostragem.
+Mede get() do repositório em memória puro e instrumentado, e uma requisição
+ASGI mínima com e sem o MetricsMiddleware (sem rede nem FastAPI no meio).
+Com METRICS_SAMPLE_RATE=0 nada é instalado: o custo é o da linha "sem instrumentação".
+Uso: python -m benchmarks.bench_metrics [quantidade_de_chamadas]
+"""
+import asyncio
+import sys
+import time
+
+from app import metrics
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.instrumented_repository import InstrumentedPokemonRepository
+
+SAMPLE_RATES = (0.01, 0.1, 1.0)
+
+
+class _Route:
+    path = "/pokemons/{pokemon_id}"
+
+
+async def _endpoint(scope, receive, send):
+    """App ASGI mínimo: define a rota como o roteador faria e responde vazio"""
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _noop(message):
+    pass
+
+
+async def _time_requests(app, calls: int) -> float:
+    """Nanossegundos por requisição"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        await app({"type": "http", "method": "GET"}, None, _noop)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def _time_gets(repo, calls: int) -> float:
+    """Nanossegundos por get()"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        repo.get(1)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main(calls: int = 500_000) -> None:
+    repo = MemoryPokemonRepository()
+    repo.create("Pikachu", "Elétrico", 10, 1)
+    middleware = metrics.MetricsMiddleware(_endpoint)
+    
+    bare_get = _time_gets(repo, calls)
+    bare_request = asyncio.run(_time_requests(_endpoint, calls))
+    print(f"sem instrumentação: get {bare_get:7.0f} ns | requisição {bare_request:7.0f} ns")
+    original = metrics.SAMPLE_RATE
+    try:
+        for rate in SAMPLE_RATES:
+            metrics.SAMPLE_RATE = rate
+            get = _time_gets(InstrumentedPokemonRepository(repo, "memory"), calls)
+            request = asyncio.run(_time_requests(middleware, calls))
+            print(
+                f"amostragem {rate:>4}:   get {get:7.0f} ns (+{get - bare_get:5.0f}) "
+                f"| requisição {request:7.0f} ns (+{request - bare_request:5.0f})"
+            )
+    finally:
+        metrics.SAMPLE_RATE = original
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
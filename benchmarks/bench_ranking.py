@@ -0,0 +1,46 @@
+"""
+Benchmark: ranking (top-K por nível) pelos índices x list_all + ordenação.
+Mede find(sort="-nivel", limit=K) geral e por tipo nos repositórios em memória
+(dict e colunar), contra ordenar tudo no cliente como era feito antes.
+Uso: python -m benchmarks.bench_ranking [quantidade_de_pokemons] [top]
+"""
+import random
+import sys
+import time
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+
+TYPES = ["Fogo", "Água", "Planta", "Elétrico", "Pedra", "Normal"]
+CALLS = 200
+
+
+def _time(function, calls: int = CALLS) -> float:
+    """Microssegundos por chamada"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(count: int = 1_000_000, top: int = 10) -> None:
+    rnd = random.Random(1)
+    items = [
+        {"nome": f"Pokemon{i}", "tipo": rnd.choice(TYPES), "nivel": rnd.randint(1, 100), "treinador_id": i % 1000 + 1}
+        for i in range(count)
+    ]
+    for repo_class in (MemoryPokemonRepository, ColumnarPokemonRepository):
+        repo = repo_class()
+        repo.create_many(items)
+        full_sort = _time(lambda: sorted(repo.list_all(), key=lambda p: (-p["nivel"], p["id"]))[:top], 3)
+        overall = _time(lambda: repo.find(sort="-nivel", limit=top))
+        by_type = _time(lambda: repo.find(tipo="Fogo", sort="-nivel", limit=top))
+        print(
+            f"{repo_class.__name__:28} top {top}: list_all+sort {full_sort / 1000:8.1f} ms | "
+            f"índice geral {overall:8.1f} µs | índice por tipo {by_type:8.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1_000_000, int(args[1]) if len(args) > 1 else 10)
@@ -0,0 +1,61 @@
+"""
+Benchmark: recuperação do backend em memória persistido (snapshot + log).
+Carrega N pokémon, compacta em snapshot, grava mais alguns registros no log e
+mede quanto tempo leva para reabrir o diretório.
+Uso: python -m benchmarks.bench_recovery [quantidade]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+from app.repositories.durable_repository import DurablePokemonRepository
+
+NAMES = ["Pikachu", "Charmander", "Bulbasaur", "Squirtle", "Eevee", "Snorlax"]
+TYPES = ["Elétrico", "Fogo", "Planta", "Água", "Normal"]
+BATCH = 10_000
+LOG_RECORDS = 10_000
+
+
+def _pokemons(start: int, count: int) -> list[dict]:
+    return [
+        {"nome": NAMES[i % len(NAMES)], "tipo": TYPES[i % len(TYPES)], "nivel": i % 100 + 1, "treinador_id": i % 1000 + 1}
+        for i in range(start, start + count)
+    ]
+
+
+def _run(repo_class, count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurablePokemonRepository(repo_class(), directory, compact_every=10**12)
+        start = time.perf_counter()
+        for offset in range(0, count, BATCH):
+            repo.create_many(_pokemons(offset, min(BATCH, count - offset)))
+        load_time = time.perf_counter() - start
+        repo.compact()
+        for i in range(LOG_RECORDS):
+            repo.update(i + 1, nivel=50)
+        repo.close()
+        size = os.path.getsize(os.path.join(directory, "pokemons.snapshot"))
+
+        start = time.perf_counter()
+        recovered = DurablePokemonRepository(repo_class(), directory)
+        recovery_time = time.perf_counter() - start
+        assert recovered.get(1)["nivel"] == 50
+        assert recovered.get(count) is not None
+        recovered.close()
+        print(
+            f"{repo_class.__name__:28} carga: {count / load_time:10,.0f} itens/s | "
+            f"snapshot: {size / 1e6:6.1f} MB | recuperação: {recovery_time * 1000:7.0f} ms"
+        )
+
+
+def main(count: int = 1_000_000) -> None:
+    print(f"pokémon: {count} (+{LOG_RECORDS} registros no log)")
+    for repo_class in (MemoryPokemonRepository, ColumnarPokemonRepository):
+        _run(repo_class, count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,74 @@
+"""
+Benchmark: serialização das listagens via modelos Pydantic x caminho rápido (serializers.py).
+O caminho com modelos reproduz o que o FastAPI faz com response_model=list[Pokemon]:
+monta um Pokemon por item, valida de novo a lista e renderiza com JSONResponse. O
+caminho rápido é o da rota GET /pokemons (PokemonService.list_page_json).
+Uso: python -m benchmarks.bench_serialization
+"""
+import asyncio
+import time
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models import Pokemon
+from app.repositories.memory_repository import MemoryTrainerRepository, MemoryPokemonRepository
+from app.repositories.async_repository import AsyncTrainerRepository, AsyncPokemonRepository
+from app.services.pokemon_service import PokemonService
+
+SIZES = [1_000, 10_000, 100_000]
+_response_adapter = TypeAdapter(list[Pokemon])
+
+
+async def _model_path(repo: AsyncPokemonRepository, service: PokemonService, size: int) -> bytes:
+    """Um modelo por item da página; o response_model valida e serializa de novo"""
+    pokemons, _ = await repo.list_page(size)
+    models = [Pokemon(
+        id=int(p["id"]),
+        nome=p["nome"],
+        tipo=p["tipo"],
+        nivel=int(p["nivel"]),
+        treinador_id=int(p["treinador_id"])
+    ) for p in pokemons]
+    validated = _response_adapter.validate_python(models, from_attributes=True)
+    return JSONResponse(_response_adapter.dump_python(validated, mode="json")).body
+
+
+async def _fast_path(repo: AsyncPokemonRepository, service: PokemonService, size: int) -> bytes:
+    """Dicts da página do repositório direto para bytes JSON"""
+    body, _ = await service.list_page_json(size)
+    return body
+
+
+async def _time(func, *args, repeat: int = 3) -> tuple[float, bytes]:
+    """Melhor tempo de `repeat` execuções"""
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+async def _bench() -> None:
+    for size in SIZES:
+        repo = MemoryPokemonRepository()
+        repo.create_many([
+            {"nome": f"Pokémon {i}", "tipo": "Água", "nivel": i % 100 + 1, "treinador_id": i % 50 + 1}
+            for i in range(size)
+        ])
+        pokemon_repo = AsyncPokemonRepository(repo)
+        service = PokemonService(pokemon_repo, AsyncTrainerRepository(MemoryTrainerRepository()))
+        model_time, model_body = await _time(_model_path, pokemon_repo, service, size)
+        fast_time, fast_body = await _time(_fast_path, pokemon_repo, service, size)
+        assert model_body == fast_body, "saídas diferentes"
+        print(f"{size:>7} itens | modelos: {model_time * 1000:8.1f} ms | rápido: {fast_time * 1000:8.1f} ms | {model_time / fast_time:4.1f}x")
+
+
+def main() -> None:
+    asyncio.run(_bench())
+
+
+if __name__ == "__main__":
+    main()
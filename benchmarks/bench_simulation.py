@@ -0,0 +1,44 @@
+"""
+Benchmark: simulação Monte Carlo de batalhas com 1..N processos.
+Uso: python -m benchmarks.bench_simulation [rodadas_por_confronto] [confrontos]
+"""
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.models import BattleRequest, BattleSimulationRequest
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.async_repository import AsyncPokemonRepository
+from app.services.battle_service import BattleService
+
+
+async def _run(service: BattleService, request: BattleSimulationRequest) -> float:
+    start = time.perf_counter()
+    await service.simulate(request)
+    return time.perf_counter() - start
+
+
+def main(rounds: int = 2_000_000, matchups: int = 8) -> None:
+    repo = MemoryPokemonRepository()
+    ids = [repo.create(f"P{i}", ["Fogo", "Planta", "Água"][i % 3], 10 + i % 2, 1)["id"] for i in range(matchups + 1)]
+    request = BattleSimulationRequest(
+        batalhas=[BattleRequest(pokemon_atacante_id=ids[i], pokemon_defensor_id=ids[i + 1]) for i in range(matchups)],
+        rodadas=rounds
+    )
+    total = rounds * matchups
+    print(f"rodadas: {total:,} ({matchups} confrontos)")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            service = BattleService(AsyncPokemonRepository(repo), simulation_executor=pool)
+            asyncio.run(_run(service, request))  # aquece os processos
+            elapsed = asyncio.run(_run(service, request))
+        print(f"{workers:3} processo(s): {total / elapsed:12,.0f} rodadas/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
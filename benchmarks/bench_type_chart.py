@@ -0,0 +1,60 @@
+"""
+Benchmark: decisão de batalha por tipo com normalização a cada confronto
+(implementação anterior) x códigos memoizados + matriz de resultados.
+Todos os pares têm o mesmo nível, então todo confronto passa pela regra de tipo.
+Uso: python -m benchmarks.bench_type_chart [quantidade_de_pares]
+"""
+import random
+import sys
+import time
+
+from app.services.battle_service import _decide
+from app.services.type_chart import DEFAULT_TYPE_CHART
+
+TYPES = ["Fogo", "Planta", "Água", "Elétrico", "fogo", "ÁGUA"]
+
+# Implementação anterior, mantida aqui só para comparação
+LEGACY_ADVANTAGES = {"fogo": "planta", "planta": "agua", "agua": "fogo"}
+
+
+def _legacy_normalize(tipo: str) -> str:
+    replacements = {"á": "a", "é": "e", "í": "i", "ó": "o", "ú": "u", "ã": "a"}
+    result = tipo.lower()
+    for accented, plain in replacements.items():
+        result = result.replace(accented, plain)
+    return result
+
+
+def _legacy_decide(attacker_nivel: int, attacker_tipo: str, defender_nivel: int, defender_tipo: str) -> int:
+    if attacker_nivel != defender_nivel:
+        return 1 if attacker_nivel > defender_nivel else -1
+    attacker_type = _legacy_normalize(attacker_tipo)
+    defender_type = _legacy_normalize(defender_tipo)
+    if LEGACY_ADVANTAGES.get(attacker_type) == defender_type:
+        return 1
+    if LEGACY_ADVANTAGES.get(defender_type) == attacker_type:
+        return -1
+    return 0
+
+
+def main(pairs_count: int = 500_000) -> None:
+    random.seed(42)
+    pairs = [(random.choice(TYPES), random.choice(TYPES)) for _ in range(pairs_count)]
+    chart = DEFAULT_TYPE_CHART
+    
+    start = time.perf_counter()
+    legacy = [_legacy_decide(10, a, 10, d) for a, d in pairs]
+    before = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = [_decide(chart, 10, chart.code(a), 10, chart.code(d)) for a, d in pairs]
+    after = time.perf_counter() - start
+    
+    assert legacy == current, "resultados divergentes"
+    print(f"pares (mesmo nível): {pairs_count}")
+    print(f"antes (normaliza a cada batalha): {pairs_count / before:12,.0f} decisões/s")
+    print(f"depois (códigos + matriz):        {pairs_count / after:12,.0f} decisões/s ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
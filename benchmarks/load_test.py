@@ -0,0 +1,418 @@
+"""
+Teste de carga reprodutível de todas as rotas de app/main.py.
+Popula o backend escolhido com N treinadores e M pokémon (via /treinadores/lote
+e /pokemons/lote), dispara cada cenário com clientes concorrentes e imprime
+p50/p95/p99 e vazão de cada rota em JSON.
+
+Transportes:
+- asgi: o app roda no mesmo processo (httpx.ASGITransport, sem rede)
+- http: clientes HTTP reais; sem --url sobe um uvicorn com o backend escolhido
+
+Backends: memory, sqlite (arquivo temporário) e dynamodb (DynamoDB Local em
+--dynamodb-endpoint; as tabelas são criadas com um STAGE próprio e removidas no fim).
+
+Com --baseline compara com um JSON anterior e sai com código 1 se o p95 ou a
+vazão de alguma rota piorarem além de --tolerance.
+
+Uso:
+    python -m benchmarks.load_test --pokemons 100000 --treinadores 1000 --saida atual.json
+    python -m benchmarks.load_test --backend dynamodb --dynamodb-endpoint http://localhost:8000
+    python -m benchmarks.load_test --transport http --concorrencia 64 --baseline atual.json
+Requer httpx (e uvicorn para --transport http sem --url).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+# Máximo de itens por requisição de lote (models.py)
+BATCH_SIZE = 10_000
+TYPES = ["Fogo", "Água", "Planta", "Elétrico", "Pedra", "Normal"]
+
+# Rotas que devolvem a base inteira (ou fazem muito trabalho) rodam menos vezes
+HEAVY_FRACTION = 50
+
+
+# ============ CENÁRIOS ============
+
+class _Context:
+    """IDs populados e reservas descartáveis consumidas pelos cenários de escrita"""
+    
+    def __init__(self, seed: int):
+        self.rnd = random.Random(seed)
+        self.trainer_ids: list[int] = []
+        self.pokemon_ids: list[int] = []
+        self.spare_trainer_ids: list[int] = []
+        self.spare_pokemon_ids: list[int] = []
+        self.job_ids: list[str] = []
+    
+    def trainer(self) -> int:
+        return self.rnd.choice(self.trainer_ids)
+    
+    def pokemon(self) -> int:
+        return self.rnd.choice(self.pokemon_ids)
+    
+    def pair(self) -> dict:
+        attacker, defender = self.rnd.sample(self.pokemon_ids, 2)
+        return {"pokemon_atacante_id": attacker, "pokemon_defensor_id": defender}
+    
+    def new_pokemon(self) -> dict:
+        return {
+            "nome": f"Bench{self.rnd.randrange(10**9)}",
+            "tipo": self.rnd.choice(TYPES),
+            "nivel": self.rnd.randint(1, 100),
+            "treinador_id": self.trainer()
+        }
+
+
+# (nome, método, pesado, função que monta (caminho, corpo) a partir do contexto)
+SCENARIOS = [
+    ("GET /treinadores", "GET", True, lambda c: ("/treinadores", None)),
+    ("GET /treinadores?limit", "GET", False, lambda c: ("/treinadores?limit=100", None)),
+    ("GET /treinadores/{id}", "GET", False, lambda c: (f"/treinadores/{c.trainer()}", None)),
+    ("POST /treinadores", "POST", False, lambda c: ("/treinadores", {"nome": f"Bench{c.rnd.randrange(10**9)}"})),
+    ("POST /treinadores/lote", "POST", False, lambda c: (
+        "/treinadores/lote", {"treinadores": [{"nome": f"Lote{i}"} for i in range(100)]}
+    )),
+    ("PUT /treinadores/{id}", "PUT", False, lambda c: (f"/treinadores/{c.trainer()}", {"nome": "Renomeado"})),
+    ("GET /treinadores/{id}/pokemons", "GET", False, lambda c: (f"/treinadores/{c.trainer()}/pokemons", None)),
+    ("GET /treinadores/{id}/resumo", "GET", False, lambda c: (f"/treinadores/{c.trainer()}/resumo", None)),
+    ("GET /treinadores/resumo", "GET", True, lambda c: ("/treinadores/resumo", None)),
+    ("GET /pokemons", "GET", True, lambda c: ("/pokemons", None)),
+    ("GET /pokemons?limit", "GET", False, lambda c: ("/pokemons?limit=100", None)),
+    ("GET /pokemons?tipo&sort", "GET", False, lambda c: (f"/pokemons?tipo={c.rnd.choice(TYPES)}&sort=-nivel&limit=10", None)),
+    ("GET /pokemons?nivel", "GET", False, lambda c: (
+        f"/pokemons?nivel_min={(low := c.rnd.randint(1, 99))}&nivel_max={low + 1}&sort=-nivel&limit=100", None
+    )),
+    ("GET /pokemons?tipo&nivel&sort=nome", "GET", False, lambda c: (
+        f"/pokemons?tipo={c.rnd.choice(TYPES)}&nivel_min={(low := c.rnd.randint(1, 99))}&nivel_max={low + 1}&sort=nome&limit=100", None
+    )),
+    ("GET /pokemons/ranking", "GET", False, lambda c: ("/pokemons/ranking?top=10", None)),
+    ("GET /pokemons/ranking?tipo", "GET", False, lambda c: (f"/pokemons/ranking?top=10&tipo={c.rnd.choice(TYPES)}", None)),
+    ("GET /pokemons/{id}", "GET", False, lambda c: (f"/pokemons/{c.pokemon()}", None)),
+    ("POST /pokemons", "POST", False, lambda c: ("/pokemons", c.new_pokemon())),
+    ("POST /pokemons/lote", "POST", False, lambda c: (
+        "/pokemons/lote", {"pokemons": [c.new_pokemon() for _ in range(100)]}
+    )),
+    ("PUT /pokemons/{id}", "PUT", False, lambda c: (f"/pokemons/{c.pokemon()}", {"nivel": c.rnd.randint(1, 100)})),
+    ("POST /batalhas", "POST", False, lambda c: ("/batalhas", c.pair())),
+    ("POST /batalhas/lote", "POST", False, lambda c: ("/batalhas/lote", {"batalhas": [c.pair() for _ in range(100)]})),
+    ("POST /batalhas/simulacao", "POST", True, lambda c: (
+        "/batalhas/simulacao", {"batalhas": [c.pair() for _ in range(10)], "rodadas": 10_000, "semente": 1}
+    )),
+    ("GET /batalhas/memo", "GET", False, lambda c: ("/batalhas/memo", None)),
+    ("POST /torneios", "POST", True, lambda c: ("/torneios", {"pokemon_ids": c.rnd.sample(c.pokemon_ids, 50)})),
+    ("GET /jobs/{id}", "GET", False, lambda c: (f"/jobs/{c.rnd.choice(c.job_ids)}", None)),
+    ("GET /metrics", "GET", False, lambda c: ("/metrics", None)),
+    # Exclusões consomem as reservas criadas antes da medição
+    ("DELETE /pokemons/{id}", "DELETE", False, lambda c: (f"/pokemons/{c.spare_pokemon_ids.pop()}", None)),
+    ("DELETE /treinadores/{id}", "DELETE", False, lambda c: (f"/treinadores/{c.spare_trainer_ids.pop()}", None)),
+    ("DELETE /treinadores/{id}?assincrono", "DELETE", False, lambda c: (
+        f"/treinadores/{c.spare_trainer_ids.pop()}?assincrono=true", None
+    ))
+]
+
+
+# ============ POPULAÇÃO ============
+
+async def _post_batches(client: httpx.AsyncClient, path: str, key: str, items: list[dict]) -> list[int]:
+    """Cria os itens em lotes e devolve os IDs na ordem"""
+    ids = []
+    for start in range(0, len(items), BATCH_SIZE):
+        response = await client.post(path, json={key: items[start:start + BATCH_SIZE]})
+        response.raise_for_status()
+        ids.extend(item["id"] for item in response.json())
+    return ids
+
+
+async def _seed(client: httpx.AsyncClient, ctx: _Context, trainers: int, pokemons: int, spares: int) -> None:
+    """Popula a base (pokémon distribuídos entre os treinadores) e cria as reservas"""
+    ctx.trainer_ids = await _post_batches(
+        client, "/treinadores/lote", "treinadores", [{"nome": f"Treinador{i}"} for i in range(trainers)]
+    )
+    rnd = ctx.rnd
+    items = [
+        {"nome": f"Pokemon{i}", "tipo": rnd.choice(TYPES), "nivel": rnd.randint(1, 100), "treinador_id": ctx.trainer_ids[i % trainers]}
+        for i in range(pokemons)
+    ]
+    ctx.pokemon_ids = await _post_batches(client, "/pokemons/lote", "pokemons", items)
+    
+    # Reservas para as exclusões e jobs (treinadores sem pokémon: não mexem na base medida)
+    ctx.spare_trainer_ids = await _post_batches(
+        client, "/treinadores/lote", "treinadores", [{"nome": f"Reserva{i}"} for i in range(spares * 2 + 10)]
+    )
+    ctx.spare_pokemon_ids = await _post_batches(
+        client, "/pokemons/lote", "pokemons", [ctx.new_pokemon() for _ in range(spares)]
+    )
+    for _ in range(10):
+        response = await client.delete(f"/treinadores/{ctx.spare_trainer_ids.pop()}?assincrono=true")
+        response.raise_for_status()
+        ctx.job_ids.append(response.json()["id"])
+
+
+# ============ MEDIÇÃO ============
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Percentil pelo método nearest-rank"""
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def _run_scenario(client: httpx.AsyncClient, ctx: _Context, scenario, requests: int, concurrency: int) -> dict:
+    """Dispara `requests` chamadas com `concurrency` clientes e resume as latências"""
+    _, method, _, build = scenario
+    # Requisições montadas antes: o sorteio dos IDs não entra na latência
+    calls = [build(ctx) for _ in range(requests)]
+    latencies = []
+    errors = 0
+    
+    async def worker():
+        nonlocal errors
+        while calls:
+            path, body = calls.pop()
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requisicoes": requests,
+        "erros": errors,
+        "vazao_rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3)
+    }
+
+
+async def _benchmark(client: httpx.AsyncClient, args) -> dict:
+    ctx = _Context(args.semente)
+    heavy_requests = max(5, args.requisicoes // HEAVY_FRACTION)
+    start = time.perf_counter()
+    await _seed(client, ctx, args.treinadores, args.pokemons, args.requisicoes)
+    seed_seconds = time.perf_counter() - start
+    
+    results = {}
+    for scenario in SCENARIOS:
+        name, _, heavy, _ = scenario
+        if args.rotas and not any(fragment in name for fragment in args.rotas):
+            continue
+        # Aquecimento (caches, conexões, compilação dos validadores)
+        if not name.startswith("DELETE"):
+            await _run_scenario(client, ctx, scenario, min(20, args.requisicoes), args.concorrencia)
+        results[name] = await _run_scenario(
+            client, ctx, scenario, heavy_requests if heavy else args.requisicoes, args.concorrencia
+        )
+        print(f"{name:40} {results[name]['vazao_rps']:>10} req/s  p95 {results[name]['p95_ms']:>9} ms", file=sys.stderr)
+    
+    return {
+        "meta": {
+            "backend": args.backend,
+            "transporte": args.transport,
+            "treinadores": args.treinadores,
+            "pokemons": args.pokemons,
+            "requisicoes": args.requisicoes,
+            "concorrencia": args.concorrencia,
+            "semente": args.semente,
+            "populacao_s": round(seed_seconds, 2),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        },
+        "resultados": results
+    }
+
+
+# ============ BACKENDS E TRANSPORTES ============
+
+def _create_dynamodb_tables(endpoint: str, stage: str) -> list[str]:
+    """Cria as tabelas do serverless.yml no DynamoDB Local"""
+    import boto3
+    client = boto3.client("dynamodb", endpoint_url=endpoint or None, region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    number_key = [{"AttributeName": "id", "AttributeType": "N"}]
+    tables = [
+        {"TableName": f"pokedex-trainers-{stage}", "AttributeDefinitions": number_key,
+         "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}]},
+        {"TableName": f"pokedex-pokemons-{stage}",
+         "AttributeDefinitions": number_key + [
+             {"AttributeName": "treinador_id", "AttributeType": "N"},
+             {"AttributeName": "tipo", "AttributeType": "S"},
+             {"AttributeName": "nivel_id", "AttributeType": "N"},
+             {"AttributeName": "nivel_particao", "AttributeType": "N"}
+         ],
+         "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+         "GlobalSecondaryIndexes": [
+             {"IndexName": index, "KeySchema": schema, "Projection": {"ProjectionType": "ALL"}}
+             for index, schema in (
+                 ("treinador_id-index", [{"AttributeName": "treinador_id", "KeyType": "HASH"}]),
+                 ("tipo-nivel_id-index", [{"AttributeName": "tipo", "KeyType": "HASH"}, {"AttributeName": "nivel_id", "KeyType": "RANGE"}]),
+                 ("nivel_particao-nivel_id-index", [{"AttributeName": "nivel_particao", "KeyType": "HASH"}, {"AttributeName": "nivel_id", "KeyType": "RANGE"}])
+             )
+         ]},
+        {"TableName": f"pokedex-counters-{stage}", "AttributeDefinitions": [{"AttributeName": "entity", "AttributeType": "S"}],
+         "KeySchema": [{"AttributeName": "entity", "KeyType": "HASH"}]}
+    ]
+    for table in tables:
+        client.create_table(BillingMode="PAY_PER_REQUEST", **table)
+        client.get_waiter("table_exists").wait(TableName=table["TableName"])
+    return [table["TableName"] for table in tables]
+
+
+def _drop_dynamodb_tables(endpoint: str, names: list[str]) -> None:
+    import boto3
+    client = boto3.client("dynamodb", endpoint_url=endpoint or None, region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    for name in names:
+        client.delete_table(TableName=name)
+
+
+def _backend_env(args, workdir: str) -> dict[str, str]:
+    """Variáveis de ambiente (lidas em app/dependencies.py) do backend escolhido"""
+    env = {"USE_DYNAMODB": "false", "SQLITE_PATH": ""}
+    if args.backend == "sqlite":
+        env["SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+    elif args.backend == "dynamodb":
+        env.update(USE_DYNAMODB="true", STAGE=args.stage)
+        if args.dynamodb_endpoint:
+            env["DYNAMODB_ENDPOINT"] = args.dynamodb_endpoint
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    """Espera o servidor responder (ou falha se o processo morrer)"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn encerrou antes de ficar pronto")
+            try:
+                await client.get("/treinadores?limit=1")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"servidor não respondeu em {timeout:.0f} s")
+
+
+async def _run(args, env: dict[str, str]) -> dict:
+    limits = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    timeout = httpx.Timeout(300)
+    if args.transport == "asgi":
+        # Configuração lida na importação: o app só é importado depois do ambiente pronto
+        os.environ.update(env)
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            return await _benchmark(client, args)
+    
+    process = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env={**os.environ, **env}
+        )
+    try:
+        if process is not None:
+            await _wait_ready(url, process)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            return await _benchmark(client, args)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+# ============ REGRESSÕES ============
+
+def _regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Rotas cujo p95 subiu ou cuja vazão caiu mais que a tolerância"""
+    found = []
+    for name, current in report["resultados"].items():
+        previous = baseline.get("resultados", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            found.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if current["vazao_rps"] < previous["vazao_rps"] * (1 - tolerance):
+            found.append(f"{name}: vazão {previous['vazao_rps']} -> {current['vazao_rps']} req/s")
+        if current["erros"] > previous["erros"]:
+            found.append(f"{name}: erros {previous['erros']} -> {current['erros']}")
+    return found
+
+
+def _parse_args(argv: list[str]):
+    parser = argparse.ArgumentParser(description="Teste de carga das rotas da API Pokédex")
+    parser.add_argument("--backend", choices=["memory", "sqlite", "dynamodb"], default="memory")
+    parser.add_argument("--transport", choices=["asgi", "http"], default="asgi")
+    parser.add_argument("--url", help="API já em execução (só --transport http; o backend é o dela)")
+    parser.add_argument("--dynamodb-endpoint", default=os.environ.get("DYNAMODB_ENDPOINT", "http://localhost:8000"))
+    parser.add_argument("--stage", default=f"bench{int(time.time())}", help="STAGE das tabelas criadas no DynamoDB Local")
+    parser.add_argument("--treinadores", type=int, default=100)
+    parser.add_argument("--pokemons", type=int, default=10_000, help="de 1 mil a 1 milhão")
+    parser.add_argument("--requisicoes", type=int, default=1000, help="por rota (as pesadas rodam 1/50)")
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--rotas", nargs="*", help="só cenários cujo nome contém um destes trechos")
+    parser.add_argument("--saida", help="arquivo JSON do relatório (padrão: stdout)")
+    parser.add_argument("--baseline", help="relatório anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="piora relativa aceita (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    if args.treinadores < 1 or args.pokemons < 50:
+        parser.error("use ao menos 1 treinador e 50 pokémon (torneios sorteiam 50 participantes)")
+    return args
+
+
+def main(argv: list[str] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    tables = []
+    with tempfile.TemporaryDirectory() as workdir:
+        env = _backend_env(args, workdir)
+        if args.backend == "dynamodb" and args.url is None:
+            tables = _create_dynamodb_tables(args.dynamodb_endpoint, args.stage)
+        try:
+            report = asyncio.run(_run(args, env))
+        finally:
+            if tables:
+                _drop_dynamodb_tables(args.dynamodb_endpoint, tables)
+    
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = _regressions(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSÃO {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
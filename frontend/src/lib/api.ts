@@ -27,11 +27,23 @@ export interface BattleResult {
   mensagem?: string
 }
 
+// Listagens paginadas: segue o header X-Next-Cursor até a última página
+async function fetchAllPages<T>(path: string, errorMessage: string): Promise<T[]> {
+  const items: T[] = []
+  let cursor: string | null = null
+  do {
+    const query: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''
+    const res: Response = await fetch(`${API_URL}${path}?limit=1000${query}`)
+    if (!res.ok) throw new Error(errorMessage)
+    items.push(...(await res.json()))
+    cursor = res.headers.get('X-Next-Cursor')
+  } while (cursor)
+  return items
+}
+
 // Trainers API
 export async function getTrainers(): Promise<Trainer[]> {
-  const res = await fetch(`${API_URL}/treinadores`)
-  if (!res.ok) throw new Error('Erro ao buscar treinadores')
-  return res.json()
+  return fetchAllPages<Trainer>('/treinadores', 'Erro ao buscar treinadores')
 }
 
 export async function getTrainer(id: number): Promise<Trainer> {
@@ -67,9 +79,7 @@ export async function updateTrainer(id: number, nome: string): Promise<Trainer>
 
 // Pokemon API
 export async function getPokemons(): Promise<Pokemon[]> {
-  const res = await fetch(`${API_URL}/pokemons`)
-  if (!res.ok) throw new Error('Erro ao buscar pokémon')
-  return res.json()
+  return fetchAllPages<Pokemon>('/pokemons', 'Erro ao buscar pokémon')
 }
 
 export async function getPokemon(id: number): Promise<Pokemon> {
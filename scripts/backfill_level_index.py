@@ -0,0 +1,73 @@
+"""
+Migração (DynamoDB): grava nivel_particao e nivel_id nos pokémon criados antes
+dos GSIs de busca (ou só com nivel_particao, da primeira versão deles, que
+ordenava por `nivel`), para que apareçam nas buscas por tipo/nível e no ranking.
+Percorre a tabela com scan paralelo e atualiza só os itens sem os atributos;
+pode ser executado de novo (e junto com a API) sem efeito sobre quem já os tem.
+Uso: python -m scripts.backfill_level_index [segmentos]
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from app.repositories.dynamodb_repository import POKEMONS_TABLE, _get_dynamodb_resource, _index_attributes
+
+
+def _missing():
+    """Itens que ainda não têm os atributos das chaves dos GSIs de nível"""
+    return Attr("nivel_particao").not_exists() | Attr("nivel_id").not_exists()
+
+
+def _fill(table, item: dict) -> bool:
+    """Grava os atributos de um item; False se ele sumiu ou já os recebeu de outra escrita"""
+    while True:
+        attributes = _index_attributes({"id": int(item["id"]), "nivel": int(item["nivel"])})
+        try:
+            table.update_item(
+                Key={"id": item["id"]},
+                UpdateExpression="SET nivel_particao = :particao, nivel_id = :nivel_id",
+                # O nível lido no scan ainda vale (senão nivel_id sairia errado)
+                ConditionExpression=_missing() & Attr("nivel").eq(item["nivel"]),
+                ExpressionAttributeValues={":particao": attributes["nivel_particao"], ":nivel_id": attributes["nivel_id"]}
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+        # Alterado em paralelo: relê e tenta de novo com o nível atual
+        item = table.get_item(Key={"id": item["id"]}, ConsistentRead=True).get("Item")
+        if item is None or ("nivel_particao" in item and "nivel_id" in item):
+            return False
+
+
+def _backfill_segment(table, segment: int, segments: int) -> int:
+    kwargs = {
+        "Segment": segment,
+        "TotalSegments": segments,
+        "FilterExpression": _missing(),
+        "ProjectionExpression": "id, nivel"
+    }
+    updated = 0
+    while True:
+        response = table.scan(**kwargs)
+        updated += sum(_fill(table, item) for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return updated
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def backfill(segments: int = 4) -> int:
+    """Preenche os itens sem os atributos e retorna quantos foram atualizados"""
+    table = _get_dynamodb_resource().Table(POKEMONS_TABLE)
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        return sum(pool.map(lambda segment: _backfill_segment(table, segment, segments), range(segments)))
+
+
+def main(segments: int = 4) -> None:
+    print(f"{POKEMONS_TABLE}: {backfill(segments)} pokémon atualizados")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
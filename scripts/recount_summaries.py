@@ -0,0 +1,77 @@
+"""
+Migração (DynamoDB): recalcula os contadores do resumo por treinador (itens
+`resumo#{id}` da tabela de contadores) a partir dos pokémon gravados, para os
+treinadores com pokémon criados antes dos contadores. Percorre a tabela de
+pokémon com scan paralelo, regrava o item de cada treinador e apaga os itens de
+treinadores que ficaram sem pokémon. Escritas feitas durante a recontagem podem
+ficar de fora: rode com a API parada (ou de novo depois, sem escritas).
+Uso: python -m scripts.recount_summaries [segmentos]
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.conditions import Attr
+
+from app.repositories.dynamodb_repository import (
+    COUNTERS_TABLE, POKEMONS_TABLE, SUMMARY_PREFIX, _get_dynamodb_resource, _summary_deltas
+)
+
+
+def _count_segment(table, segment: int, segments: int) -> dict[int, dict[str, int]]:
+    kwargs = {
+        "Segment": segment,
+        "TotalSegments": segments,
+        "ProjectionExpression": "treinador_id, nivel, tipo"
+    }
+    counts = {}
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            _summary_deltas(item, 1, counts)
+        if "LastEvaluatedKey" not in response:
+            return counts
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _stale_summaries(table) -> list[str]:
+    """Chaves de todos os itens de resumo já gravados"""
+    kwargs = {"FilterExpression": Attr("entity").begins_with(SUMMARY_PREFIX), "ProjectionExpression": "entity"}
+    keys = []
+    while True:
+        response = table.scan(**kwargs)
+        keys.extend(item["entity"] for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return keys
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def recount(segments: int = 4) -> int:
+    """Regrava os contadores de cada treinador e retorna quantos treinadores têm pokémon"""
+    dynamodb = _get_dynamodb_resource()
+    pokemons = dynamodb.Table(POKEMONS_TABLE)
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        partials = list(pool.map(lambda segment: _count_segment(pokemons, segment, segments), range(segments)))
+    counts: dict[int, dict[str, int]] = {}
+    for partial in partials:
+        for treinador_id, names in partial.items():
+            totals = counts.setdefault(treinador_id, {})
+            for name, count in names.items():
+                totals[name] = totals.get(name, 0) + count
+    
+    counters = dynamodb.Table(COUNTERS_TABLE)
+    keys = {f"{SUMMARY_PREFIX}{treinador_id}" for treinador_id in counts}
+    with counters.batch_writer() as batch:
+        for entity in _stale_summaries(counters):
+            if entity not in keys:
+                batch.delete_item(Key={"entity": entity})
+        for treinador_id, names in counts.items():
+            batch.put_item(Item={"entity": f"{SUMMARY_PREFIX}{treinador_id}", **names})
+    return len(counts)
+
+
+def main(segments: int = 4) -> None:
+    print(f"{COUNTERS_TABLE}: resumo de {recount(segments)} treinadores recontado")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,106 @@
+"""
+Fixtures compartilhadas. As do DynamoDB usam o moto em processo (sem AWS nem
+DynamoDB Local) e são puladas quando boto3/moto não estão instalados.
+"""
+import pytest
+
+# Singletons de app/dependencies.py recriados a cada teste da API
+REPOSITORY_SINGLETONS = (
+    "_trainer_repo", "_pokemon_repo", "_async_trainer_repo", "_async_pokemon_repo", "_sqlite_db", "_job_repo", "_job_service",
+    "_battle_memo"
+)
+
+NUMBER_KEY = [{"AttributeName": "id", "AttributeType": "N"}]
+
+
+def _create_tables(repository, indexes: bool) -> None:
+    """Tabelas do serverless.yml; com indexes=False a de pokémon fica sem GSIs (ainda não migrada)"""
+    client = repository._get_dynamodb_resource().meta.client
+    client.create_table(
+        TableName=repository.TRAINERS_TABLE,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=NUMBER_KEY,
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}]
+    )
+    pokemons = {
+        "TableName": repository.POKEMONS_TABLE,
+        "BillingMode": "PAY_PER_REQUEST",
+        "AttributeDefinitions": NUMBER_KEY,
+        "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}]
+    }
+    if indexes:
+        pokemons["AttributeDefinitions"] = NUMBER_KEY + [
+            {"AttributeName": "treinador_id", "AttributeType": "N"},
+            {"AttributeName": "tipo", "AttributeType": "S"},
+            {"AttributeName": "nivel_id", "AttributeType": "N"},
+            {"AttributeName": "nivel_particao", "AttributeType": "N"}
+        ]
+        pokemons["GlobalSecondaryIndexes"] = [
+            {"IndexName": index, "KeySchema": schema, "Projection": {"ProjectionType": "ALL"}}
+            for index, schema in (
+                (repository.TRAINER_INDEX, [{"AttributeName": "treinador_id", "KeyType": "HASH"}]),
+                (repository.TYPE_LEVEL_INDEX, [{"AttributeName": "tipo", "KeyType": "HASH"}, {"AttributeName": "nivel_id", "KeyType": "RANGE"}]),
+                (repository.LEVEL_INDEX, [{"AttributeName": "nivel_particao", "KeyType": "HASH"}, {"AttributeName": "nivel_id", "KeyType": "RANGE"}])
+            )
+        ]
+    client.create_table(**pokemons)
+    client.create_table(
+        TableName=repository.COUNTERS_TABLE,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[{"AttributeName": "entity", "AttributeType": "S"}],
+        KeySchema=[{"AttributeName": "entity", "KeyType": "HASH"}]
+    )
+
+
+@pytest.fixture
+def mock_dynamodb(monkeypatch):
+    """Módulo dynamodb_repository apontando para um DynamoDB simulado, sem tabelas"""
+    pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    from app.repositories import dynamodb_repository as repository
+    with moto.mock_aws():
+        monkeypatch.setattr(repository, "ENDPOINT_URL", None)
+        monkeypatch.setattr(repository, "_resource", None)
+        monkeypatch.setattr(repository, "_allocators", {
+            "trainer": repository.IdAllocator("trainer", repository.TRAINER_ID_BLOCK_SIZE),
+            "pokemon": repository.IdAllocator("pokemon", repository.POKEMON_ID_BLOCK_SIZE)
+        })
+        yield repository
+
+
+@pytest.fixture
+def dynamodb(mock_dynamodb):
+    """Tabelas com todos os GSIs"""
+    _create_tables(mock_dynamodb, indexes=True)
+    return mock_dynamodb
+
+
+@pytest.fixture
+def dynamodb_without_indexes(mock_dynamodb):
+    """Tabela de pokémon sem GSIs (deploy ainda não migrado)"""
+    _create_tables(mock_dynamodb, indexes=False)
+    return mock_dynamodb
+
+
+@pytest.fixture
+def sqlite_database(tmp_path):
+    """Banco SQLite novo num arquivo temporário"""
+    from app.repositories.sqlite_repository import SQLiteDatabase
+    return SQLiteDatabase(str(tmp_path / "pokedex.db"))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """TestClient da API com repositórios em memória novos"""
+    testclient = pytest.importorskip("fastapi.testclient")
+    from app import dependencies
+    for name in REPOSITORY_SINGLETONS:
+        monkeypatch.setattr(dependencies, name, None)
+    monkeypatch.setattr(dependencies, "USE_DYNAMODB", False)
+    monkeypatch.setattr(dependencies, "SQLITE_PATH", "")
+    monkeypatch.setattr(dependencies, "MEMORY_DATA_DIR", "")
+    from app.main import app
+    with testclient.TestClient(app) as test_client:
+        yield test_client
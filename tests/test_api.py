@@ -0,0 +1,130 @@
+"""Rotas da API com o backend em memória"""
+from app.main import DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER
+
+
+def test_list_without_limit_is_paginated(client):
+    trainer = client.post("/treinadores", json={"nome": "Ash"}).json()
+    count = DEFAULT_PAGE_SIZE + 5
+    client.post("/pokemons/lote", json={"pokemons": [
+        {"nome": f"Pokemon{i}", "tipo": "Fogo", "nivel": 1, "treinador_id": trainer["id"]} for i in range(count)
+    ]})
+    
+    first = client.get("/pokemons")
+    assert len(first.json()) == DEFAULT_PAGE_SIZE
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    rest = client.get("/pokemons", params={"cursor": cursor})
+    assert len(rest.json()) == count - DEFAULT_PAGE_SIZE
+    assert NEXT_CURSOR_HEADER not in rest.headers
+    
+    trainers = client.get("/treinadores")
+    assert [t["nome"] for t in trainers.json()] == ["Ash"]
+    assert NEXT_CURSOR_HEADER not in trainers.headers
+
+
+def test_summaries_without_ids_are_paginated(client):
+    client.post("/treinadores/lote", json={"treinadores": [{"nome": f"T{i}"} for i in range(5)]})
+    
+    first = client.get("/treinadores/resumo", params={"limit": 3})
+    assert len(first.json()) == 3
+    rest = client.get("/treinadores/resumo", params={"limit": 3, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    assert len(rest.json()) == 2 and NEXT_CURSOR_HEADER not in rest.headers
+    assert client.get("/treinadores/resumo", params={"cursor": "x"}).status_code == 400
+
+
+def test_level_beyond_32_bits_is_rejected(client, monkeypatch):
+    from app import dependencies
+    monkeypatch.setattr(dependencies, "MEMORY_BACKEND", "columnar")
+    trainer = client.post("/treinadores", json={"nome": "Ash"}).json()
+    pokemon = client.post("/pokemons", json={"nome": "Pikachu", "tipo": "Elétrico", "nivel": 5, "treinador_id": trainer["id"]}).json()
+    
+    assert client.post("/pokemons", json={"nome": "X", "tipo": "Fogo", "nivel": 2 ** 31, "treinador_id": trainer["id"]}).status_code == 422
+    assert client.put(f"/pokemons/{pokemon['id']}", json={"nivel": 2 ** 31}).status_code == 422
+    assert client.get(f"/pokemons/{pokemon['id']}").json()["nivel"] == 5
+    assert client.get(f"/treinadores/{trainer['id']}/resumo").json()["nivel_maximo"] == 5
+
+
+def test_failed_prewarm_does_not_break_import(tmp_path):
+    import os
+    import subprocess
+    import sys
+    # Snapshot ilegível: a recuperação do disco falha dentro do warm_up()
+    (tmp_path / "treinadores.snapshot").write_bytes(b"corrompido")
+    env = {**os.environ, "PREWARM": "true", "MEMORY_DATA_DIR": str(tmp_path), "USE_DYNAMODB": "false", "SQLITE_PATH": ""}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", "import app.main"], env=env, cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "Pré-aquecimento falhou" in result.stderr
+
+
+def test_level_filters_are_bounded(client):
+    from app.models import MAX_LEVEL
+    assert client.get("/pokemons", params={"nivel_min": 10 ** 30}).status_code == 422
+    assert client.get("/pokemons", params={"nivel_max": MAX_LEVEL + 1}).status_code == 422
+    assert client.get("/pokemons", params={"nivel_max": MAX_LEVEL}).status_code == 200
+
+
+def test_battle_memo_is_enabled_by_default(client):
+    trainer = client.post("/treinadores", json={"nome": "Ash"}).json()
+    created = client.post("/pokemons/lote", json={"pokemons": [
+        {"nome": nome, "tipo": tipo, "nivel": 5, "treinador_id": trainer["id"]}
+        for nome, tipo in [("Charmander", "Fogo"), ("Bulbasaur", "Planta"), ("Squirtle", "Água")]
+    ]}).json()
+    charmander, bulbasaur, squirtle = (p["id"] for p in created)
+    
+    battle = {"pokemon_atacante_id": charmander, "pokemon_defensor_id": bulbasaur}
+    assert client.post("/batalhas", json=battle).json()["vencedor"]["id"] == charmander
+    batch = client.post("/batalhas/lote", json={"batalhas": [
+        battle, {"pokemon_atacante_id": squirtle, "pokemon_defensor_id": charmander}
+    ]}).json()
+    assert [r["vencedor"]["id"] for r in batch] == [charmander, squirtle]
+    
+    stats = client.get("/batalhas/memo")
+    assert stats.status_code == 200
+    assert (stats.json()["hits"], stats.json()["misses"]) == (1, 2)
+
+
+def test_ranking_by_level_breaks_ties_by_id(client):
+    ash, misty = (client.post("/treinadores", json={"nome": nome}).json()["id"] for nome in ("Ash", "Misty"))
+    created = client.post("/pokemons/lote", json={"pokemons": [
+        {"nome": f"P{i}", "tipo": ("Fogo", "Água")[i % 2], "nivel": i % 4 + 1, "treinador_id": (ash, misty)[i % 3 == 0]}
+        for i in range(20)
+    ]}).json()
+    
+    def ranking(pokemons: list[dict]) -> list[int]:
+        return [p["id"] for p in sorted(pokemons, key=lambda p: (-p["nivel"], p["id"]))]
+    
+    assert [p["id"] for p in client.get("/pokemons/ranking", params={"top": 5}).json()] == ranking(created)[:5]
+    fire = [p for p in created if p["tipo"] == "Fogo" and p["treinador_id"] == ash]
+    response = client.get("/pokemons/ranking", params={"top": 3, "tipo": "Fogo", "treinador_id": ash})
+    assert [p["id"] for p in response.json()] == ranking(fire)[:3]
+    assert client.get("/pokemons/ranking", params={"top": 0}).status_code == 422
+
+
+def test_filtered_search_is_paginated(client):
+    trainer = client.post("/treinadores", json={"nome": "Ash"}).json()
+    created = client.post("/pokemons/lote", json={"pokemons": [
+        {"nome": f"P{i % 7}", "tipo": ("Fogo", "Água")[i % 2], "nivel": i % 5 + 1, "treinador_id": trainer["id"]}
+        for i in range(DEFAULT_PAGE_SIZE * 2 + 30)
+    ]}).json()
+    fire = [p for p in created if p["tipo"] == "Fogo"]
+    
+    first = client.get("/pokemons", params={"tipo": "Fogo"})
+    assert [p["id"] for p in first.json()] == [p["id"] for p in fire[:DEFAULT_PAGE_SIZE]]
+    assert NEXT_CURSOR_HEADER in first.headers
+    
+    for sort, key in (("-nivel", lambda p: (-p["nivel"], p["id"])), ("nome", lambda p: (p["nome"], p["id"]))):
+        params = {"tipo": "Fogo", "nivel_max": 4, "sort": sort, "limit": 9}
+        pages = []
+        for _ in range(len(fire)):
+            response = client.get("/pokemons", params=params)
+            pages.extend(p["id"] for p in response.json())
+            if NEXT_CURSOR_HEADER not in response.headers:
+                break
+            params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+        assert pages == [p["id"] for p in sorted(fire, key=key) if p["nivel"] <= 4]
+    
+    # Cursor de outra ordenação, cursor ilegível e ordenação por nome sem filtro seletivo
+    cursor = client.get("/pokemons", params={"tipo": "Fogo", "sort": "nome", "limit": 1}).headers[NEXT_CURSOR_HEADER]
+    assert client.get("/pokemons", params={"tipo": "Fogo", "sort": "nivel", "cursor": cursor}).status_code == 400
+    assert client.get("/pokemons", params={"tipo": "Fogo", "cursor": "x"}).status_code == 400
+    assert client.get("/pokemons", params={"sort": "-nome"}).status_code == 400
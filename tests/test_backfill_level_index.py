@@ -0,0 +1,52 @@
+"""Migração dos GSIs de busca (moto): pokémon antigos recebem nivel_particao e nivel_id"""
+from scripts import backfill_level_index
+
+
+def put_legacy(repository, pokemon_id: int, nivel: int, tipo: str = "Fogo") -> None:
+    """Item gravado antes dos GSIs de busca (sem os atributos das chaves)"""
+    table = repository.DynamoDBPokemonRepository()._table
+    table.put_item(Item={"id": pokemon_id, "nome": f"Antigo{pokemon_id}", "tipo": tipo, "nivel": nivel, "treinador_id": 1})
+
+
+def test_backfill_makes_old_items_searchable(dynamodb):
+    for pokemon_id in range(1001, 1031):
+        put_legacy(dynamodb, pokemon_id, pokemon_id % 7 + 1)
+    repo = dynamodb.DynamoDBPokemonRepository()
+    new = repo.create("Novo", "Fogo", 50, 1)
+    assert [int(p["id"]) for p in repo.find(nivel_min=1)] == [new["id"]]
+    
+    assert backfill_level_index.backfill(segments=3) == 30
+    found = repo.find(tipo="Fogo", sort="-nivel")
+    assert len(found) == 31 and int(found[0]["id"]) == new["id"]
+    assert len(repo.find(nivel_min=1, nivel_max=7)) == 30
+    assert backfill_level_index.backfill(segments=3) == 0
+
+
+def test_backfill_uses_the_current_level_after_a_concurrent_update(dynamodb):
+    put_legacy(dynamodb, 7, 3)
+    repo = dynamodb.DynamoDBPokemonRepository()
+    # Nível alterado entre o scan e a gravação (o item lido no scan tem o nível antigo)
+    repo._table.update_item(Key={"id": 7}, UpdateExpression="SET nivel = :n", ExpressionAttributeValues={":n": 9})
+    
+    assert backfill_level_index._fill(repo._table, {"id": 7, "nivel": 3}) is True
+    assert int(repo.get(7)["nivel_id"]) == 9 * dynamodb.NIVEL_ID_FACTOR + 7
+    assert backfill_level_index._fill(repo._table, {"id": 7, "nivel": 9}) is False
+
+
+def test_backfill_fills_nivel_id_left_out_by_the_first_index_version(dynamodb):
+    # Primeira versão dos GSIs: nivel_particao gravado, nivel_id não
+    table = dynamodb.DynamoDBPokemonRepository()._table
+    table.put_item(Item={"id": 5, "nome": "Antigo", "tipo": "Água", "nivel": 12, "treinador_id": 1, "nivel_particao": 5})
+    
+    assert backfill_level_index.backfill(segments=1) == 1
+    repo = dynamodb.DynamoDBPokemonRepository()
+    assert [int(p["id"]) for p in repo.find(tipo="Água", nivel_min=12, nivel_max=12)] == [5]
+
+
+def test_largest_level_fits_the_sort_key(dynamodb):
+    from app.models import MAX_LEVEL
+    repo = dynamodb.DynamoDBPokemonRepository()
+    top = repo.create("Máximo", "Fogo", MAX_LEVEL, 1)
+    repo.create("Mínimo", "Fogo", 1, 1)
+    assert [int(p["id"]) for p in repo.find(nivel_min=MAX_LEVEL, nivel_max=MAX_LEVEL)] == [top["id"]]
+    assert int(repo.find(tipo="Fogo", sort="-nivel", limit=1)[0]["id"]) == top["id"]
@@ -0,0 +1,86 @@
+"""Serviço de batalhas: os caminhos em lote conferidos com battle()"""
+import asyncio
+import random
+
+import pytest
+
+from app.models import BattleRequest, BattleBatchRequest, BattleSimulationRequest
+from app.repositories.async_repository import AsyncPokemonRepository
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.services import battle_service
+from app.services.battle_service import BattleService, DecisionMemo
+from app.services.type_chart import DEFAULT_TYPE_CHART
+
+TYPES = ["Fogo", "Planta", "Água", "Elétrico", "fogo "]
+
+
+@pytest.fixture
+def pokemon_ids() -> tuple[MemoryPokemonRepository, list[int]]:
+    rnd = random.Random(7)
+    repo = MemoryPokemonRepository()
+    ids = [repo.create(f"P{i}", rnd.choice(TYPES), rnd.randint(1, 4), 1)["id"] for i in range(60)]
+    return repo, ids
+
+
+@pytest.mark.parametrize("memo_size", [0, 64])
+@pytest.mark.parametrize("inline_battles", [battle_service.INLINE_BATTLES, 0])
+def test_battle_batch_matches_battle(pokemon_ids, monkeypatch, inline_battles, memo_size):
+    # INLINE_BATTLES=0 resolve o lote na thread, fora do event loop; com o memo, os dois caminhos passam por ele
+    monkeypatch.setattr(battle_service, "INLINE_BATTLES", inline_battles)
+    repo, ids = pokemon_ids
+    memo = DecisionMemo(DEFAULT_TYPE_CHART, memo_size) if memo_size else None
+    service = BattleService(pokemon_repo=AsyncPokemonRepository(repo), memo=memo)
+    rnd = random.Random(3)
+    requests = [BattleRequest(pokemon_atacante_id=a, pokemon_defensor_id=d) for a, d in (rnd.sample(ids, 2) for _ in range(500))]
+    
+    async def run():
+        single = [await service.battle(request) for request in requests]
+        return single, await service.battle_batch(BattleBatchRequest(batalhas=requests))
+    
+    single, batched = asyncio.run(run())
+    assert [r.model_dump() for r in batched] == [r.model_dump() for r in single]
+    if memo is not None:
+        # O lote repete os confrontos de battle(): todos os de mesmo nível acertam no memo
+        stats = memo.stats()
+        assert stats["hits"] >= stats["misses"] > 0
+
+
+def test_simulation_with_huge_level_gap(monkeypatch):
+    # Diferença de nível que estourava math.exp; o pool só é pedido acima de INLINE_ROUNDS
+    monkeypatch.setattr(battle_service, "INLINE_ROUNDS", 0)
+    repo = MemoryPokemonRepository()
+    weak = repo.create("Fraco", "Fogo", 1, 1)["id"]
+    strong = repo.create("Forte", "Fogo", 2 ** 31 - 1, 1)["id"]
+    requested = []
+    
+    def no_pool():
+        requested.append(True)
+        return None
+    
+    service = BattleService(pokemon_repo=AsyncPokemonRepository(repo), simulation_executor_factory=no_pool)
+    request = BattleSimulationRequest(batalhas=[
+        BattleRequest(pokemon_atacante_id=weak, pokemon_defensor_id=strong),
+        BattleRequest(pokemon_atacante_id=strong, pokemon_defensor_id=weak)
+    ], rodadas=1000, semente=1)
+    results = asyncio.run(service.simulate(request))
+    
+    assert [(r.vitorias_atacante, r.vitorias_defensor) for r in results] == [(0, 1000), (1000, 0)]
+    assert requested == [True]
+
+
+def test_process_pool_failure_is_remembered(monkeypatch):
+    import concurrent.futures
+    from app import dependencies
+    attempts = []
+    
+    def unsupported(max_workers):
+        attempts.append(max_workers)
+        raise NotImplementedError
+    
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", unsupported)
+    monkeypatch.setattr(dependencies, "SIMULATION_WORKERS", 2)
+    monkeypatch.setattr(dependencies, "_process_pool", None)
+    monkeypatch.setattr(dependencies, "_process_pool_failed", False)
+    assert dependencies._get_process_pool() is None
+    assert dependencies._get_process_pool() is None
+    assert attempts == [2]
@@ -0,0 +1,77 @@
+"""
+Cache de leitura: acerto, falta, invalidação nas escritas e a corrida em que
+uma escrita acontece entre a leitura do repositório e a gravação no cache.
+"""
+from app.repositories.cached_repository import CachedPokemonRepository
+from app.repositories.memory_repository import MemoryPokemonRepository
+
+
+class SlowReadRepository(MemoryPokemonRepository):
+    """Roda `during_read` depois de ler o item e antes de devolvê-lo (a leitura fica antiga)"""
+    
+    during_read = None
+    
+    def get(self, pokemon_id: int):
+        item = super().get(pokemon_id)
+        self._run_hook()
+        return item
+    
+    def get_many(self, pokemon_ids: list[int]):
+        items = super().get_many(pokemon_ids)
+        self._run_hook()
+        return items
+    
+    def _run_hook(self) -> None:
+        hook, self.during_read = self.during_read, None
+        if hook is not None:
+            hook()
+
+
+def make_cached() -> tuple[CachedPokemonRepository, SlowReadRepository, dict]:
+    inner = SlowReadRepository()
+    pokemon = inner.create("Pikachu", "Elétrico", 5, 1)
+    return CachedPokemonRepository(inner, max_size=10, ttl_seconds=60), inner, pokemon
+
+
+def test_miss_then_hit():
+    cached, _, pokemon = make_cached()
+    assert cached.get(pokemon["id"]) == pokemon
+    assert cached.get(pokemon["id"]) == pokemon
+    assert cached.get(999) is None
+    stats = cached.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 1)
+
+
+def test_writes_invalidate():
+    cached, _, pokemon = make_cached()
+    cached.get(pokemon["id"])
+    cached.update(pokemon["id"], nivel=9)
+    assert cached.get(pokemon["id"])["nivel"] == 9
+    
+    cached.delete(pokemon["id"])
+    assert cached.get(pokemon["id"]) is None
+
+
+def test_delete_by_trainer_invalidates():
+    cached, _, pokemon = make_cached()
+    cached.get(pokemon["id"])
+    assert cached.delete_by_trainer(1) == 1
+    assert cached.get(pokemon["id"]) is None
+
+
+def test_update_during_a_miss_is_not_overwritten_by_the_old_read():
+    cached, inner, pokemon = make_cached()
+    inner.during_read = lambda: cached.update(pokemon["id"], nivel=9)
+    
+    assert cached.get(pokemon["id"])["nivel"] == 5
+    assert cached.get(pokemon["id"])["nivel"] == 9
+    assert cached.get_many([pokemon["id"]])[pokemon["id"]]["nivel"] == 9
+
+
+def test_delete_during_a_batch_miss_is_not_cached():
+    cached, inner, pokemon = make_cached()
+    inner.during_read = lambda: cached.delete_by_trainer(1)
+    
+    assert pokemon["id"] in cached.get_many([pokemon["id"]])
+    assert cached.get(pokemon["id"]) is None
+    assert cached._cache._loading == {} and cached._cache._invalidated == {}
@@ -0,0 +1,37 @@
+"""
+Repositório colunar: valores que não cabem nas colunas são recusados antes de
+qualquer escrita, sem deixar colunas, índices e contadores desencontrados.
+"""
+import pytest
+
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+
+
+@pytest.fixture
+def repo() -> ColumnarPokemonRepository:
+    repo = ColumnarPokemonRepository()
+    repo.create("Pikachu", "Elétrico", 5, 1)
+    return repo
+
+
+def assert_unchanged(repo: ColumnarPokemonRepository) -> None:
+    assert repo.list_all() == [{"id": 1, "nome": "Pikachu", "tipo": "Elétrico", "nivel": 5, "treinador_id": 1}]
+    assert repo.find(tipo="Elétrico") == repo.find(nivel_min=1) == repo.list_all()
+    assert repo.get_summaries([1])[1]["quantidade"] == 1
+
+
+def test_update_out_of_range_leaves_row_untouched(repo):
+    with pytest.raises(ValueError):
+        repo.update(1, nome="Raichu", tipo="Fogo", nivel=2 ** 31)
+    assert_unchanged(repo)
+
+
+def test_create_out_of_range_writes_nothing(repo):
+    with pytest.raises(ValueError):
+        repo.create("Grande", "Fogo", 2 ** 31, 1)
+    with pytest.raises(ValueError):
+        repo.create_many([
+            {"nome": "Ok", "tipo": "Fogo", "nivel": 3, "treinador_id": 1},
+            {"nome": "Grande", "tipo": "Fogo", "nivel": 5, "treinador_id": 2 ** 63}
+        ])
+    assert_unchanged(repo)
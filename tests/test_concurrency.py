@@ -0,0 +1,135 @@
+"""
+Repositórios em memória (dict em shards e colunar) e SQLite (uma conexão por
+thread, contadores por trigger) sob escritas concorrentes: IDs únicos, índices e
+contadores iguais aos dados e, na memória, nenhuma criação paralela sobrevive à
+exclusão em cascata do treinador.
+"""
+import random
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+from app.repositories.sqlite_repository import SQLitePokemonRepository
+from app.repositories.summary import build_summary
+
+TRAINERS = 8
+TYPES = ("Fogo", "Água", "Planta")
+THREADS = 8
+
+
+def make_repo(request):
+    if request.param == "sqlite":
+        return SQLitePokemonRepository(request.getfixturevalue("sqlite_database"))
+    return MemoryPokemonRepository(shards=4) if request.param == "dict" else ColumnarPokemonRepository()
+
+
+@pytest.fixture(params=["dict", "columnar"])
+def repo(request):
+    return make_repo(request)
+
+
+@pytest.fixture(params=["dict", "columnar", "sqlite"])
+def any_repo(request):
+    return make_repo(request)
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # Trocas de thread bem mais frequentes que o padrão (5 ms) expõem as corridas
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target, count: int = THREADS) -> None:
+    threads = [threading.Thread(target=target, args=(seed,)) for seed in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def assert_consistent(repo) -> None:
+    everything = repo.list_all()
+    for treinador_id in range(1, TRAINERS + 1):
+        mine = [p for p in everything if p["treinador_id"] == treinador_id]
+        assert sorted(repo.get_by_trainer(treinador_id), key=lambda p: p["id"]) == mine
+        levels = Counter(p["nivel"] for p in mine)
+        types = Counter(p["tipo"] for p in mine)
+        assert repo.get_summaries([treinador_id])[treinador_id] == build_summary(treinador_id, levels, types)
+    for tipo in TYPES:
+        assert sorted(repo.find(tipo=tipo), key=lambda p: p["id"]) == [p for p in everything if p["tipo"] == tipo]
+    assert sorted(repo.find(nivel_min=5, nivel_max=15), key=lambda p: p["id"]) == [
+        p for p in everything if 5 <= p["nivel"] <= 15
+    ]
+
+
+def test_concurrent_writes_keep_indexes_consistent(any_repo):
+    repo = any_repo
+    for i in range(200):
+        repo.create(f"Base{i}", TYPES[i % 3], i % 20 + 1, i % TRAINERS + 1)
+    created = []
+    
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        for _ in range(1500):
+            op = rnd.random()
+            # Atualizações e exclusões disputam os mesmos IDs entre as threads
+            pokemon_id = rnd.randint(1, 200 + len(created))
+            if op < 0.4:
+                pokemon = repo.create("Novo", rnd.choice(TYPES), rnd.randint(1, 20), rnd.randint(1, TRAINERS))
+                created.append(pokemon["id"])
+            elif op < 0.8:
+                repo.update(pokemon_id, tipo=rnd.choice(TYPES), nivel=rnd.randint(1, 20))
+            elif op < 0.95:
+                repo.delete(pokemon_id)
+            else:
+                repo.get(pokemon_id)
+    
+    run_threads(worker)
+    assert len(created) == len(set(created))
+    assert_consistent(repo)
+
+
+def test_cascade_leaves_no_pokemon_behind(repo):
+    for round_ in range(20):
+        treinador_id = TRAINERS + 1 + round_
+        survivors = []
+        
+        def worker(seed: int) -> None:
+            if seed == 0:
+                repo.delete_by_trainer(treinador_id)
+                return
+            for i in range(50):
+                try:
+                    survivors.append(repo.create(f"P{i}", "Fogo", 10, treinador_id)["id"])
+                except ValueError:
+                    return
+        
+        run_threads(worker)
+        assert repo.get_by_trainer(treinador_id) == []
+        assert [pid for pid in survivors if repo.get(pid) is not None] == []
+        assert repo.get_summaries([treinador_id])[treinador_id]["quantidade"] == 0
+        with pytest.raises(ValueError):
+            repo.create("Tarde", "Fogo", 10, treinador_id)
+
+
+def test_removed_trainers_expire_and_survive_snapshots(repo, monkeypatch):
+    from app.repositories import removed_trainers
+    now = [1000.0]
+    monkeypatch.setattr(removed_trainers.time, "time", lambda: now[0])
+    repo.delete_by_trainer(1)
+    
+    restored = type(repo)()
+    restored.restore(repo.snapshot())
+    with pytest.raises(ValueError):
+        restored.create("Tarde", "Fogo", 10, 1)
+    
+    now[0] += removed_trainers.REMOVED_TRAINER_RETENTION_SECONDS + 1
+    assert len(repo._removed_trainers) == 0
+    assert restored.create("Novo", "Fogo", 10, 1)["treinador_id"] == 1
@@ -0,0 +1,178 @@
+"""
+Persistência do backend em memória: cada escrita está no disco quando retorna,
+escritas concorrentes dividem o fsync (também pela API, fora do event loop), só
+o último registro do log pode estar incompleto e a compactação não trava as
+escritas e, se falhar, é refeita depois.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.repositories import durable_repository
+from app.repositories.durable_repository import CorruptLogError, DurablePokemonRepository, encode_record, read_log
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+from app.repositories.memory_repository import MemoryPokemonRepository
+from tests.conftest import REPOSITORY_SINGLETONS
+
+
+def log_path(directory) -> str:
+    return os.path.join(directory, "pokemons.log")
+
+
+def test_write_is_on_disk_when_it_returns(tmp_path):
+    repo = DurablePokemonRepository(MemoryPokemonRepository(), str(tmp_path))
+    pokemon = repo.create("Pikachu", "Elétrico", 5, 1)
+    repo.update(pokemon["id"], nivel=6)
+    # Sem flush nem close: o que está no arquivo é o que sobrevive a uma queda
+    assert read_log(log_path(tmp_path)) == [("c", [pokemon]), ("u", pokemon["id"], {"nivel": 6})]
+    repo.close()
+
+
+def test_concurrent_writes_share_fsyncs(tmp_path, monkeypatch):
+    repo = DurablePokemonRepository(MemoryPokemonRepository(), str(tmp_path))
+    fsyncs = []
+    real_fsync = os.fsync
+    
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.002)
+        real_fsync(fd)
+    
+    monkeypatch.setattr(durable_repository.os, "fsync", slow_fsync)
+    threads = [
+        threading.Thread(target=lambda t=t: [repo.create(f"P{i}", "Fogo", 5, t) for i in range(25)])
+        for t in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(read_log(log_path(tmp_path))) == 200
+    assert len(fsyncs) < 100
+    repo.close()
+
+
+def test_only_a_torn_last_record_is_dropped(tmp_path):
+    path = str(tmp_path / "x.log")
+    records = [encode_record(("d", i)) for i in range(3)]
+    with open(path, "wb") as f:
+        f.write(b"".join(records) + records[0][:-3])
+    assert read_log(path) == [("d", 0), ("d", 1), ("d", 2)]
+    assert os.path.getsize(path) == len(b"".join(records))
+    
+    # Último registro completo no tamanho, mas com bytes errados (gravado pela metade)
+    with open(path, "ab") as f:
+        f.write(records[0][:-1] + b"\xff")
+    assert read_log(path) == [("d", 0), ("d", 1), ("d", 2)]
+    
+    # O mesmo estrago no meio do arquivo não é uma escrita interrompida
+    damaged = bytearray(b"".join(records))
+    damaged[len(records[0]) - 1] ^= 0xFF
+    with open(path, "wb") as f:
+        f.write(bytes(damaged))
+    with pytest.raises(CorruptLogError):
+        read_log(path)
+    assert os.path.getsize(path) == len(damaged)
+
+
+def test_failed_compaction_is_retried(tmp_path, monkeypatch):
+    repo = DurablePokemonRepository(MemoryPokemonRepository(), str(tmp_path))
+    first = repo.create("Pikachu", "Elétrico", 5, 1)
+    real_write_snapshot = durable_repository.write_snapshot
+    
+    def disk_full(path, image):
+        raise OSError("sem espaço")
+    
+    monkeypatch.setattr(durable_repository, "write_snapshot", disk_full)
+    with pytest.raises(OSError):
+        repo.compact()
+    assert repo._store._compacting is False
+    second = repo.create("Charmander", "Fogo", 7, 2)
+    
+    monkeypatch.setattr(durable_repository, "write_snapshot", real_write_snapshot)
+    repo.compact()
+    third = repo.create("Bulbasaur", "Planta", 9, 3)
+    repo.close()
+    assert not os.path.exists(log_path(tmp_path) + ".old")
+    
+    recovered = DurablePokemonRepository(MemoryPokemonRepository(), str(tmp_path))
+    assert recovered.list_all() == [first, second, third]
+    recovered.close()
+
+
+@pytest.mark.parametrize("inner_class", [MemoryPokemonRepository, ColumnarPokemonRepository])
+def test_writes_proceed_while_compacting(tmp_path, inner_class):
+    inner = inner_class()
+    repo = DurablePokemonRepository(inner, str(tmp_path))
+    first = repo.create("Pikachu", "Elétrico", 5, 1)
+    copying = threading.Event()
+    written = threading.Event()
+    real_snapshot = inner.snapshot
+    
+    def slow_snapshot():
+        image = real_snapshot()
+        copying.set()
+        # A cópia fica "em andamento" até uma escrita terminar
+        written.wait(5)
+        return image
+    
+    inner.snapshot = slow_snapshot
+    compaction = threading.Thread(target=repo.compact)
+    compaction.start()
+    assert copying.wait(5)
+    start = time.monotonic()
+    second = repo.create("Charmander", "Fogo", 7, 1)
+    repo.update(first["id"], nivel=6)
+    # As escritas terminaram com a cópia ainda em andamento
+    assert time.monotonic() - start < 2 and compaction.is_alive()
+    written.set()
+    compaction.join(5)
+    assert not compaction.is_alive()
+    repo.close()
+    
+    recovered = DurablePokemonRepository(inner_class(), str(tmp_path))
+    assert recovered.list_all() == [{**first, "nivel": 6}, second]
+    assert [p["id"] for p in recovered.get_by_trainer(1)] == [first["id"], second["id"]]
+    recovered.close()
+
+
+def test_api_writes_share_fsyncs_off_the_event_loop(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    from app import dependencies
+    from app.main import app
+    for name in REPOSITORY_SINGLETONS + ("_executor",):
+        monkeypatch.setattr(dependencies, name, None)
+    monkeypatch.setattr(dependencies, "USE_DYNAMODB", False)
+    monkeypatch.setattr(dependencies, "SQLITE_PATH", "")
+    monkeypatch.setattr(dependencies, "MEMORY_DATA_DIR", str(tmp_path))
+    fsync_threads = []
+    real_fsync = os.fsync
+    
+    def slow_fsync(fd):
+        fsync_threads.append(threading.current_thread())
+        time.sleep(0.002)
+        real_fsync(fd)
+    
+    monkeypatch.setattr(durable_repository.os, "fsync", slow_fsync)
+    
+    async def scenario() -> list:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            trainer = (await client.post("/treinadores", json={"nome": "Ash"})).json()
+            fsync_threads.clear()
+            return await asyncio.gather(*(
+                client.post("/pokemons", json={"nome": f"P{i}", "tipo": "Fogo", "nivel": 5, "treinador_id": trainer["id"]})
+                for i in range(200)
+            ))
+    
+    try:
+        responses = asyncio.run(scenario())
+    finally:
+        dependencies._executor.shutdown()
+    assert [response.status_code for response in responses] == [201] * 200
+    assert threading.current_thread() not in fsync_threads
+    assert len(fsync_threads) < 100
@@ -0,0 +1,107 @@
+"""
+Repositório DynamoDB (moto): pokémon por treinador pelo GSI, com resultados
+acima de 1 MB (várias páginas), e pelo scan de fallback quando a tabela ainda
+não tem o índice, voltando ao GSI depois que ele é criado.
+"""
+import pytest
+
+# ~4 KB por item: 300 itens passam de 1 MB, o limite de uma página de query/scan
+LARGE_NAME = "x" * 4000
+TRAINER_ITEMS = 300
+
+
+class CallCounter:
+    """Envolve um método do boto3 contando as chamadas"""
+    
+    def __init__(self, method):
+        self._method = method
+        self.calls = 0
+    
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return self._method(**kwargs)
+
+
+def populate(repository) -> object:
+    repo = repository.DynamoDBPokemonRepository()
+    repo.create_many([
+        {"nome": f"{LARGE_NAME}{i}", "tipo": "Fogo", "nivel": i % 100 + 1, "treinador_id": 1 if i < TRAINER_ITEMS else 2}
+        for i in range(TRAINER_ITEMS + 20)
+    ])
+    return repo
+
+
+def spy(monkeypatch, repo) -> tuple[CallCounter, CallCounter]:
+    query, scan = CallCounter(repo._table.query), CallCounter(repo._table.scan)
+    monkeypatch.setattr(repo._table, "query", query)
+    monkeypatch.setattr(repo._table, "scan", scan)
+    return query, scan
+
+
+def expected_ids(repo, treinador_id: int) -> list[int]:
+    return sorted(int(p["id"]) for p in repo.list_all() if p["treinador_id"] == treinador_id)
+
+
+def trainer_ids(repo, treinador_id: int) -> list[int]:
+    return sorted(int(p["id"]) for p in repo.get_by_trainer(treinador_id))
+
+
+def test_get_by_trainer_follows_gsi_pages(dynamodb, monkeypatch):
+    repo = populate(dynamodb)
+    expected = expected_ids(repo, 1)
+    query, scan = spy(monkeypatch, repo)
+    
+    assert trainer_ids(repo, 1) == expected
+    assert len(expected) == TRAINER_ITEMS
+    assert query.calls > 1
+    assert scan.calls == 0
+
+
+def test_get_by_trainer_falls_back_to_scan(dynamodb_without_indexes, monkeypatch):
+    repo = populate(dynamodb_without_indexes)
+    expected = expected_ids(repo, 1)
+    query, scan = spy(monkeypatch, repo)
+    
+    assert trainer_ids(repo, 1) == expected
+    assert scan.calls > 1
+    # O GSI ausente não é consultado de novo antes do prazo
+    queries = query.calls
+    assert trainer_ids(repo, 1) == expected
+    assert query.calls == queries
+
+
+def test_get_by_trainer_probes_index_again(dynamodb_without_indexes, monkeypatch):
+    repository = dynamodb_without_indexes
+    repo = populate(repository)
+    expected = expected_ids(repo, 1)
+    assert trainer_ids(repo, 1) == expected
+    
+    repo._table.meta.client.update_table(
+        TableName=repository.POKEMONS_TABLE,
+        AttributeDefinitions=[{"AttributeName": "treinador_id", "AttributeType": "N"}],
+        GlobalSecondaryIndexUpdates=[{"Create": {
+            "IndexName": repository.TRAINER_INDEX,
+            "KeySchema": [{"AttributeName": "treinador_id", "KeyType": "HASH"}],
+            "Projection": {"ProjectionType": "ALL"}
+        }}]
+    )
+    # Vencido o prazo, a próxima leitura tenta o GSI e fica nele
+    monkeypatch.setitem(repo._missing_indexes, repository.TRAINER_INDEX, 0.0)
+    query, scan = spy(monkeypatch, repo)
+    assert trainer_ids(repo, 1) == expected
+    assert query.calls > 1
+    assert scan.calls == 0
+    assert repository.TRAINER_INDEX not in repo._missing_indexes
+
+
+@pytest.mark.parametrize("sort", [None, "nivel", "-nivel"])
+def test_find_without_indexes_matches_indexed(dynamodb_without_indexes, sort):
+    repo = populate(dynamodb_without_indexes)
+    everything = repo.list_all()
+    found = repo.find(tipo="Fogo", nivel_min=10, nivel_max=40, sort=sort, limit=25)
+    expected = [p for p in everything if 10 <= p["nivel"] <= 40]
+    if sort is None:
+        expected.sort(key=lambda p: p["id"])
+    else:
+        expected.sort(key=lambda p: (-p["nivel"] if sort == "-nivel" else p["nivel"], p["id"]))
+    assert [p["id"] for p in found] == [p["id"] for p in expected[:25]]
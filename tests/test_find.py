@@ -0,0 +1,114 @@
+"""
+Busca (find) em todos os backends: cada combinação de filtros e ordenação
+conferida com o resultado calculado sobre list_all (empates por ID), com limit
+e percorrendo as páginas pela posição do último item (after).
+"""
+import itertools
+import random
+from functools import cmp_to_key
+
+import pytest
+
+from app.repositories.columnar_repository import ColumnarPokemonRepository
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.query import SORT_FIELDS, matches, position
+from app.repositories.sqlite_repository import SQLitePokemonRepository
+
+# Poucos nomes e níveis: muitos empates para o desempate por ID
+NAMES = ["Bulbasaur", "Abra", "Zubat", "abra"]
+TYPES = ["Fogo", "Água", "Planta"]
+FILTERS = list(itertools.product(
+    [None, "Fogo", "Trovão"],
+    [(None, None), (3, None), (None, 4), (2, 5)],
+    [None, 2]
+))
+PAGE_SIZE = 7
+
+
+@pytest.fixture(params=["dict", "columnar", "sqlite", "dynamodb"])
+def repo(request):
+    if request.param == "dict":
+        repo = MemoryPokemonRepository(shards=4)
+    elif request.param == "columnar":
+        repo = ColumnarPokemonRepository()
+    elif request.param == "sqlite":
+        repo = SQLitePokemonRepository(request.getfixturevalue("sqlite_database"))
+    else:
+        repo = request.getfixturevalue("dynamodb").DynamoDBPokemonRepository()
+    rnd = random.Random(5)
+    created = repo.create_many([
+        {"nome": rnd.choice(NAMES), "tipo": rnd.choice(TYPES), "nivel": rnd.randint(1, 6), "treinador_id": rnd.randint(1, 3)}
+        for _ in range(60)
+    ])
+    # Alterações e exclusões deixam os índices com entradas a conferir
+    for pokemon in created[::9]:
+        repo.update(pokemon["id"], nivel=rnd.randint(1, 6), tipo=rnd.choice(TYPES))
+    for pokemon in created[4::11]:
+        repo.delete(pokemon["id"])
+    return repo
+
+
+def plain(pokemon: dict) -> dict:
+    """Item com números em int (o DynamoDB devolve Decimal)"""
+    return {key: int(value) if key in ("id", "nivel", "treinador_id") else value for key, value in pokemon.items()}
+
+
+def expected(repo, tipo, nivel_min, nivel_max, treinador_id, sort) -> list[int]:
+    found = [p for p in map(plain, repo.list_all()) if matches(p, tipo, nivel_min, nivel_max, treinador_id)]
+    if sort is None:
+        return sorted(p["id"] for p in found)
+    field, sign = sort.lstrip("-"), -1 if sort.startswith("-") else 1
+    
+    def compare(a: dict, b: dict) -> int:
+        if a[field] != b[field]:
+            return sign if a[field] > b[field] else -sign
+        return a["id"] - b["id"]
+    
+    return [p["id"] for p in sorted(found, key=cmp_to_key(compare))]
+
+
+def searches():
+    """Combinações aceitas (sort por nome só com tipo ou treinador)"""
+    for (tipo, (nivel_min, nivel_max), treinador_id), sort in itertools.product(FILTERS, (None,) + SORT_FIELDS):
+        if sort in ("nome", "-nome") and tipo is None and treinador_id is None:
+            continue
+        yield tipo, nivel_min, nivel_max, treinador_id, sort
+
+
+def ids(items: list[dict]) -> list[int]:
+    return [int(p["id"]) for p in items]
+
+
+def test_find_filters_and_orders(repo):
+    for search in searches():
+        everything = expected(repo, *search)
+        assert ids(repo.find(*search)) == everything, search
+        assert ids(repo.find(*search, limit=PAGE_SIZE)) == everything[:PAGE_SIZE], search
+
+
+def test_find_pages_from_the_last_position(repo):
+    for search in searches():
+        everything, sort = expected(repo, *search), search[-1]
+        pages, after = [], None
+        # Uma página a mais que o necessário: um after que não avança falha aqui, sem laço infinito
+        for _ in range(len(everything) // PAGE_SIZE + 1):
+            page = [plain(p) for p in repo.find(*search, limit=PAGE_SIZE, after=after)]
+            pages.extend(p["id"] for p in page)
+            if len(page) < PAGE_SIZE:
+                break
+            after = position(page[-1], sort)
+        assert pages == everything, search
+
+
+def test_ranking_breaks_ties_by_id(repo):
+    top = expected(repo, None, None, None, None, "-nivel")
+    assert ids(repo.find(sort="-nivel", limit=10)) == top[:10]
+    assert ids(repo.find(tipo="Água", treinador_id=1, sort="-nivel", limit=3)) == expected(repo, "Água", None, None, 1, "-nivel")[:3]
+
+
+@pytest.mark.parametrize("sort", ["nome", "-nome"])
+def test_name_sort_without_a_selective_filter_is_rejected(repo, sort):
+    with pytest.raises(ValueError):
+        repo.find(sort=sort)
+    with pytest.raises(ValueError):
+        repo.find(nivel_min=1, sort=sort, limit=5)
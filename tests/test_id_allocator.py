@@ -0,0 +1,67 @@
+"""
+IdAllocator (DynamoDB, moto): IDs entregues por blocos reservados no contador
+atômico nunca se repetem, com várias threads no mesmo alocador e um segundo
+alocador fazendo o papel de outra instância (outra Lambda) no mesmo contador.
+"""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+THREADS = 6
+
+
+@pytest.fixture
+def atomic_updates(dynamodb, monkeypatch):
+    """
+    O moto não serializa update_item concorrentes no mesmo item (o DynamoDB
+    serializa): a resposta é montada a partir do item vivo, que outra thread
+    pode já ter incrementado. Sem o lock o teste falharia por um defeito do
+    simulador, não do alocador.
+    """
+    from moto.dynamodb.responses import DynamoHandler
+    lock = threading.Lock()
+    update_item = DynamoHandler.update_item
+    
+    def locked_update_item(self):
+        with lock:
+            return update_item(self)
+    
+    monkeypatch.setattr(DynamoHandler, "update_item", locked_update_item)
+    return dynamodb
+
+
+# Blocos pequenos disputam o contador; os grandes, a posição dentro do bloco
+@pytest.mark.parametrize("block_size, ids_per_thread", [(1, 100), (7, 100), (50, 200), (1000, 2000)])
+def test_ids_are_unique_across_threads_and_allocators(atomic_updates, block_size, ids_per_thread):
+    local = atomic_updates.IdAllocator("pokemon", block_size)
+    other_process = atomic_updates.IdAllocator("pokemon", block_size + 3)
+    
+    def take(allocator) -> list[int]:
+        return [allocator.next_id() for _ in range(ids_per_thread)]
+    
+    # Trocas de thread frequentes aumentam a intercalação entre ler e avançar a posição no bloco
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS + 2) as pool:
+            futures = [pool.submit(take, local) for _ in range(THREADS)]
+            futures += [pool.submit(take, other_process) for _ in range(2)]
+            # Reservas diretas (create_many) disputando o mesmo contador
+            futures += [pool.submit(lambda: list(local.reserve(block_size * 3))) for _ in range(4)]
+            ids = [item_id for future in futures for item_id in future.result()]
+    finally:
+        sys.setswitchinterval(interval)
+    
+    assert len(ids) == len(set(ids))
+    assert min(ids) >= 1
+
+
+def test_blocks_leave_gaps_but_never_reuse(dynamodb):
+    first = dynamodb.IdAllocator("trainer", 10)
+    second = dynamodb.IdAllocator("trainer", 10)
+    assert [first.next_id(), second.next_id(), first.next_id()] == [1, 11, 2]
+    # Cada alocador segue no seu bloco; o próximo bloco vem depois dos dois
+    assert [second.next_id() for _ in range(9)] == list(range(12, 21))
+    assert second.next_id() == 21
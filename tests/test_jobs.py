@@ -0,0 +1,70 @@
+"""
+Jobs em segundo plano: exclusão assíncrona pela API, registro compartilhado no
+DynamoDB (outra instância enxerga o job) e execução pela função de jobs.
+"""
+import asyncio
+
+from app.services.job_service import JobService
+from app.services.trainer_service import DELETE_JOB
+
+
+def test_async_delete_runs_in_background(client):
+    trainer = client.post("/treinadores", json={"nome": "Ash"}).json()
+    client.post("/pokemons/lote", json={"pokemons": [
+        {"nome": f"P{i}", "tipo": "Fogo", "nivel": 5, "treinador_id": trainer["id"]} for i in range(3)
+    ]})
+    
+    response = client.delete(f"/treinadores/{trainer['id']}", params={"assincrono": "true"})
+    assert response.status_code == 202
+    job = client.get(f"/jobs/{response.json()['id']}").json()
+    assert (job["status"], job["itens_afetados"]) == ("concluido", 3)
+    assert client.get(f"/treinadores/{trainer['id']}").status_code == 404
+    assert client.get("/jobs/inexistente").status_code == 404
+
+
+def test_job_runs_out_of_band_on_another_instance(dynamodb, monkeypatch):
+    from app import dependencies, worker
+    monkeypatch.setattr(dependencies, "USE_DYNAMODB", True)
+    for name in ("_trainer_repo", "_pokemon_repo", "_async_trainer_repo", "_async_pokemon_repo", "_job_repo", "_job_service"):
+        monkeypatch.setattr(dependencies, name, None)
+    trainer = dependencies.get_trainer_repository().create("Ash")
+    dependencies.get_pokemon_repository().create_many([
+        {"nome": f"P{i}", "tipo": "Fogo", "nivel": 5, "treinador_id": trainer["id"]} for i in range(4)
+    ])
+    
+    # Instância da API: registra o job e o entrega à função de jobs
+    invoked = []
+    api_jobs = JobService(dependencies.get_async_job_repository(), dispatcher=invoked.append)
+    
+    async def start():
+        job = await api_jobs.create(DELETE_JOB, {"treinador_id": trainer["id"]})
+        return job, await api_jobs.submit(job.id)
+    
+    job, task = asyncio.run(start())
+    assert task is None and invoked == [job.id]
+    
+    # Função de jobs: outro processo, sem nada em memória do anterior
+    monkeypatch.setattr(dependencies, "_job_repo", None)
+    monkeypatch.setattr(dependencies, "_job_service", None)
+    worker.handler({"job_id": job.id}, None)
+    # Entrega repetida (retry da invocação assíncrona) não executa de novo
+    worker.handler({"job_id": job.id}, None)
+    
+    finished = asyncio.run(api_jobs.get(job.id))
+    assert (finished.status, finished.itens_afetados) == ("concluido", 4)
+    assert dependencies.get_trainer_repository().get(trainer["id"]) is None
+
+
+def test_delete_by_trainer_counts_only_existing_items(dynamodb, monkeypatch):
+    repo = dynamodb.DynamoDBPokemonRepository()
+    created = repo.create_many([{"nome": f"P{i}", "tipo": "Água", "nivel": 10 + i, "treinador_id": 7} for i in range(5)])
+    stale = repo.get_by_trainer(7)
+    repo.delete(created[0]["id"])
+    late = repo.create("Tardio", "Fogo", 50, 7)
+    # GSI atrasado: ainda lista o removido e não lista o criado agora
+    monkeypatch.setattr(repo, "get_by_trainer", lambda treinador_id: stale)
+    
+    assert repo.delete_by_trainer(7) == 4
+    summary = repo.get_summaries([7])[7]
+    assert (summary["quantidade"], summary["tipos"]) == (1, {"Fogo": 1})
+    assert repo.get(late["id"]) is not None
@@ -0,0 +1,96 @@
+"""
+Índice por treinador dos repositórios em memória e SQLite: depois de cada
+escrita, get_by_trainer deve ser igual a filtrar list_all pelo treinador.
+"""
+import pytest
+
+from app.repositories.memory_repository import MemoryPokemonRepository
+from app.repositories.sqlite_repository import SQLitePokemonRepository
+
+TRAINERS = (1, 2, 3)
+
+
+def assert_trainer_index(repo) -> None:
+    everything = repo.list_all()
+    for treinador_id in TRAINERS + (99,):
+        expected = [p for p in everything if p["treinador_id"] == treinador_id]
+        assert sorted(repo.get_by_trainer(treinador_id), key=lambda p: p["id"]) == expected
+
+
+@pytest.fixture(params=["dict", "sqlite"])
+def repo(request):
+    if request.param == "dict":
+        repo = MemoryPokemonRepository(shards=4)
+    else:
+        repo = SQLitePokemonRepository(request.getfixturevalue("sqlite_database"))
+    for i in range(12):
+        repo.create(f"Pokemon{i}", "Fogo" if i % 2 else "Água", i + 1, TRAINERS[i % 3])
+    return repo
+
+
+def test_create(repo):
+    repo.create("Novo", "Planta", 5, 2)
+    assert_trainer_index(repo)
+
+
+def test_create_many(repo):
+    repo.create_many([
+        {"nome": f"Lote{i}", "tipo": "Planta", "nivel": 10 + i, "treinador_id": TRAINERS[i % 3]}
+        for i in range(7)
+    ])
+    assert_trainer_index(repo)
+
+
+def test_update(repo):
+    repo.update(1, nome="Renomeado")
+    repo.update(2, tipo="Planta", nivel=50)
+    assert repo.update(999, nome="Inexistente") is None
+    assert_trainer_index(repo)
+
+
+def test_delete(repo):
+    assert repo.delete(4)
+    assert not repo.delete(4)
+    assert_trainer_index(repo)
+
+
+def test_delete_by_trainer(repo):
+    assert repo.delete_by_trainer(2) == 4
+    assert repo.delete_by_trainer(2) == 0
+    assert repo.get_by_trainer(2) == []
+    assert_trainer_index(repo)
+
+
+def test_restore(repo):
+    if not isinstance(repo, MemoryPokemonRepository):
+        pytest.skip("snapshot/restore é só do repositório em memória")
+    repo.delete(3)
+    repo.update(5, nivel=77)
+    restored = MemoryPokemonRepository(shards=8)
+    restored.restore(repo.snapshot())
+    assert restored.list_all() == repo.list_all()
+    assert_trainer_index(restored)
+    # O contador de IDs continua de onde parou
+    assert restored.create("Depois", "Fogo", 1, 1)["id"] == 13
+    assert_trainer_index(restored)
+
+
+def test_list_page_skips_removed_ids(repo):
+    for pid in range(2, 12):
+        repo.delete(pid)
+    repo.create("Depois", "Fogo", 1, 1)
+    page, cursor = repo.list_page(1)
+    assert [p["id"] for p in page] == [1] and cursor is not None
+    page, cursor = repo.list_page(5, cursor)
+    assert [p["id"] for p in page] == [12, 13] and cursor is None
+
+
+def test_list_page_walks_everything_in_order(repo):
+    repo.delete(5)
+    ids, cursor = [], None
+    while True:
+        page, cursor = repo.list_page(4, cursor)
+        ids.extend(p["id"] for p in page)
+        if cursor is None:
+            break
+    assert ids == [p["id"] for p in repo.list_all()]
@@ -0,0 +1,56 @@
+"""Middleware de métricas: toda requisição entra no histograma, inclusive as que falham"""
+import asyncio
+
+import pytest
+
+from app import metrics
+from app.metrics import MetricsMiddleware
+
+
+def count(method: str, status: str) -> int:
+    series = metrics.REQUEST_LATENCY._series.get((method, "<sem rota>", status))
+    return sum(series[0]) if series else 0
+
+
+def call(app, method: str) -> list[dict]:
+    sent = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b""}
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(MetricsMiddleware(app)({"type": "http", "method": method}, receive, send))
+    return sent
+
+
+def test_exception_before_response_counts_as_500(monkeypatch):
+    monkeypatch.setattr(metrics, "SAMPLE_RATE", 1.0)
+    
+    async def failing(scope, receive, send):
+        raise RuntimeError("falhou")
+    
+    before = count("FALHA", "500")
+    with pytest.raises(RuntimeError):
+        call(failing, "FALHA")
+    assert count("FALHA", "500") == before + 1
+
+
+def test_interrupted_body_keeps_status_and_is_counted_once(monkeypatch):
+    monkeypatch.setattr(metrics, "SAMPLE_RATE", 1.0)
+    
+    async def streaming(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"a", "more_body": True})
+        raise ConnectionResetError
+    
+    async def complete(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    
+    before = count("STREAM", "200"), count("OK", "201")
+    with pytest.raises(ConnectionResetError):
+        call(streaming, "STREAM")
+    call(complete, "OK")
+    assert (count("STREAM", "200"), count("OK", "201")) == (before[0] + 1, before[1] + 1)
@@ -0,0 +1,74 @@
+"""
+Repositório SQLite: IDs do lote vindos de cada INSERT (mesmo sem sequência
+contínua), contadores do resumo mantidos pelos triggers e preenchidos ao abrir
+um banco anterior a eles.
+"""
+import sqlite3
+from collections import Counter
+
+from app.repositories.sqlite_repository import SQLiteDatabase, SQLitePokemonRepository, SQLiteTrainerRepository
+from app.repositories.summary import build_summary
+
+
+def expected_summary(repo: SQLitePokemonRepository, treinador_id: int) -> dict:
+    mine = [p for p in repo.list_all() if p["treinador_id"] == treinador_id]
+    return build_summary(treinador_id, Counter(p["nivel"] for p in mine), Counter(p["tipo"] for p in mine))
+
+
+def test_create_many_returns_the_ids_written(sqlite_database):
+    # Cada inserção consome também o ID seguinte: os IDs do lote não são consecutivos
+    sqlite_database.connection().executescript("""
+        CREATE TRIGGER pular_id AFTER INSERT ON pokemons WHEN NEW.treinador_id <> 0 BEGIN
+            INSERT INTO pokemons (nome, tipo, nivel, treinador_id) VALUES ('', '', 0, 0);
+            DELETE FROM pokemons WHERE treinador_id = 0;
+        END;
+        CREATE TRIGGER pular_id_treinador AFTER INSERT ON treinadores WHEN NEW.nome <> '' BEGIN
+            INSERT INTO treinadores (nome) VALUES ('');
+            DELETE FROM treinadores WHERE nome = '';
+        END;
+    """)
+    pokemons = SQLitePokemonRepository(sqlite_database)
+    created = pokemons.create_many([
+        {"nome": f"P{i}", "tipo": "Fogo", "nivel": i + 1, "treinador_id": 1} for i in range(5)
+    ])
+    assert [p["id"] for p in created] == [1, 3, 5, 7, 9]
+    assert created == pokemons.list_all()
+    
+    trainers = SQLiteTrainerRepository(sqlite_database)
+    created = trainers.create_many(["Ash", "Misty", "Brock"])
+    assert created == trainers.list_all() and [t["id"] for t in created] == [1, 3, 5]
+
+
+def test_triggers_keep_the_summaries(sqlite_database):
+    repo = SQLitePokemonRepository(sqlite_database)
+    repo.create_many([
+        {"nome": f"P{i}", "tipo": ("Fogo", "Água")[i % 2], "nivel": i % 4 + 1, "treinador_id": i % 3 + 1}
+        for i in range(30)
+    ])
+    repo.update(1, nome="Só o nome")
+    repo.update(2, tipo="Planta", nivel=40)
+    repo.update(3, nivel=1)
+    repo.delete(4)
+    assert repo.delete_by_trainer(3) == 10
+    
+    for treinador_id in (1, 2, 3):
+        assert repo.get_summaries([treinador_id])[treinador_id] == expected_summary(repo, treinador_id)
+    assert repo.get_summaries([3])[3]["quantidade"] == 0
+
+
+def test_database_before_the_summaries_is_backfilled(tmp_path):
+    path = str(tmp_path / "antigo.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE pokemons (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, nome TEXT NOT NULL, tipo TEXT NOT NULL,
+            nivel INTEGER NOT NULL, treinador_id INTEGER NOT NULL
+        );
+        INSERT INTO pokemons (nome, tipo, nivel, treinador_id) VALUES
+            ('Pikachu', 'Elétrico', 5, 1), ('Raichu', 'Elétrico', 30, 1), ('Onix', 'Pedra', 12, 2);
+    """)
+    conn.close()
+    
+    repo = SQLitePokemonRepository(SQLiteDatabase(path))
+    assert repo.get_summaries([1, 2]) == {1: expected_summary(repo, 1), 2: expected_summary(repo, 2)}
+    assert repo.get_summaries([1])[1]["quantidade"] == 2
@@ -0,0 +1,38 @@
+"""Torneio: a classificação por contagens conferida com todos os confrontos"""
+import asyncio
+import random
+
+import pytest
+
+from app.models import TournamentRequest
+from app.repositories.async_repository import AsyncPokemonRepository, AsyncTrainerRepository
+from app.repositories.memory_repository import MemoryPokemonRepository, MemoryTrainerRepository
+from app.services import tournament_service
+from app.services.battle_service import _decide
+from app.services.tournament_service import TournamentService
+from app.services.type_chart import DEFAULT_TYPE_CHART
+
+
+@pytest.mark.parametrize("inline_participants", [tournament_service.INLINE_PARTICIPANTS, 0])
+def test_standings_match_round_robin(monkeypatch, inline_participants):
+    # INLINE_PARTICIPANTS=0 calcula a classificação na thread, fora do event loop
+    monkeypatch.setattr(tournament_service, "INLINE_PARTICIPANTS", inline_participants)
+    rnd = random.Random(11)
+    trainers, pokemons = MemoryTrainerRepository(), MemoryPokemonRepository()
+    trainer = trainers.create("Ash")["id"]
+    roster = [pokemons.create(f"P{i}", rnd.choice(["Fogo", "Planta", "Água", "Pedra"]), rnd.randint(1, 5), trainer) for i in range(40)]
+    service = TournamentService(AsyncPokemonRepository(pokemons), AsyncTrainerRepository(trainers))
+    
+    result = asyncio.run(service.run(TournamentRequest(treinador_ids=[trainer])))
+    
+    chart = DEFAULT_TYPE_CHART
+    expected = {}
+    for p in roster:
+        outcomes = [
+            _decide(chart, p["nivel"], chart.code(p["tipo"]), o["nivel"], chart.code(o["tipo"]))
+            for o in roster if o["id"] != p["id"]
+        ]
+        expected[p["id"]] = (outcomes.count(1), outcomes.count(0), outcomes.count(-1))
+    assert result.participantes == len(roster)
+    assert {row.id: (row.vitorias, row.empates, row.derrotas) for row in result.classificacao} == expected
+    assert [row.pontos for row in result.classificacao] == sorted((row.pontos for row in result.classificacao), reverse=True)
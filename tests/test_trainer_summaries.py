@@ -0,0 +1,124 @@
+"""Resumo por treinador no DynamoDB (moto): contadores transacionais e recontagem"""
+import pytest
+from botocore.exceptions import ClientError
+from scripts import recount_summaries
+
+
+def summary(repo, treinador_id: int) -> dict:
+    return repo.get_summaries([treinador_id])[treinador_id]
+
+
+def test_writes_keep_the_summary(dynamodb):
+    repo = dynamodb.DynamoDBPokemonRepository()
+    first = repo.create("Pikachu", "Elétrico", 5, 1)
+    second = repo.create("Charmander", "Fogo", 10, 1)
+    repo.update(first["id"], nome="Raichu")
+    repo.update(second["id"], tipo="Água", nivel=20)
+    assert repo.delete(first["id"]) is True
+    assert repo.delete(first["id"]) is False
+    assert repo.update(first["id"], nivel=3) is None
+    
+    assert summary(repo, 1) == {"treinador_id": 1, "quantidade": 1, "nivel_medio": 20, "nivel_maximo": 20, "tipos": {"Água": 1}}
+
+
+def test_failed_counter_update_rolls_back_the_write(dynamodb, monkeypatch):
+    repo = dynamodb.DynamoDBPokemonRepository()
+    pokemon = repo.create("Pikachu", "Elétrico", 5, 1)
+    # Contador inválido: o ADD falha e a transação desfaz também a escrita do pokémon
+    monkeypatch.setattr(dynamodb, "COUNTERS_TABLE", "tabela-inexistente")
+    with pytest.raises(ClientError):
+        repo.create("Charmander", "Fogo", 10, 1)
+    with pytest.raises(ClientError):
+        repo.delete(pokemon["id"])
+    monkeypatch.undo()
+    
+    assert [int(p["id"]) for p in repo.list_all()] == [pokemon["id"]]
+    assert summary(repo, 1)["quantidade"] == 1
+
+
+def test_recount_rebuilds_the_counters(dynamodb):
+    repo = dynamodb.DynamoDBPokemonRepository()
+    counters = dynamodb._get_dynamodb_resource().Table(dynamodb.COUNTERS_TABLE)
+    repo.create("Pikachu", "Elétrico", 5, 1)
+    # Pokémon antigo (sem contador) e resumo de um treinador que já não tem pokémon
+    repo._table.put_item(Item={"id": 100, "nome": "Antigo", "tipo": "Fogo", "nivel": 7, "treinador_id": 1})
+    counters.put_item(Item={"entity": f"{dynamodb.SUMMARY_PREFIX}2", "n#3": 4, "t#Água": 4})
+    
+    assert recount_summaries.recount(segments=3) == 1
+    assert summary(repo, 1)["tipos"] == {"Elétrico": 1, "Fogo": 1}
+    assert summary(repo, 1)["nivel_maximo"] == 7
+    assert summary(repo, 2)["quantidade"] == 0
+    assert recount_summaries.recount(segments=3) == 1
+
+
+class TransactSpy:
+    """Envolve transact_write_items do cliente guardando o tamanho de cada transação e rodando `before` antes da primeira"""
+    
+    def __init__(self, client, before=None):
+        self._method = client.transact_write_items
+        self.before = before
+        self.sizes = []
+    
+    def __call__(self, **kwargs):
+        hook, self.before = self.before, None
+        if hook is not None:
+            hook()
+        self.sizes.append(len(kwargs["TransactItems"]))
+        return self._method(**kwargs)
+
+
+def spy_transactions(monkeypatch, repo, before=None) -> TransactSpy:
+    client = repo._dynamodb.meta.client
+    spy = TransactSpy(client, before)
+    monkeypatch.setattr(client, "transact_write_items", spy)
+    return spy
+
+
+def raw_counters(dynamodb, treinador_id: int) -> dict:
+    counters = dynamodb._get_dynamodb_resource().Table(dynamodb.COUNTERS_TABLE)
+    item = counters.get_item(Key={"entity": f"{dynamodb.SUMMARY_PREFIX}{treinador_id}"}).get("Item", {})
+    return {name: int(count) for name, count in item.items() if name != "entity"}
+
+
+def test_batch_create_writes_items_and_counters_in_transactions(dynamodb, monkeypatch):
+    repo = dynamodb.DynamoDBPokemonRepository()
+    spy = spy_transactions(monkeypatch, repo)
+    created = repo.create_many([
+        {"nome": f"P{i}", "tipo": ("Fogo", "Água")[i % 2], "nivel": i % 7 + 1, "treinador_id": i % 3 + 1} for i in range(250)
+    ])
+    assert len(spy.sizes) == 3 and max(spy.sizes) <= dynamodb.TRANSACT_MAX_ITEMS
+    assert len(repo.list_all()) == 250
+    for treinador_id in (1, 2, 3):
+        assert summary(repo, treinador_id)["quantidade"] == sum(p["treinador_id"] == treinador_id for p in created)
+    
+    # O ADD falha: a transação desfaz também os pokémon do grupo
+    monkeypatch.setattr(dynamodb, "COUNTERS_TABLE", "tabela-inexistente")
+    with pytest.raises(ClientError):
+        repo.create_many([{"nome": "X", "tipo": "Fogo", "nivel": 1, "treinador_id": 1}])
+    monkeypatch.undo()
+    assert len(repo.list_all()) == 250
+
+
+def test_cascade_delete_counts_each_pokemon_once(dynamodb, monkeypatch):
+    repo = dynamodb.DynamoDBPokemonRepository()
+    created = repo.create_many([
+        {"nome": f"P{i}", "tipo": ("Fogo", "Água")[i % 2], "nivel": i % 7 + 1, "treinador_id": 1} for i in range(150)
+    ])
+    keep = repo.create("Onix", "Pedra", 12, 2)
+    
+    def concurrent_writes():
+        # Depois da leitura e antes da primeira transação: uma exclusão e uma mudança de nível concorrentes
+        assert repo.delete(created[0]["id"]) is True
+        repo.update(created[1]["id"], nivel=50)
+    
+    spy = spy_transactions(monkeypatch, repo, before=concurrent_writes)
+    assert repo.delete_by_trainer(1) == 149
+    # O primeiro grupo foi cancelado pela condição e relido (sem o excluído, com o nível novo)
+    assert max(spy.sizes) <= dynamodb.TRANSACT_MAX_ITEMS
+    
+    # Nova exclusão (retentativa): nada a apagar, nada a descontar
+    assert repo.delete_by_trainer(1) == 0
+    assert set(raw_counters(dynamodb, 1).values()) == {0}
+    assert summary(repo, 1)["quantidade"] == 0
+    assert [int(p["id"]) for p in repo.list_all()] == [keep["id"]]
+    assert summary(repo, 2)["quantidade"] == 1
@@ -0,0 +1,89 @@
+"""
+Tabela de tipos: a matriz de resultados confere, para todo par de tipos, com a
+regra original aplicada par a par (texto normalizado a cada confronto).
+"""
+import itertools
+import json
+
+import pytest
+
+from app.services.battle_service import _decide
+from app.services.type_chart import DEFAULT_TYPE_ADVANTAGES, DEFAULT_TYPE_CHART, MAX_CACHED_NAMES, TypeChart
+
+# Grafias da API: maiúsculas, acentos e tipos fora da tabela
+SPELLINGS = ["Fogo", "fogo", "FOGO", "Planta", "planta", "Água", "agua", "ÁGUA", "Elétrico", "Pedra", ""]
+
+# Vantagens do código original (um tipo vence um único outro)
+ORIGINAL_ADVANTAGES = {"fogo": "planta", "planta": "agua", "agua": "fogo"}
+
+
+def original_normalize(tipo: str) -> str:
+    result = tipo.lower()
+    for accented, plain in {"á": "a", "é": "e", "í": "i", "ó": "o", "ú": "u", "ã": "a"}.items():
+        result = result.replace(accented, plain)
+    return result
+
+
+def original_outcome(attacker: str, defender: str) -> int:
+    """Regra de tipo original, confronto a confronto"""
+    attacker, defender = original_normalize(attacker), original_normalize(defender)
+    if ORIGINAL_ADVANTAGES.get(attacker) == defender:
+        return 1
+    if ORIGINAL_ADVANTAGES.get(defender) == attacker:
+        return -1
+    return 0
+
+
+def reference_outcome(advantages: dict[str, list[str]], attacker: str, defender: str) -> int:
+    """Regra par a par de uma tabela qualquer: vantagem mútua se anula, contra si mesmo é neutro"""
+    beats = {original_normalize(strong): {original_normalize(weak) for weak in weaks} for strong, weaks in advantages.items()}
+    attacker, defender = original_normalize(attacker), original_normalize(defender)
+    if attacker == defender:
+        return 0
+    return int(defender in beats.get(attacker, ())) - int(attacker in beats.get(defender, ()))
+
+
+def chart_outcome(chart: TypeChart, attacker: str, defender: str) -> int:
+    return chart.outcome(chart.code(attacker), chart.code(defender))
+
+
+@pytest.mark.parametrize("attacker, defender", list(itertools.product(SPELLINGS, repeat=2)))
+def test_default_chart_matches_the_original_rule(attacker, defender):
+    assert chart_outcome(DEFAULT_TYPE_CHART, attacker, defender) == original_outcome(attacker, defender)
+    # Com o mesmo nível, a decisão da batalha é a de tipo; com níveis diferentes, o nível manda
+    assert _decide(DEFAULT_TYPE_CHART, 10, DEFAULT_TYPE_CHART.code(attacker), 10, DEFAULT_TYPE_CHART.code(defender)) == original_outcome(attacker, defender)
+    assert _decide(DEFAULT_TYPE_CHART, 11, DEFAULT_TYPE_CHART.code(attacker), 10, DEFAULT_TYPE_CHART.code(defender)) == 1
+
+
+def test_default_advantages_are_the_original_ones():
+    assert {strong: weaks for strong, weaks in DEFAULT_TYPE_ADVANTAGES.items()} == {
+        strong: [weak] for strong, weak in ORIGINAL_ADVANTAGES.items()
+    }
+
+
+def test_custom_chart_matches_the_pair_rule_for_every_pair(tmp_path):
+    # Vários vencidos por tipo, vantagem mútua (Dragão x Fada), contra si mesmo e acentos nas chaves
+    advantages = {
+        "Fogo": ["Planta", "Gelo", "Inseto"],
+        "Água": ["Fogo", "Pedra"],
+        "Elétrico": ["Água", "Voador"],
+        "Dragão": ["Dragão", "Fada"],
+        "Fada": ["Dragão"],
+        "Pedra": ["Voador", "Gelo", "Fogo"]
+    }
+    path = tmp_path / "tipos.json"
+    path.write_text(json.dumps(advantages), encoding="utf-8")
+    chart = TypeChart.from_file(str(path))
+    names = {name for strong, weaks in advantages.items() for name in [strong, *weaks]} | {"Normal", "ELÉTRICO", "agua"}
+    for attacker, defender in itertools.product(sorted(names), repeat=2):
+        expected = reference_outcome(advantages, attacker, defender)
+        assert chart_outcome(chart, attacker, defender) == expected, (attacker, defender)
+        assert chart_outcome(chart, defender, attacker) == -expected
+
+
+def test_name_cache_is_bounded():
+    chart = TypeChart(DEFAULT_TYPE_ADVANTAGES)
+    for i in range(MAX_CACHED_NAMES + 100):
+        assert chart.code(f"Desconhecido{i}") == 0
+    assert len(chart._cache) == MAX_CACHED_NAMES
+    assert chart.code("FOGO") == chart.code("fogo") != 0